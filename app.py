@@ -1,20 +1,468 @@
 # Copyright by 
 
-from flask import Flask, render_template, request, send_file, jsonify
-from weasyprint import HTML
+from flask import Flask, g, render_template, request, send_file, jsonify, url_for
+from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.middleware.proxy_fix import ProxyFix
+from weasyprint import CSS, HTML
+from weasyprint.text.fonts import FontConfiguration
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from pathlib import Path
 import io
+import json
+import math
 import os
+import re
+import tempfile
+import threading
+import time
+import zipfile
+
+from artifacts import ArtifactStore
+from assets import StaticAssets
+from cache import DiskCache, LRUCache, PDFCache, content_hash, resume_cache_key
+from exporters import EXPORT_FORMATS
+from jobs import MemoryJobStore, SQLiteJobStore, callback_allowed, notify_callback
+from limits import PageLimitExceeded, ResumeLimits, ResumeTooLarge
+from metrics import DEFAULT_DIRECTORY as DEFAULT_METRICS_DIR, Registry
+from pdf_profiles import DEFAULT_PROFILE, PDF_PROFILES, parse_template_profiles, write_options
+from profiling import Profiler, profile_call
+from render_pool import RenderPool, RenderPoolSaturated
+from scheduler import Lane, QueueFull, RateLimited, Scheduler, parse_lane_settings
+from schema import resume_from_json
+from singleflight import SingleFlight
+from thumbnails import (
+    THUMBNAIL_FORMATS,
+    THUMBNAIL_MODES,
+    encode_image,
+    format_supported,
+    paint_layout,
+    rasterize_pdf,
+)
 
 app = Flask(__name__)
 
 # Optional: auto-reload templates in dev
 app.config["TEMPLATES_AUTO_RELOAD"] = True
 
+# Request bodies above this are refused with 413 before they are parsed
+app.config["MAX_CONTENT_LENGTH"] = int(os.environ.get("MAX_REQUEST_BYTES", str(8 * 1024 * 1024)))
+
+# Behind reverse proxies, set TRUSTED_PROXIES to how many there are so the
+# client address, scheme and host come from their X-Forwarded-* headers
+TRUSTED_PROXIES = int(os.environ.get("TRUSTED_PROXIES", "0"))
+if TRUSTED_PROXIES:
+    app.wsgi_app = ProxyFix(
+        app.wsgi_app, x_for=TRUSTED_PROXIES, x_proto=TRUSTED_PROXIES, x_host=TRUSTED_PROXIES
+    )
+
 # Ensure template and static directories exist (for local dev convenience)
 os.makedirs("templates", exist_ok=True)
 os.makedirs("static/css", exist_ok=True)
 os.makedirs("static/js", exist_ok=True)
 
+# Static files are served from fingerprinted, precompressed copies built at
+# startup into ASSET_BUILD_DIR (see assets.py). With FLASK_DEBUG=1 they are
+# rebuilt whenever a file in static/ changes.
+STATIC_ASSETS = StaticAssets(
+    app.static_folder,
+    os.environ.get("ASSET_BUILD_DIR") or os.path.join(tempfile.gettempdir(), "resume-assets"),
+    check_mtime=app.debug,
+)
+STATIC_ASSETS.build()
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+
+class SharedFontConfiguration(FontConfiguration):
+    """
+    FontConfiguration that can be inherited by forked workers.
+
+    WeasyPrint deletes the temp directory holding @font-face files when the
+    configuration is garbage collected. Under gunicorn's preload_app every
+    worker shares the master's directory, so only the creating process may
+    remove it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._owner_pid = os.getpid()
+
+    def __del__(self):
+        if os.getpid() == self._owner_pid:
+            super().__del__()
+
+
+# Font discovery is expensive, so every render in this process shares one
+# FontConfiguration. The bundled fonts in fonts/ are pre-subsetted to Latin
+# (see tools/subset_fonts.py); the system stacks remain as fallbacks.
+FONT_CONFIG = SharedFontConfiguration()
+FONTS_DIR = Path(__file__).resolve().parent / "fonts"
+
+BUNDLED_FONTS = (
+    ("Resume Sans", 400, "normal", "ResumeSans-Regular.ttf"),
+    ("Resume Sans", 400, "italic", "ResumeSans-It.ttf"),
+    ("Resume Sans", 600, "normal", "ResumeSans-Semibold.ttf"),
+    ("Resume Sans", 700, "normal", "ResumeSans-Bold.ttf"),
+    ("Resume Serif", 400, "normal", "ResumeSerif-Regular.ttf"),
+    ("Resume Serif", 400, "italic", "ResumeSerif-It.ttf"),
+    ("Resume Serif", 700, "normal", "ResumeSerif-Bold.ttf"),
+)
+
+# Set ARTIFACT_DIR to keep rendered PDFs in a deduplicated artifact store
+# (see artifacts.py) shared by all gunicorn workers. Stored PDFs can be
+# downloaded through signed links that expire after ARTIFACT_LINK_TTL seconds,
+# which requires ARTIFACT_SECRET: every worker (and restart) must accept the
+# same links.
+ARTIFACTS = (
+    ArtifactStore(
+        os.environ["ARTIFACT_DIR"],
+        max_bytes=int(os.environ.get("ARTIFACT_MAX_BYTES", str(1024 * 1024 * 1024))),
+        max_age=int(os.environ.get("ARTIFACT_MAX_AGE", str(30 * 24 * 3600))),
+        gc_interval=int(os.environ.get("ARTIFACT_GC_INTERVAL", "300")),
+    )
+    if os.environ.get("ARTIFACT_DIR")
+    else None
+)
+ARTIFACT_LINK_TTL = int(os.environ.get("ARTIFACT_LINK_TTL", str(24 * 3600)))
+if ARTIFACTS is not None and not os.environ.get("ARTIFACT_SECRET"):
+    raise RuntimeError("ARTIFACT_SECRET must be set when ARTIFACT_DIR is")
+ARTIFACT_SIGNER = (
+    URLSafeTimedSerializer(os.environ["ARTIFACT_SECRET"], salt="artifact-link")
+    if ARTIFACTS is not None
+    else None
+)
+
+# Rendered PDFs keyed on a hash of the normalized resume + template + color.
+# The artifact store, or else PDF_CACHE_DIR, adds a disk tier shared by all
+# gunicorn workers.
+PDF_CACHE = PDFCache(
+    memory=LRUCache(
+        max_entries=int(os.environ.get("PDF_CACHE_ENTRIES", "256")),
+        max_bytes=int(os.environ.get("PDF_CACHE_MEMORY_BYTES", str(64 * 1024 * 1024))),
+    ),
+    disk=ARTIFACTS
+    or (
+        DiskCache(
+            os.environ["PDF_CACHE_DIR"],
+            max_bytes=int(os.environ.get("PDF_CACHE_DISK_BYTES", str(512 * 1024 * 1024))),
+        )
+        if os.environ.get("PDF_CACHE_DIR")
+        else None
+    ),
+)
+
+# PDF_STREAM=1 makes /generate have the render process write the PDF straight
+# to disk (into the PDF_CACHE_DIR tier, or a spool file that's deleted once
+# sent) and send it from there. Large PDFs then never sit in the web worker's
+# memory, and cached files are served with Content-Length and Range support.
+PDF_STREAM = os.environ.get("PDF_STREAM", "0") == "1"
+PDF_SPOOL_DIR = os.environ.get("PDF_SPOOL_DIR") or os.path.join(
+    tempfile.gettempdir(), "resume-spool"
+)
+
+# Output profile (speed, balanced or size; see pdf_profiles.py) per template,
+# e.g. PDF_PROFILES="creative=size,modern=speed". Requests can override it
+# with ?optimize=.
+TEMPLATE_PDF_PROFILES = parse_template_profiles(os.environ.get("PDF_PROFILES", ""))
+
+# Page-1 preview images, keyed like PDFs plus mode/size/format
+THUMBNAIL_CACHE = LRUCache(
+    max_entries=int(os.environ.get("THUMBNAIL_CACHE_ENTRIES", "512")),
+    max_bytes=int(os.environ.get("THUMBNAIL_CACHE_BYTES", str(32 * 1024 * 1024))),
+)
+
+
+def _warm_render_process():
+    """RenderPool initializer: warm up each render process before it takes jobs."""
+    try:
+        warmup()
+    except Exception:
+        app.logger.exception("Render process warmup failed")
+
+
+# PDF rendering runs in a separate process pool so web workers stay free for
+# cheap requests. RENDER_WORKERS=0 renders inline (handy for local dev).
+# Pool renders are stopped after RENDER_TIMEOUT seconds (the process exits if
+# it can't stop within RENDER_KILL_GRACE more), and each render process may
+# use at most RENDER_MEMORY_LIMIT_MB of address space (0 for no cap).
+RENDER_POOL = RenderPool(
+    max_workers=int(os.environ.get("RENDER_WORKERS", str(os.cpu_count() or 1))),
+    max_queue=int(os.environ.get("RENDER_QUEUE_SIZE", "8")),
+    timeout=float(os.environ.get("RENDER_TIMEOUT", "30")),
+    initializer=_warm_render_process,
+    kill_grace=float(os.environ.get("RENDER_KILL_GRACE", "5")),
+    memory_limit=int(os.environ.get("RENDER_MEMORY_LIMIT_MB", "2048")) * 1024 * 1024,
+)
+RENDER_RETRY_AFTER = int(os.environ.get("RENDER_RETRY_AFTER", "2"))
+
+# Identical renders in flight at once (same resume, template, color and
+# profile) run once and share the PDF; see singleflight.py. Gunicorn workers
+# coordinate through a lock file in SINGLEFLIGHT_DIR, and pick the leader's
+# PDF up from the PDF cache's disk tier, or without one from a small handoff
+# cache next to the lock file. SINGLEFLIGHT=0 turns coalescing off.
+SINGLEFLIGHT_DIR = os.environ.get("SINGLEFLIGHT_DIR") or os.path.join(
+    tempfile.gettempdir(), "resume-singleflight"
+)
+SINGLE_FLIGHT = (
+    SingleFlight(os.path.join(SINGLEFLIGHT_DIR, "renders.lock"))
+    if os.environ.get("SINGLEFLIGHT", "1") == "1"
+    else None
+)
+RENDER_HANDOFF = (
+    PDF_CACHE.disk
+    or DiskCache(
+        os.path.join(SINGLEFLIGHT_DIR, "handoff"),
+        max_bytes=int(os.environ.get("SINGLEFLIGHT_HANDOFF_BYTES", str(64 * 1024 * 1024))),
+    )
+    if SINGLE_FLIGHT is not None
+    else None
+)
+
+BATCH_MAX_ITEMS = int(os.environ.get("BATCH_MAX_ITEMS", "500"))
+VARIANTS_MAX_ITEMS = int(os.environ.get("VARIANTS_MAX_ITEMS", "12"))
+HEX_COLOR = re.compile(r"#[0-9a-fA-F]{3}(?:[0-9a-fA-F]{3})?")
+
+# Per-resume size limits (see limits.py); 0 disables a limit
+RESUME_LIMITS = ResumeLimits(
+    max_field_chars=int(os.environ.get("RESUME_MAX_FIELD_CHARS", "10000")),
+    max_items=int(os.environ.get("RESUME_MAX_ITEMS", "50")),
+    max_pages=int(os.environ.get("RENDER_MAX_PAGES", "10")),
+)
+
+# Async render jobs (POST /jobs). Finished PDFs are kept for JOB_TTL seconds.
+# Set JOB_DB to keep jobs in SQLite, which survives restarts and is shared by
+# all gunicorn workers; the in-memory default only works with one worker.
+JOB_TTL = int(os.environ.get("JOB_TTL", "3600"))
+JOB_STORE = (
+    SQLiteJobStore(os.environ["JOB_DB"], ttl=JOB_TTL)
+    if os.environ.get("JOB_DB")
+    else MemoryJobStore(ttl=JOB_TTL)
+)
+# Completion callbacks may only target these hosts
+JOB_CALLBACK_HOSTS = frozenset(
+    host.strip().lower()
+    for host in os.environ.get("JOB_CALLBACK_HOSTS", "localhost,127.0.0.1,::1").split(",")
+    if host.strip()
+)
+JOB_CALLBACK_TIMEOUT = float(os.environ.get("JOB_CALLBACK_TIMEOUT", "5"))
+# Queued jobs don't hold a web thread, so instead of the scheduler lane's
+# queue limit, at most JOB_QUEUE_SIZE per worker may wait for a renderer
+JOB_QUEUE_SIZE = int(os.environ.get("JOB_QUEUE_SIZE", "1000"))
+JOB_QUEUE = threading.BoundedSemaphore(JOB_QUEUE_SIZE)
+# Stores results and sends callbacks off the render pool's result thread
+JOB_FINISHER = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("JOB_FINISHER_THREADS", "2")),
+    thread_name_prefix="job-finisher",
+)
+
+# Opt-in render profiling (see profiling.py). Requests to the resume
+# endpoints sending "X-Profile: <PROFILE_TOKEN>" are profiled, as is a random
+# PROFILE_SAMPLE_RATE fraction of them. Off unless one of the two is set.
+PROFILER = Profiler(
+    os.environ.get("PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "resume-profiles"),
+    sample_rate=float(os.environ.get("PROFILE_SAMPLE_RATE", "0")),
+    token=os.environ.get("PROFILE_TOKEN") or None,
+    interval=float(os.environ.get("PROFILE_INTERVAL_MS", "5")) / 1000,
+    max_dumps=int(os.environ.get("PROFILE_MAX_DUMPS", "200")),
+)
+PROFILED_ENDPOINTS = frozenset({"generate", "api_resume"})
+
+# Metrics are written per process into METRICS_DIR and merged on scrape, so
+# /metrics sees every gunicorn worker and render-pool process.
+METRICS = Registry(os.environ.get("METRICS_DIR") or DEFAULT_METRICS_DIR)
+HTTP_REQUESTS = METRICS.counter(
+    "resume_http_requests_total", "HTTP requests handled.", ("endpoint", "method", "status")
+)
+HTTP_LATENCY = METRICS.histogram(
+    "resume_http_request_seconds", "HTTP request latency.", ("endpoint",)
+)
+RENDER_STAGE_SECONDS = METRICS.histogram(
+    "resume_render_stage_seconds",
+    "Time spent in each stage of producing a resume "
+    "(parse, html, template, layout, serialize, or export for non-PDF formats).",
+    ("template", "stage"),
+)
+PDF_BYTES = METRICS.histogram(
+    "resume_pdf_bytes",
+    "Size of generated PDFs.",
+    ("template",),
+    buckets=tuple(2**n * 1024 for n in range(4, 13)),
+)
+CACHE_LOOKUPS = METRICS.counter(
+    "resume_cache_lookups_total", "Cache lookups by cache and result.", ("cache", "result")
+)
+RENDER_FAILURES = METRICS.counter(
+    "resume_render_failures_total", "Failed renders by reason.", ("template", "reason")
+)
+JOBS = METRICS.counter(
+    "resume_jobs_total", "Async render jobs by outcome (created, done, failed).", ("status",)
+)
+RENDERS_COALESCED = METRICS.counter(
+    "resume_renders_coalesced_total",
+    "Renders served by an identical in-flight render, by where it ran (process or host).",
+    ("scope",),
+)
+SCHEDULER_QUEUE_DEPTH = METRICS.gauge(
+    "resume_scheduler_queue_depth", "Renders waiting for a free renderer, by lane.", ("lane",)
+)
+SCHEDULER_WAIT_SECONDS = METRICS.histogram(
+    "resume_scheduler_wait_seconds", "Time renders waited for a free renderer.", ("lane",)
+)
+SCHEDULER_REJECTED = METRICS.counter(
+    "resume_scheduler_rejected_total",
+    "Requests refused by the scheduler, by lane and reason (rate_limited, queue_full).",
+    ("lane", "reason"),
+)
+
+# Renders are scheduled across priority lanes (see scheduler.py): previews
+# ("interactive") outweigh downloads ("generate"), which outweigh batches and
+# async jobs ("bulk"), and clients within a lane share fairly. Per lane,
+# SCHEDULER_WEIGHTS sets its share of the renderers, SCHEDULER_RATES each
+# client's "rate/burst" in requests per second (0, the default, for no
+# limit), and SCHEDULER_QUEUES how many renders may wait, which keeps some
+# web threads free for previews. Clients are told apart by
+# SCHEDULER_CLIENT_HEADER (e.g. a header set by a trusted proxy) or else
+# their address. Behind a proxy every user has the proxy's address, so rate
+# limits only apply with SCHEDULER_CLIENT_HEADER or TRUSTED_PROXIES set.
+SCHEDULER_CLIENT_HEADER = os.environ.get("SCHEDULER_CLIENT_HEADER") or None
+SCHEDULER_WEIGHTS = {
+    "interactive": 8.0,
+    "generate": 4.0,
+    "bulk": 1.0,
+    **parse_lane_settings(os.environ.get("SCHEDULER_WEIGHTS", "")),
+}
+SCHEDULER_RATES = {
+    "interactive": "0",
+    "generate": "0",
+    "bulk": "0",
+    **parse_lane_settings(os.environ.get("SCHEDULER_RATES", ""), str),
+}
+if not (SCHEDULER_CLIENT_HEADER or TRUSTED_PROXIES) and any(
+    float(rate.partition("/")[0]) for rate in SCHEDULER_RATES.values()
+):
+    app.logger.warning(
+        "SCHEDULER_RATES ignored: set SCHEDULER_CLIENT_HEADER or TRUSTED_PROXIES "
+        "so clients can be told apart"
+    )
+    SCHEDULER_RATES = dict.fromkeys(SCHEDULER_RATES, "0")
+SCHEDULER_QUEUES = {
+    "interactive": 16,
+    "generate": 4,
+    "bulk": 2,
+    **parse_lane_settings(os.environ.get("SCHEDULER_QUEUES", ""), int),
+}
+
+
+def _lane(name):
+    rate, _, burst = SCHEDULER_RATES[name].partition("/")
+    return Lane(
+        name,
+        weight=SCHEDULER_WEIGHTS[name],
+        rate=float(rate),
+        burst=float(burst or 1),
+        max_queue=SCHEDULER_QUEUES[name],
+    )
+
+
+SCHEDULER = Scheduler(
+    capacity=int(os.environ.get("SCHEDULER_CAPACITY", str(max(1, RENDER_POOL.max_workers)))),
+    lanes=[_lane(name) for name in SCHEDULER_WEIGHTS],
+    on_depth=lambda lane, depth: SCHEDULER_QUEUE_DEPTH.set(depth, lane=lane),
+)
+ENDPOINT_LANES = {
+    "preview": "interactive",
+    "preview_fragments": "interactive",
+    "preview_pdf_thumbnail": "interactive",
+    "generate": "generate",
+    "api_resume": "generate",
+    "generate_variants": "generate",
+    "generate_batch": "bulk",
+    "create_job": "bulk",
+}
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.before_request
+def admit_request():
+    """Rate-limit scheduled endpoints per client (see SCHEDULER)."""
+    lane = ENDPOINT_LANES.get(request.endpoint)
+    if lane is None:
+        return
+    g.lane, g.client = lane, client_id()
+    SCHEDULER.admit(lane, g.client)
+
+
+@app.before_request
+def start_profile():
+    if request.endpoint not in PROFILED_ENDPOINTS:
+        return
+    if not PROFILER.wants(request.headers.get("X-Profile")):
+        return
+    try:
+        g.profile = PROFILER.start()
+    except OSError:
+        app.logger.exception("Could not start a render profile")
+
+
+@app.after_request
+def finish_profile(response):
+    session = g.pop("profile", None)
+    if session is not None:
+        try:
+            session.finish(endpoint=request.endpoint, status=response.status_code)
+            response.headers["X-Profile-Id"] = session.id
+        except OSError:
+            app.logger.exception("Could not write render profile %s", session.id)
+    return response
+
+
+@app.teardown_request
+def abandon_profile(error):
+    # Only still set when the request raised before after_request ran
+    session = g.pop("profile", None)
+    if session is not None:
+        try:
+            session.finish(endpoint=request.endpoint, status=500, error=repr(error))
+        except OSError:
+            app.logger.exception("Could not write render profile %s", session.id)
+
+
+@app.errorhandler(RateLimited)
+def rate_limited(error):
+    SCHEDULER_REJECTED.inc(lane=error.lane, reason="rate_limited")
+    return (
+        jsonify({"error": "Too many requests, please slow down."}),
+        429,
+        {"Retry-After": str(math.ceil(error.retry_after))},
+    )
+
+
+@app.errorhandler(RequestEntityTooLarge)
+def request_too_large(error):
+    limit = app.config["MAX_CONTENT_LENGTH"]
+    return jsonify({"error": f"Request bodies are limited to {limit} bytes"}), 413
+
+
+@app.errorhandler(ResumeTooLarge)
+def resume_too_large(error):
+    return jsonify({"error": str(error)}), 413
+
+
+@app.after_request
+def record_request_metrics(response):
+    endpoint = request.endpoint or "unknown"
+    HTTP_REQUESTS.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+    if "request_started" in g:
+        HTTP_LATENCY.observe(time.perf_counter() - g.request_started, endpoint=endpoint)
+    METRICS.flush()
+    return response
+
 
 @app.route("/")
 def index():
@@ -22,11 +470,48 @@ def index():
     return render_template("index.html")
 
 
+@app.context_processor
+def asset_helpers():
+    return {"asset_url": asset_url}
+
+
+def asset_url(filename):
+    """URL of a static file's fingerprinted copy (its plain /static URL if it has none)."""
+    fingerprinted = STATIC_ASSETS.url_path(filename)
+    if fingerprinted is None:
+        return url_for("static", filename=filename)
+    return url_for("asset", filename=fingerprinted)
+
+
+@app.route("/assets/<path:filename>")
+def asset(filename):
+    """
+    Serve a fingerprinted static file. Its name changes with its contents,
+    so it may be cached forever; brotli or gzip copies go to clients that
+    accept them.
+    """
+    found = STATIC_ASSETS.get(filename)
+    if found is None:
+        return jsonify({"error": "Unknown asset"}), 404
+
+    path, encoding = found.variant(request.accept_encodings)
+    response = send_file(path, mimetype=found.mimetype, max_age=ASSET_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    response.vary.add("Accept-Encoding")
+    if encoding is not None:
+        response.content_encoding = encoding
+    return response
+
+
 # --------- Shared helper to build data from the form --------- #
 
 
 def build_resume_data(form):
-    """Collect and normalize all resume data from a form-like object."""
+    """
+    Collect and normalize all resume data from a form-like object.
+    Raises ResumeTooLarge if it exceeds RESUME_LIMITS.
+    """
     # Collect basic fields
     data = {
         "name": form.get("name", "").strip(),
@@ -38,7 +523,7 @@ def build_resume_data(form):
         "summary": form.get("summary", "").strip(),
         "skills": form.get("skills", "").strip(),
         "languages": form.get("languages", "").strip(),
-        "template": form.get("template", "modern"),
+        "template": resume_template(form.get("template", "modern")),
         "color": form.get("color", "#2563eb"),
     }
 
@@ -126,74 +611,588 @@ def build_resume_data(form):
             }
         )
 
+    RESUME_LIMITS.check(data)
+    return data
+
+
+# List sections and their fields; the first field is required for an entry
+# to be kept, mirroring the form handling above.
+RESUME_LIST_FIELDS = {
+    "exp": ("title", "company", "duration", "description"),
+    "edu": ("degree", "institution", "year"),
+    "proj": ("name", "description", "link"),
+    "cert": ("name", "issuer", "year"),
+}
+
+RESUME_TEXT_FIELDS = (
+    "name",
+    "email",
+    "phone",
+    "location",
+    "linkedin",
+    "website",
+    "summary",
+    "skills",
+    "languages",
+)
+
+
+def resume_data_from_dict(payload):
+    """
+    Normalize a JSON resume (same shape build_resume_data returns) exactly
+    the way the form path does. Raises ValueError on malformed input, and
+    ResumeTooLarge (a ValueError) if it exceeds RESUME_LIMITS.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Each resume must be a JSON object")
+
+    def text(obj, key, default=""):
+        value = obj.get(key, default)
+        if value is None:
+            return ""
+        if not isinstance(value, str):
+            raise ValueError(f"'{key}' must be a string")
+        return value
+
+    data = {key: text(payload, key).strip() for key in RESUME_TEXT_FIELDS}
+    data["template"] = resume_template(text(payload, "template", "modern"))
+    data["color"] = text(payload, "color", "#2563eb")
+
+    for prefix, fields in RESUME_LIST_FIELDS.items():
+        entries = payload.get(prefix) or []
+        if not isinstance(entries, list):
+            raise ValueError(f"'{prefix}' must be a list")
+
+        data[prefix] = []
+        for entry in entries:
+            if not isinstance(entry, dict):
+                raise ValueError(f"Entries in '{prefix}' must be objects")
+            item = {field: text(entry, field).strip() for field in fields}
+            if item[fields[0]]:
+                data[prefix].append(item)
+
+    RESUME_LIMITS.check(data)
     return data
 
 
+def resume_template(value):
+    """The RESUME_TEMPLATES key to render; unknown or empty names get the modern template."""
+    return value if value in RESUME_TEMPLATES else "modern"
+
+
+def resume_filename(data, extension="pdf"):
+    return f"{(data['name'] or 'Resume').replace(' ', '_')}_Resume.{extension}"
+
+
 # --------- Routes --------- #
 
 
 @app.route("/generate", methods=["POST"])
 def generate():
-    """Generate a resume PDF from submitted form data."""
+    """
+    Generate a resume from submitted form data: a PDF by default, or
+    ?format=txt|md|docx for the exports in exporters.py.
+    """
+    started = time.perf_counter()
     data = build_resume_data(request.form)
 
-    # Generate content based on template type
-    template_key = data["template"] or "modern"
+    template_key = data["template"]
     color = data["color"] or "#2563eb"
+    RENDER_STAGE_SECONDS.observe(
+        time.perf_counter() - started, template=template_key, stage="parse"
+    )
+    return resume_response(data, template_key, color)
 
-    if template_key == "creative":
-        content_html = generate_creative_content(data)
-    else:
-        content_html = generate_standard_content(data)
 
-    # Wrap content into the chosen template
-    template_html = RESUME_TEMPLATES.get(template_key, RESUME_TEMPLATES["modern"])
-    template_html = template_html.replace("{color}", color)
-    template_html = template_html.replace("{content}", content_html)
+@app.route("/api/v1/resume", methods=["POST"])
+def api_resume():
+    """
+    Generate a resume from a typed JSON document (see schema.py).
 
+    Same output, formats, caching and ETags as /generate, without form parsing.
+    """
+    started = time.perf_counter()
     try:
-        pdf_bytes = HTML(string=template_html).write_pdf()
-    except Exception as e:
-        return jsonify({"error": f"Error generating PDF: {e}"}), 500
-
-    filename = f"{(data['name'] or 'Resume').replace(' ', '_')}_Resume.pdf"
+        data = resume_from_json(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    RESUME_LIMITS.check(data)
+
+    template_key = data.template = resume_template(data.template)
+    color = data.color or "#2563eb"
+    RENDER_STAGE_SECONDS.observe(
+        time.perf_counter() - started, template=template_key, stage="parse"
+    )
+    return resume_response(data, template_key, color)
+
+
+def resume_response(data, template_key, color):
+    """Send the resume in the ?format= the client asked for (PDF by default)."""
+    fmt = request.args.get("format", "pdf")
+
+    session = g.get("profile")
+    if session is not None:
+        session.summary.update(template=template_key, format=fmt)
+        try:
+            session.save_input(data)
+        except OSError:
+            app.logger.exception("Could not save input for render profile %s", session.id)
+
+    if fmt == "pdf":
+        return pdf_response(data, template_key, color)
+    if fmt not in EXPORT_FORMATS:
+        formats = ", ".join(["pdf", *EXPORT_FORMATS])
+        return jsonify({"error": f"format must be one of: {formats}"}), 400
+
+    # Exports skip WeasyPrint entirely; they're cheap enough not to cache
+    exporter, mimetype, extension = EXPORT_FORMATS[fmt]
+    etag = resume_cache_key(data, template_key, color, fmt)
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+
+    with RENDER_STAGE_SECONDS.time(template=template_key, stage="export"):
+        body = exporter(data)
 
     return send_file(
+        io.BytesIO(body),
+        mimetype=mimetype,
+        as_attachment=True,
+        download_name=resume_filename(data, extension),
+        etag=etag,
+    )
+
+
+def pdf_response(data, template_key, color):
+    """Send the PDF for normalized resume data, from cache or freshly rendered."""
+    default_profile = template_profile(template_key)
+    profile = request.args.get("optimize") or default_profile
+    if profile not in PDF_PROFILES:
+        return jsonify({"error": f"optimize must be one of: {', '.join(PDF_PROFILES)}"}), 400
+
+    filename = resume_filename(data)
+
+    # Same inputs always produce the same PDF, so the key doubles as an ETag.
+    # Overriding the template's profile yields different bytes, hence its own key.
+    cache_key = resume_cache_key(
+        data, template_key, color, *(() if profile == default_profile else (profile,))
+    )
+    if request.if_none_match.contains(cache_key):
+        response = app.response_class(status=304)
+        response.set_etag(cache_key)
+        return response
+
+    if PDF_STREAM:
+        return stream_pdf(data, template_key, color, cache_key, filename, profile)
+
+    # A profiled request is there to watch the render, so it never hits the cache
+    pdf_bytes = None if "profile" in g else cache_lookup(PDF_CACHE, "pdf", cache_key)
+    if pdf_bytes is None:
+
+        def render():
+            pdf_bytes = run_render(
+                render_pdf, generate_content(data, template_key), template_key, color, profile
+            )
+            PDF_CACHE.put(cache_key, pdf_bytes)
+            if RENDER_HANDOFF is not None and RENDER_HANDOFF is not PDF_CACHE.disk:
+                RENDER_HANDOFF.put(cache_key, pdf_bytes)
+            return pdf_bytes
+
+        try:
+            pdf_bytes = coalesce(cache_key, render, lambda: RENDER_HANDOFF.get(cache_key))
+        except Exception as e:
+            return render_error_response(e, template_key)
+
+    response = send_file(
         io.BytesIO(pdf_bytes),
         mimetype="application/pdf",
         as_attachment=True,
         download_name=filename,
+        etag=cache_key,
+    )
+    return with_pdf_links(response, cache_key, filename)
+
+
+@app.route("/pdf/<cache_key>")
+def cached_pdf(cache_key):
+    """
+    Re-fetch a PDF that /generate rendered (its Content-Location) while it's
+    still cached. Unlike the POST, this supports Range requests, so viewers
+    can load large PDFs in pieces.
+    """
+    if len(cache_key) != 64 or not all(c in "0123456789abcdef" for c in cache_key):
+        return jsonify({"error": "Unknown or expired PDF"}), 404
+
+    pdf_bytes, path = PDF_CACHE.get_file(cache_key)
+    CACHE_LOOKUPS.inc(cache="pdf", result="miss" if pdf_bytes is None and path is None else "hit")
+    try:
+        if pdf_bytes is not None or path is not None:
+            return send_file(
+                io.BytesIO(pdf_bytes) if pdf_bytes is not None else path,
+                mimetype="application/pdf",
+                download_name="Resume.pdf",
+                etag=cache_key,
+            )
+    except OSError:
+        pass  # Evicted between the lookup and opening it
+    return jsonify({"error": "Unknown or expired PDF"}), 404
+
+
+@app.route("/artifacts/<token>")
+def artifact_download(token):
+    """
+    Download a stored PDF through a signed link (the X-Share-URL header of
+    /generate). Served from disk with Range support; nothing is rendered.
+    """
+    if ARTIFACTS is None:
+        return jsonify({"error": "Shared links are not enabled"}), 404
+    try:
+        digest = ARTIFACT_SIGNER.loads(token, max_age=ARTIFACT_LINK_TTL)
+    except SignatureExpired:
+        return jsonify({"error": "This link has expired"}), 410
+    except BadSignature:
+        return jsonify({"error": "Invalid link"}), 404
+    if not isinstance(digest, str):
+        return jsonify({"error": "Invalid link"}), 404
+
+    path = ARTIFACTS.open_digest(digest)
+    if path is None:
+        return jsonify({"error": "This resume is no longer stored"}), 410
+    try:
+        return send_file(
+            path,
+            mimetype="application/pdf",
+            as_attachment=True,
+            download_name=ARTIFACTS.filename_for(digest) or "Resume.pdf",
+            etag=digest,
+            max_age=ARTIFACT_LINK_TTL,
+        )
+    except OSError:
+        return jsonify({"error": "This resume is no longer stored"}), 410
+
+
+def with_pdf_links(response, cache_key, filename):
+    """
+    Point a PDF response at its cached copy (Content-Location) and, when
+    it's in the artifact store, at a signed share link (X-Share-URL).
+    """
+    response.headers["Content-Location"] = url_for("cached_pdf", cache_key=cache_key)
+    digest = ARTIFACTS.digest_for(cache_key) if ARTIFACTS is not None else None
+    if digest is not None:
+        # The link carries only the digest; the name (the candidate's) stays here
+        ARTIFACTS.set_filename(digest, filename)
+        token = ARTIFACT_SIGNER.dumps(digest)
+        response.headers["X-Share-URL"] = url_for(
+            "artifact_download", token=token, _external=True
+        )
+    return response
+
+
+def render_error_response(error, template_key):
+    """Map a failed render job to the JSON error response clients get."""
+    RENDER_FAILURES.inc(template=template_key, reason=render_failure_reason(error))
+
+    if isinstance(error, (RenderPoolSaturated, QueueFull)):
+        return (
+            jsonify({"error": "Too many resumes are being generated, please retry shortly."}),
+            503,
+            {"Retry-After": str(RENDER_RETRY_AFTER)},
+        )
+    if isinstance(error, TimeoutError):
+        return jsonify({"error": "Timed out generating PDF"}), 504
+    if isinstance(error, PageLimitExceeded):
+        return jsonify({"error": str(error)}), 422
+    if isinstance(error, MemoryError):
+        return jsonify({"error": "The resume is too large to render"}), 422
+    return jsonify({"error": f"Error generating PDF: {error}"}), 500
+
+
+@app.route("/metrics")
+def metrics():
+    """Prometheus metrics merged across all worker and render processes."""
+    merged = METRICS.collect()
+
+    # Derive hit ratios so dashboards don't have to
+    lookups = merged.get("resume_cache_lookups_total", {}).get("values", {})
+    ratios = {}
+    for (cache, result), count in lookups.items():
+        hits, total = ratios.get((cache,), (0, 0))
+        ratios[(cache,)] = (hits + (count if result == "hit" else 0), total + count)
+    merged["resume_cache_hit_ratio"] = {
+        "type": "gauge",
+        "help": "Fraction of cache lookups that were hits.",
+        "labelnames": ["cache"],
+        "values": {key: hits / total for key, (hits, total) in ratios.items() if total},
+    }
+
+    return app.response_class(
+        METRICS.render(merged), mimetype="text/plain; version=0.0.4"
+    )
+
+
+@app.route("/generate/batch", methods=["POST"])
+def generate_batch():
+    """
+    Render a JSON array of resumes and stream them back as a ZIP.
+
+    PDFs are written to the archive as soon as each one finishes, and a
+    manifest.json at the end lists the outcome of every item, so one bad
+    resume doesn't fail the whole batch.
+    """
+    payloads = request.get_json(silent=True)
+    if not isinstance(payloads, list):
+        return jsonify({"error": "Expected a JSON array of resumes"}), 400
+    if len(payloads) > BATCH_MAX_ITEMS:
+        return jsonify({"error": f"A batch can contain at most {BATCH_MAX_ITEMS} resumes"}), 413
+
+    response = app.response_class(
+        stream_batch_zip(iter_batch_renders(payloads, g.lane, g.client)),
+        mimetype="application/zip",
+    )
+    response.headers["Content-Disposition"] = 'attachment; filename="resumes.zip"'
+    return response
+
+
+@app.route("/generate/variants", methods=["POST"])
+def generate_variants():
+    """
+    Render one resume in several templates/colors and stream them back as
+    a ZIP, in the same format as /generate/batch.
+
+    Takes the /generate form plus "variants", a JSON array of
+    {"template": ..., "color": ...} objects, or a JSON body
+    {"resume": <schema.py document>, "variants": [...]}. The resume is
+    parsed once and the variants render concurrently on the pool.
+    """
+    if request.is_json:
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            return jsonify({"error": "Expected a JSON object"}), 400
+        try:
+            data = resume_from_json(payload.get("resume"))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        RESUME_LIMITS.check(data)
+        variants = payload.get("variants")
+    else:
+        data = build_resume_data(request.form)
+        try:
+            variants = json.loads(request.form.get("variants") or "null")
+        except ValueError:
+            return jsonify({"error": "variants must be a JSON array"}), 400
+
+    try:
+        variants = parse_variants(variants)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if len(variants) > VARIANTS_MAX_ITEMS:
+        return jsonify({"error": f"At most {VARIANTS_MAX_ITEMS} variants are allowed"}), 413
+
+    response = app.response_class(
+        stream_batch_zip(iter_variant_renders(data, variants, g.lane, g.client)),
+        mimetype="application/zip",
     )
+    response.headers["Content-Disposition"] = 'attachment; filename="resume-variants.zip"'
+    return response
 
 
 @app.route("/preview", methods=["POST"])
 def preview():
     """
-    Return HTML snippet for live preview.
+    Return HTML for the live preview of the selected template.
 
-    We adapt the generated HTML to match the preview's front-end CSS,
-    so preview looks clean while PDFs remain untouched.
+    The preview uses the same section renderers as the PDF; the screen CSS
+    styles the same class names.
     """
     data = build_resume_data(request.form)
+    template_key = data["template"]
     color = data.get("color") or "#2563eb"
 
-    # Get raw content from the standard generator (even if creative selected)
-    raw_html = generate_standard_content(data)
+    regions = render_layout(data, template_key)
+    return jsonify({"html": preview_page(template_key, color, regions)})
+
+
+@app.route("/preview/fragments", methods=["POST"])
+def preview_fragments():
+    """
+    Live preview as a diff against what the browser already shows.
+
+    The form carries "known", a JSON object {"template": ..., "sections":
+    {name: hash}} describing the current preview. Every section comes back
+    with its hash, but HTML only for sections whose hash changed, so the
+    browser patches those in place. A template switch (or an unknown
+    starting point) returns the whole page as "html" instead.
+    """
+    data = build_resume_data(request.form)
+    template_key = data["template"]
+    color = data.get("color") or "#2563eb"
+
+    if not data["name"] and not data["email"]:
+        return jsonify({"empty": True})
+
+    try:
+        known = json.loads(request.form.get("known") or "{}")
+    except ValueError:
+        known = {}
+    if not isinstance(known, dict) or not isinstance(known.get("sections"), dict):
+        known = {"template": None, "sections": {}}
+
+    regions = render_layout(data, template_key)
+    sections = []
+    for _, _, fragments in regions:
+        for name, html in fragments:
+            section = {"name": name, "hash": content_hash(html)[:16]}
+            if known["sections"].get(name) != section["hash"]:
+                section["html"] = html
+            sections.append(section)
+
+    response = {"template": template_key, "color": color, "sections": sections}
+    if known.get("template") != template_key:
+        response["html"] = preview_page(template_key, color, regions)
+        for section in sections:
+            section.pop("html", None)
+    return jsonify(response)
+
+
+@app.route("/preview/pdf-thumbnail", methods=["POST"])
+def preview_pdf_thumbnail():
+    """
+    Return an image of page 1 of the real PDF layout, for any template.
+
+    ?mode=layout (default) paints WeasyPrint's layout without writing a PDF,
+    which is cheap enough to call on debounce; ?mode=full rasterizes the
+    actual PDF. Results are cached by content hash and support ETags.
+    """
+    data = build_resume_data(request.form)
+    template_key = data["template"]
+    color = data["color"] or "#2563eb"
+
+    mode = request.args.get("mode", "layout")
+    fmt = request.args.get("format", "png")
+    width = min(max(request.args.get("width", 240, type=int), 64), 1200)
+
+    if mode not in THUMBNAIL_MODES:
+        return jsonify({"error": f"Unknown mode: {mode}"}), 400
+    if not format_supported(fmt):
+        return jsonify({"error": f"Unsupported image format: {fmt}"}), 400
+
+    cache_key = resume_cache_key(data, template_key, color, "thumbnail", mode, width, fmt)
+    if request.if_none_match.contains(cache_key):
+        response = app.response_class(status=304)
+        response.set_etag(cache_key)
+        return response
+
+    image_bytes = cache_lookup(THUMBNAIL_CACHE, "thumbnail", cache_key)
+    if image_bytes is None:
+        content_html = generate_content(data, template_key)
+
+        try:
+            image_bytes = run_render(
+                render_thumbnail, content_html, template_key, color, width, fmt, mode
+            )
+        except Exception as e:
+            return render_error_response(e, template_key)
+
+        THUMBNAIL_CACHE.put(cache_key, image_bytes)
+
+    return send_file(
+        io.BytesIO(image_bytes),
+        mimetype=THUMBNAIL_FORMATS[fmt][1],
+        etag=cache_key,
+    )
+
+
+@app.route("/jobs", methods=["POST"])
+def create_job():
+    """
+    Queue a resume for rendering and return a job id straight away.
+
+    Takes the same JSON object as a /generate/batch item, plus an optional
+    "callback_url" that receives a JSON POST once the job has finished.
+    Poll GET /jobs/<id> for the status and, once it's done, the PDF.
+    """
+    payload = request.get_json(silent=True)
+    try:
+        data = resume_data_from_dict(payload)
+    except ResumeTooLarge:
+        raise
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    callback_url = payload.get("callback_url") or None
+    if callback_url is not None and not (
+        isinstance(callback_url, str) and callback_allowed(callback_url, JOB_CALLBACK_HOSTS)
+    ):
+        return jsonify({"error": "callback_url must be an http(s) URL on an allowed host"}), 400
+
+    template_key = data["template"]
+    color = data["color"] or "#2563eb"
+    cache_key = resume_cache_key(data, template_key, color)
 
-    # 🔧 Fix class names so they match your screen CSS
-    html = raw_html
-    html = html.replace('class="header"', 'class="resume-header"')
-    html = html.replace('class="resume-section-title"', 'class="section-title"')
-    html = html.replace('class="skill-tag"', 'class="skill-pill"')
+    job = JOB_STORE.create(template_key, resume_filename(data), cache_key, callback_url)
+    job_url = url_for("get_job", job_id=job["id"], _external=True)
 
-    # Wrap for page styling
-    final_html = f'''
-        <div class="resume-page" style="--accent:{color}">
-            {html}
-        </div>
-    '''
+    pdf_bytes = cache_lookup(PDF_CACHE, "pdf", cache_key)
+    rendered = pdf_bytes is None
+    if not rendered:
+        future = Future()
+        future.set_result(pdf_bytes)
+    else:
 
-    return jsonify({"html": final_html})
+        def submit():
+            return submit_render(
+                g.lane,
+                g.client,
+                render_pdf,
+                generate_content(data, template_key),
+                template_key,
+                color,
+                template_profile(template_key),
+            )
+
+        try:
+            if SINGLE_FLIGHT is None:
+                future = submit()
+            else:
+                # Retried or duplicate jobs ride along on a render already in
+                # flight in this process, whose owner caches the PDF
+                future, shared = SINGLE_FLIGHT.share(cache_key, submit)
+                if shared:
+                    rendered = False
+                    RENDERS_COALESCED.inc(scope="process")
+        except Exception as e:
+            JOB_STORE.delete(job["id"])
+            return render_error_response(e, template_key)
+
+    JOBS.inc(status="created")
+    future.add_done_callback(
+        lambda f: JOB_FINISHER.submit(
+            finish_job, job["id"], job_url, template_key, cache_key, f, rendered
+        )
+    )
+    return jsonify(job_status(job, job_url)), 202, {"Location": job_url}
+
+
+@app.route("/jobs/<job_id>")
+def get_job(job_id):
+    """Report a job's status as JSON, or send the PDF once it's done."""
+    job = JOB_STORE.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job"}), 404
+
+    if job["status"] == "pending":
+        return jsonify(job_status(job)), 200, {"Retry-After": str(RENDER_RETRY_AFTER)}
+    if job["status"] == "failed":
+        return jsonify(job_status(job)), 200
+
+    return send_file(
+        io.BytesIO(job["pdf"]),
+        mimetype="application/pdf",
+        as_attachment=True,
+        download_name=job["filename"],
+        etag=job["cache_key"],
+    )
 
 
 # --------- Helpers for HTML generation --------- #
@@ -204,414 +1203,1282 @@ def format_multiline_as_bullets(text: str) -> str:
     Turn a multiline textarea into <ul><li>…</li></ul>
     for cleaner PDF bullet lists.
     """
-    lines = [line.strip() for line in text.splitlines()]
-    lines = [l for l in lines if l]
-
-    if not lines:
-        return ""
-
     items = []
-    for line in lines:
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
         if line.startswith("•"):
             line = line.lstrip("•").strip()
-        items.append(line)
+        items.append(f"<li>{line}</li>")
 
-    html = "<ul>"
-    for item in items:
-        html += f"<li>{item}</li>"
-    html += "</ul>"
-    return html
+    if not items:
+        return ""
 
+    return "<ul>" + "".join(items) + "</ul>"
 
-def generate_standard_content(data):
-    """
-    Single-column, modern/classic layout.
-    This structure will be mirrored in the live preview.
-    """
+
+def _standard_header(data):
     name = data["name"] or "Your Name"
 
-    html = '<div class="resume-root">'
-    # Header
-    html += '<div class="header">'
-    html += f"<h1>{name}</h1>"
+    parts = ['<div class="header">', f"<h1>{name}</h1>"]
 
     # Contact row
-    contact_bits = []
-    if data["email"]:
-        contact_bits.append(data["email"])
-    if data["phone"]:
-        contact_bits.append(data["phone"])
-    if data["location"]:
-        contact_bits.append(data["location"])
-    if data["linkedin"]:
-        contact_bits.append(data["linkedin"])
-    if data["website"]:
-        contact_bits.append(data["website"])
-
-    html += '<div class="contact">'
-    for bit in contact_bits:
-        html += f"<span>{bit}</span>"
-    html += "</div>"  # .contact
-    html += "</div>"  # .header
-
-    # Summary
-    if data["summary"]:
-        html += '<div class="resume-section">'
-        html += '<div class="resume-section-title">Professional Summary</div>'
-        html += f'<div class="resume-summary">{data["summary"]}</div>'
-        html += "</div>"
+    parts.append('<div class="contact">')
+    for key in ("email", "phone", "location", "linkedin", "website"):
+        if data[key]:
+            parts.append(f"<span>{data[key]}</span>")
+    parts.append("</div>")  # .contact
+    parts.append("</div>")  # .header
+    return "".join(parts)
 
-    # Experience
-    if data["exp"]:
-        html += '<div class="resume-section">'
-        html += '<div class="resume-section-title">Work Experience</div>'
-        for exp in data["exp"]:
-            html += '<div class="item">'
-            html += '<div class="item-header">'
-            html += "<div>"
-            html += f'<div class="item-title">{exp["title"]}</div>'
-            if exp["company"]:
-                html += f'<div class="item-subtitle">{exp["company"]}</div>'
-            html += "</div>"
-            if exp["duration"]:
-                html += f'<div class="item-duration">{exp["duration"]}</div>'
-            html += "</div>"  # .item-header
-
-            if exp["description"]:
-                desc_html = format_multiline_as_bullets(exp["description"])
-                html += f'<div class="item-description">{desc_html}</div>'
-            html += "</div>"  # .item
-        html += "</div>"  # .resume-section
 
-    # Projects
-    if data["proj"]:
-        html += '<div class="resume-section">'
-        html += '<div class="resume-section-title">Projects</div>'
-        for proj in data["proj"]:
-            html += '<div class="item">'
-            html += f'<div class="item-title">{proj["name"]}</div>'
-            if proj["link"]:
-                html += f'<div class="item-subtitle">{proj["link"]}</div>'
-            if proj["description"]:
-                desc_html = format_multiline_as_bullets(proj["description"])
-                html += f'<div class="item-description">{desc_html}</div>'
-            html += "</div>"
-        html += "</div>"
+def _standard_summary(data):
+    if not data["summary"]:
+        return ""
 
-    # Education
-    if data["edu"]:
-        html += '<div class="resume-section">'
-        html += '<div class="resume-section-title">Education</div>'
-        for edu in data["edu"]:
-            html += '<div class="item">'
-            html += '<div class="item-header">'
-            html += "<div>"
-            html += f'<div class="item-title">{edu["degree"]}</div>'
-            if edu["institution"]:
-                html += f'<div class="item-subtitle">{edu["institution"]}</div>'
-            html += "</div>"
-            if edu["year"]:
-                html += f'<div class="item-duration">{edu["year"]}</div>'
-            html += "</div></div>"
-        html += "</div>"
+    return (
+        '<div class="resume-section">'
+        '<div class="resume-section-title">Professional Summary</div>'
+        f'<div class="resume-summary">{data["summary"]}</div>'
+        "</div>"
+    )
 
-    # Certifications
-    if data["cert"]:
-        html += '<div class="resume-section">'
-        html += '<div class="resume-section-title">Certifications</div>'
-        for cert in data["cert"]:
-            html += '<div class="item">'
-            html += '<div class="item-header">'
-            html += "<div>"
-            html += f'<div class="item-title">{cert["name"]}</div>'
-            if cert["issuer"]:
-                html += f'<div class="item-subtitle">{cert["issuer"]}</div>'
-            html += "</div>"
+
+def _standard_experience(data):
+    if not data["exp"]:
+        return ""
+
+    parts = [
+        '<div class="resume-section">',
+        '<div class="resume-section-title">Work Experience</div>',
+    ]
+    append = parts.append
+    for exp in data["exp"]:
+        append('<div class="item">')
+        append('<div class="item-header">')
+        append("<div>")
+        append(f'<div class="item-title">{exp["title"]}</div>')
+        if exp["company"]:
+            append(f'<div class="item-subtitle">{exp["company"]}</div>')
+        append("</div>")
+        if exp["duration"]:
+            append(f'<div class="item-duration">{exp["duration"]}</div>')
+        append("</div>")  # .item-header
+
+        if exp["description"]:
+            desc_html = format_multiline_as_bullets(exp["description"])
+            append(f'<div class="item-description">{desc_html}</div>')
+        append("</div>")  # .item
+    append("</div>")  # .resume-section
+    return "".join(parts)
+
+
+def _standard_projects(data):
+    if not data["proj"]:
+        return ""
+
+    parts = [
+        '<div class="resume-section">',
+        '<div class="resume-section-title">Projects</div>',
+    ]
+    append = parts.append
+    for proj in data["proj"]:
+        append('<div class="item">')
+        append(f'<div class="item-title">{proj["name"]}</div>')
+        if proj["link"]:
+            append(f'<div class="item-subtitle">{proj["link"]}</div>')
+        if proj["description"]:
+            desc_html = format_multiline_as_bullets(proj["description"])
+            append(f'<div class="item-description">{desc_html}</div>')
+        append("</div>")
+    append("</div>")
+    return "".join(parts)
+
+
+def _standard_education(data):
+    if not data["edu"]:
+        return ""
+
+    parts = [
+        '<div class="resume-section">',
+        '<div class="resume-section-title">Education</div>',
+    ]
+    append = parts.append
+    for edu in data["edu"]:
+        append('<div class="item">')
+        append('<div class="item-header">')
+        append("<div>")
+        append(f'<div class="item-title">{edu["degree"]}</div>')
+        if edu["institution"]:
+            append(f'<div class="item-subtitle">{edu["institution"]}</div>')
+        append("</div>")
+        if edu["year"]:
+            append(f'<div class="item-duration">{edu["year"]}</div>')
+        append("</div></div>")
+    append("</div>")
+    return "".join(parts)
+
+
+def _standard_certifications(data):
+    if not data["cert"]:
+        return ""
+
+    parts = [
+        '<div class="resume-section">',
+        '<div class="resume-section-title">Certifications</div>',
+    ]
+    append = parts.append
+    for cert in data["cert"]:
+        append('<div class="item">')
+        append('<div class="item-header">')
+        append("<div>")
+        append(f'<div class="item-title">{cert["name"]}</div>')
+        if cert["issuer"]:
+            append(f'<div class="item-subtitle">{cert["issuer"]}</div>')
+        append("</div>")
+        if cert["year"]:
+            append(f'<div class="item-duration">{cert["year"]}</div>')
+        append("</div></div>")
+    append("</div>")
+    return "".join(parts)
+
+
+def _standard_skills(data):
+    if not data["skills"]:
+        return ""
+
+    parts = [
+        '<div class="resume-section">',
+        '<div class="resume-section-title">Skills</div>',
+        '<div class="skills-list">',
+    ]
+    for skill in data["skills"].split(","):
+        skill = skill.strip()
+        if skill:
+            parts.append(f'<span class="skill-tag">{skill}</span>')
+    parts.append("</div></div>")
+    return "".join(parts)
+
+
+def _standard_languages(data):
+    if not data["languages"]:
+        return ""
+
+    return (
+        '<div class="resume-section">'
+        '<div class="resume-section-title">Languages</div>'
+        f'<div class="resume-languages">{data["languages"]}</div>'
+        "</div>"
+    )
+
+
+# (section name, renderer), in document order.
+# static/css/styles.css styles the same class names, so the live preview
+# shows the PDF's own markup.
+STANDARD_SECTIONS = (
+    ("header", _standard_header),
+    ("summary", _standard_summary),
+    ("exp", _standard_experience),
+    ("proj", _standard_projects),
+    ("edu", _standard_education),
+    ("cert", _standard_certifications),
+    ("skills", _standard_skills),
+    ("languages", _standard_languages),
+)
+
+
+def _creative_header(data):
+    parts = [f"<h1>{data['name'] or 'Your Name'}</h1>", '<div class="contact">']
+    for key in ("email", "phone", "location", "linkedin", "website"):
+        if data[key]:
+            parts.append(f"<div>{data[key]}</div>")
+    parts.append("</div>")
+    return "".join(parts)
+
+
+def _creative_skills(data):
+    if not data["skills"]:
+        return ""
+
+    skills_lines = [s.strip() for s in data["skills"].split(",") if s.strip()]
+    return (
+        '<div class="section-title">Skills</div>'
+        '<div class="skills">' + "<br>".join(skills_lines) + "</div>"
+    )
+
+
+def _creative_languages(data):
+    if not data["languages"]:
+        return ""
+
+    return (
+        '<div class="section-title">Languages</div>'
+        f'<div class="skills">{data["languages"]}</div>'
+    )
+
+
+def _creative_summary(data):
+    if not data["summary"]:
+        return ""
+
+    return (
+        '<div class="section">'
+        '<div class="section-title">About Me</div>'
+        f'<div class="summary">{data["summary"]}</div>'
+        "</div>"
+    )
+
+
+def _creative_experience(data):
+    if not data["exp"]:
+        return ""
+
+    parts = ['<div class="section">', '<div class="section-title">Experience</div>']
+    append = parts.append
+    for exp in data["exp"]:
+        append('<div class="item">')
+        append('<div class="item-header">')
+        append("<div>")
+        append(f'<div class="item-title">{exp["title"]}</div>')
+        if exp["company"]:
+            append(f'<div class="item-subtitle">{exp["company"]}</div>')
+        append("</div>")
+        if exp["duration"]:
+            append(f'<div class="item-duration">{exp["duration"]}</div>')
+        append("</div>")
+        if exp["description"]:
+            desc_html = format_multiline_as_bullets(exp["description"])
+            append(f'<div class="item-description">{desc_html}</div>')
+        append("</div>")
+    append("</div>")
+    return "".join(parts)
+
+
+def _creative_projects(data):
+    if not data["proj"]:
+        return ""
+
+    parts = ['<div class="section">', '<div class="section-title">Projects</div>']
+    append = parts.append
+    for proj in data["proj"]:
+        append('<div class="item">')
+        append(f'<div class="item-title">{proj["name"]}</div>')
+        if proj["link"]:
+            append(f'<div class="item-subtitle">{proj["link"]}</div>')
+        if proj["description"]:
+            desc_html = format_multiline_as_bullets(proj["description"])
+            append(f'<div class="item-description">{desc_html}</div>')
+        append("</div>")
+    append("</div>")
+    return "".join(parts)
+
+
+def _creative_education(data):
+    if not data["edu"]:
+        return ""
+
+    parts = ['<div class="section">', '<div class="section-title">Education</div>']
+    append = parts.append
+    for edu in data["edu"]:
+        append('<div class="item">')
+        append('<div class="item-header">')
+        append("<div>")
+        append(f'<div class="item-title">{edu["degree"]}</div>')
+        if edu["institution"]:
+            append(f'<div class="item-subtitle">{edu["institution"]}</div>')
+        append("</div>")
+        if edu["year"]:
+            append(f'<div class="item-duration">{edu["year"]}</div>')
+        append("</div></div>")
+    append("</div>")
+    return "".join(parts)
+
+
+def _creative_certifications(data):
+    if not data["cert"]:
+        return ""
+
+    parts = ['<div class="section">', '<div class="section-title">Certifications</div>']
+    append = parts.append
+    for cert in data["cert"]:
+        append('<div class="item">')
+        append(f'<div class="item-title">{cert["name"]}</div>')
+        if cert["issuer"] or cert["year"]:
+            details = cert["issuer"] or ""
             if cert["year"]:
-                html += f'<div class="item-duration">{cert["year"]}</div>'
-            html += "</div></div>"
-        html += "</div>"
-
-    # Skills
-    if data["skills"]:
-        html += '<div class="resume-section">'
-        html += '<div class="resume-section-title">Skills</div>'
-        html += '<div class="skills-list">'
-        for skill in data["skills"].split(","):
-            skill = skill.strip()
-            if skill:
-                html += f'<span class="skill-tag">{skill}</span>'
-        html += "</div></div>"
-
-    # Languages
-    if data["languages"]:
-        html += '<div class="resume-section">'
-        html += '<div class="resume-section-title">Languages</div>'
-        html += f'<div class="resume-languages">{data["languages"]}</div>'
-        html += "</div>"
-
-    html += "</div>"  # .resume-root
-    return html
-
-
-def generate_creative_content(data):
-    """Two-column 'creative' layout content (sidebar + main)."""
-    # Sidebar
-    sidebar = '<div class="sidebar">'
-    sidebar += f"<h1>{data['name'] or 'Your Name'}</h1>"
-    sidebar += '<div class="contact">'
-    if data["email"]:
-        sidebar += f"<div>{data['email']}</div>"
-    if data["phone"]:
-        sidebar += f"<div>{data['phone']}</div>"
-    if data["location"]:
-        sidebar += f"<div>{data['location']}</div>"
-    if data["linkedin"]:
-        sidebar += f"<div>{data['linkedin']}</div>"
-    if data["website"]:
-        sidebar += f"<div>{data['website']}</div>"
-    sidebar += "</div>"
-
-    if data["skills"]:
-        sidebar += '<div class="section-title">Skills</div>'
-        sidebar += '<div class="skills">'
-        skills_lines = [s.strip() for s in data["skills"].split(",") if s.strip()]
-        sidebar += "<br>".join(skills_lines)
-        sidebar += "</div>"
-
-    if data["languages"]:
-        sidebar += '<div class="section-title">Languages</div>'
-        sidebar += f'<div class="skills">{data["languages"]}</div>'
-
-    sidebar += "</div>"
-
-    # Main column
-    main = '<div class="main">'
-
-    if data["summary"]:
-        main += '<div class="section">'
-        main += '<div class="section-title">About Me</div>'
-        main += f'<div class="summary">{data["summary"]}</div>'
-        main += "</div>"
-
-    if data["exp"]:
-        main += '<div class="section">'
-        main += '<div class="section-title">Experience</div>'
-        for exp in data["exp"]:
-            main += '<div class="item">'
-            main += '<div class="item-header">'
-            main += "<div>"
-            main += f'<div class="item-title">{exp["title"]}</div>'
-            if exp["company"]:
-                main += f'<div class="item-subtitle">{exp["company"]}</div>'
-            main += "</div>"
-            if exp["duration"]:
-                main += f'<div class="item-duration">{exp["duration"]}</div>'
-            main += "</div>"
-            if exp["description"]:
-                desc_html = format_multiline_as_bullets(exp["description"])
-                main += f'<div class="item-description">{desc_html}</div>'
-            main += "</div>"
-        main += "</div>"
-
-    if data["proj"]:
-        main += '<div class="section">'
-        main += '<div class="section-title">Projects</div>'
-        for proj in data["proj"]:
-            main += '<div class="item">'
-            main += f'<div class="item-title">{proj["name"]}</div>'
-            if proj["link"]:
-                main += f'<div class="item-subtitle">{proj["link"]}</div>'
-            if proj["description"]:
-                desc_html = format_multiline_as_bullets(proj["description"])
-                main += f'<div class="item-description">{desc_html}</div>'
-            main += "</div>"
-        main += "</div>"
-
-    if data["edu"]:
-        main += '<div class="section">'
-        main += '<div class="section-title">Education</div>'
-        for edu in data["edu"]:
-            main += '<div class="item">'
-            main += '<div class="item-header">'
-            main += "<div>"
-            main += f'<div class="item-title">{edu["degree"]}</div>'
-            if edu["institution"]:
-                main += f'<div class="item-subtitle">{edu["institution"]}</div>'
-            main += "</div>"
-            if edu["year"]:
-                main += f'<div class="item-duration">{edu["year"]}</div>'
-            main += "</div></div>"
-        main += "</div>"
-
-    if data["cert"]:
-        main += '<div class="section">'
-        main += '<div class="section-title">Certifications</div>'
-        for cert in data["cert"]:
-            main += '<div class="item">'
-            main += f'<div class="item-title">{cert["name"]}</div>'
-            if cert["issuer"] or cert["year"]:
-                details = cert["issuer"] or ""
-                if cert["year"]:
-                    details = f"{details} • {cert['year']}" if details else cert["year"]
-                main += f'<div class="item-subtitle">{details}</div>'
-            main += "</div>"
-        main += "</div>"
-
-    main += "</div>"  # .main
-
-    return sidebar + main
+                details = f"{details} • {cert['year']}" if details else cert["year"]
+            append(f'<div class="item-subtitle">{details}</div>')
+        append("</div>")
+    append("</div>")
+    return "".join(parts)
+
+
+CREATIVE_SIDEBAR_SECTIONS = (
+    ("header", _creative_header),
+    ("skills", _creative_skills),
+    ("languages", _creative_languages),
+)
+
+CREATIVE_MAIN_SECTIONS = (
+    ("summary", _creative_summary),
+    ("exp", _creative_experience),
+    ("proj", _creative_projects),
+    ("edu", _creative_education),
+    ("cert", _creative_certifications),
+)
+
+# How each template's body is put together, shared by PDFs and the live
+# preview: regions, each an (opening tag, closing tag, sections) triple.
+# Modern and classic only differ in CSS, so they share markup.
+STANDARD_LAYOUT = (('<div class="resume-root">', "</div>", STANDARD_SECTIONS),)
+
+TEMPLATE_LAYOUTS = {
+    "modern": STANDARD_LAYOUT,
+    "classic": STANDARD_LAYOUT,
+    "creative": (
+        ('<div class="sidebar">', "</div>", CREATIVE_SIDEBAR_SECTIONS),
+        ('<div class="main">', "</div>", CREATIVE_MAIN_SECTIONS),
+    ),
+}
+
+
+def render_layout(data, template_key):
+    """
+    Render a template's regions section by section, for the live preview.
+
+    Returns [(opening tag, closing tag, [(section name, html)])].
+    """
+    return [
+        (opening, closing, [(name, render(data)) for name, render in sections])
+        for opening, closing, sections in TEMPLATE_LAYOUTS.get(template_key, STANDARD_LAYOUT)
+    ]
+
+
+def preview_page(template_key, color, regions):
+    """
+    Wrap rendered regions in the on-screen page. Each section sits in a
+    ``data-section`` slot (display: contents) so the browser can patch it
+    on its own.
+    """
+    body = "".join(
+        opening
+        + "".join(
+            f'<div data-section="{name}">{html}</div>'
+            for name, html in fragments
+        )
+        + closing
+        for opening, closing, fragments in regions
+    )
+    if template_key == "creative":
+        body = f'<div class="wrapper">{body}</div>'
+    return f'<div class="resume-page template-{template_key}" style="--accent:{color}">{body}</div>'
+
+
+# --------- Helpers for PDF rendering --------- #
+
+
+def cache_lookup(cache, name, key):
+    """Look up ``key`` in ``cache``, counting the hit or miss."""
+    value = cache.get(key)
+    CACHE_LOOKUPS.inc(cache=name, result="miss" if value is None else "hit")
+    return value
+
+
+def render_failure_reason(error):
+    if isinstance(error, (RenderPoolSaturated, QueueFull)):
+        return "busy"
+    if isinstance(error, TimeoutError):
+        return "timeout"
+    if isinstance(error, PageLimitExceeded):
+        return "pages"
+    if isinstance(error, MemoryError):
+        return "memory"
+    if isinstance(error, BrokenProcessPool):
+        return "crashed"
+    return "error"
+
+
+def generate_content(data, template_key):
+    """Generate the resume body for a template (see TEMPLATE_LAYOUTS)."""
+    with RENDER_STAGE_SECONDS.time(template=template_key, stage="html"):
+        return build_content(data, template_key)
+
+
+def build_content(data, template_key):
+    """
+    Join a template's sections into its body.
+
+    Sections aren't cached: building one costs less than hashing the data
+    it reads would (see benchmarks/bench_content.py).
+    """
+    parts = []
+    append = parts.append
+    for opening, closing, sections in TEMPLATE_LAYOUTS.get(template_key, STANDARD_LAYOUT):
+        append(opening)
+        for _, render in sections:
+            append(render(data))
+        append(closing)
+    return "".join(parts)
+
+
+@lru_cache(maxsize=1)
+def get_font_stylesheet():
+    """@font-face rules for the bundled fonts, registered once with FONT_CONFIG."""
+    rules = [
+        f'@font-face {{ font-family: "{family}"; font-weight: {weight}; '
+        f'font-style: {style}; src: url("{(FONTS_DIR / filename).as_uri()}"); }}'
+        for family, weight, style, filename in BUNDLED_FONTS
+    ]
+    return CSS(string="\n".join(rules), font_config=FONT_CONFIG)
+
+
+@lru_cache(maxsize=64)
+def get_stylesheet(template_key, color):
+    """Compiled stylesheet for a template/color pair, parsed once and reused."""
+    css = RESUME_STYLES.get(template_key, RESUME_STYLES["modern"])
+    return CSS(string=css.replace("{color}", color), font_config=FONT_CONFIG)
+
+
+def render_document(content_html, template_key, color):
+    """
+    Wrap generated content into its template skeleton and lay it out.
+    Raises PageLimitExceeded if the result is longer than RESUME_LIMITS allows.
+    """
+    with RENDER_STAGE_SECONDS.time(template=template_key, stage="template"):
+        template_html = RESUME_TEMPLATES.get(template_key, RESUME_TEMPLATES["modern"])
+        template_html = template_html.replace("{content}", content_html)
+        stylesheets = [get_font_stylesheet(), get_stylesheet(template_key, color)]
+
+    with RENDER_STAGE_SECONDS.time(template=template_key, stage="layout"):
+        document = HTML(string=template_html).render(
+            stylesheets=stylesheets, font_config=FONT_CONFIG
+        )
+
+    RESUME_LIMITS.check_pages(document)
+    return document
+
+
+def template_profile(template_key):
+    """The output profile a template renders with unless a request overrides it."""
+    return TEMPLATE_PDF_PROFILES.get(template_key, DEFAULT_PROFILE)
+
+
+def render_pdf(content_html, template_key, color, profile=DEFAULT_PROFILE):
+    """Render generated content to PDF bytes, using an output profile from pdf_profiles.py."""
+    document = render_document(content_html, template_key, color)
+
+    with RENDER_STAGE_SECONDS.time(template=template_key, stage="serialize"):
+        pdf_bytes = document.write_pdf(**write_options(profile))
+
+    PDF_BYTES.observe(len(pdf_bytes), template=template_key)
+    # Usually runs in a pool process, which has no request hook to flush it
+    METRICS.flush()
+    return pdf_bytes
+
+
+def render_pdf_file(content_html, template_key, color, path, profile=DEFAULT_PROFILE):
+    """Render generated content straight into the file at ``path``; returns its size."""
+    document = render_document(content_html, template_key, color)
+
+    with RENDER_STAGE_SECONDS.time(template=template_key, stage="serialize"):
+        document.write_pdf(target=path, **write_options(profile))
+
+    size = os.path.getsize(path)
+    PDF_BYTES.observe(size, template=template_key)
+    METRICS.flush()
+    return size
+
+
+def client_id():
+    """Who the scheduler treats the current request as coming from."""
+    if SCHEDULER_CLIENT_HEADER:
+        value = request.headers.get(SCHEDULER_CLIENT_HEADER, "").split(",")[0].strip()
+        if value:
+            return value
+    return request.remote_addr or "-"
+
+
+def acquire_slot(lane, client):
+    """
+    Wait for a SCHEDULER slot, which the caller must release(). Raises
+    QueueFull if none is free within RENDER_POOL.timeout.
+    """
+    try:
+        waited = SCHEDULER.wait(lane, client, timeout=RENDER_POOL.timeout)
+    except QueueFull:
+        SCHEDULER_REJECTED.inc(lane=lane, reason="queue_full")
+        raise
+    SCHEDULER_WAIT_SECONDS.observe(waited, lane=lane)
+
+
+def submit_render(lane, client, fn, *args):
+    """
+    RENDER_POOL.submit(fn, *args) once SCHEDULER grants a slot, without
+    waiting for it. Returns a Future of the result; raises QueueFull if
+    JOB_QUEUE_SIZE renders are already waiting.
+    """
+    result = Future()
+    if not JOB_QUEUE.acquire(blocking=False):
+        SCHEDULER_REJECTED.inc(lane=lane, reason="queue_full")
+        raise QueueFull("Too many jobs are waiting for a renderer")
+    try:
+        grant = SCHEDULER.acquire(lane, client, limited=False)
+    except BaseException:
+        JOB_QUEUE.release()
+        raise
+
+    def copy_result(future):
+        try:
+            result.set_result(future.result())
+        except BaseException as e:
+            result.set_exception(e)
+
+    def dispatch(grant):
+        JOB_QUEUE.release()
+        SCHEDULER_WAIT_SECONDS.observe(grant.result(), lane=lane)
+        try:
+            future = RENDER_POOL.submit(fn, *args)
+        except Exception as e:
+            SCHEDULER.release()
+            result.set_exception(e)
+            return
+        future.add_done_callback(lambda _: SCHEDULER.release())
+        future.add_done_callback(copy_result)
+
+    grant.add_done_callback(dispatch)
+    return result
+
+
+def run_render(fn, *args):
+    """
+    RENDER_POOL.run(fn, *args) in a SCHEDULER slot for the request's lane,
+    profiled inside the render process when the current request is being
+    profiled. Inline renders (RENDER_WORKERS=0) already show up in the
+    request's own profile.
+    """
+    session = g.get("profile")
+    if session is not None and RENDER_POOL.max_workers > 0:
+        fn, args = profile_call, (session.path("render"), session.interval, fn, *args)
+
+    acquire_slot(g.get("lane", "generate"), g.get("client") or client_id())
+    try:
+        future = RENDER_POOL.submit(fn, *args)
+    except BaseException:
+        SCHEDULER.release()
+        raise
+    # A render we stop waiting for still occupies its process until it ends
+    future.add_done_callback(lambda _: SCHEDULER.release())
+    return RENDER_POOL.result(future)
+
+
+def coalesce(key, render, lookup):
+    """
+    ``render()``, or the result of an identical render already in flight in
+    this process or another worker (found with ``lookup()``). Profiled
+    requests always render themselves.
+    """
+    if SINGLE_FLIGHT is None or "profile" in g:
+        return render()
+    value, shared_from = SINGLE_FLIGHT.do(key, render, lookup, timeout=RENDER_POOL.timeout)
+    if shared_from is not None:
+        RENDERS_COALESCED.inc(scope=shared_from)
+    return value
+
+
+def stream_pdf(data, template_key, color, cache_key, filename, profile):
+    """
+    /generate in PDF_STREAM mode: render into a file and send it from disk.
+
+    Memory-tier hits are still sent from memory. Everything else goes
+    through send_file with a path, which streams the file in chunks and
+    handles Content-Length, ETag and Range requests.
+    """
+
+    def send(path_or_file):
+        return send_file(
+            path_or_file,
+            mimetype="application/pdf",
+            as_attachment=True,
+            download_name=filename,
+            etag=cache_key,
+        )
+
+    if "profile" in g:
+        pdf_bytes, path = None, None
+    else:
+        pdf_bytes, path = PDF_CACHE.get_file(cache_key)
+        CACHE_LOOKUPS.inc(
+            cache="pdf", result="miss" if pdf_bytes is None and path is None else "hit"
+        )
+    try:
+        if pdf_bytes is not None or path is not None:
+            response = send(io.BytesIO(pdf_bytes) if pdf_bytes is not None else path)
+            return with_pdf_links(response, cache_key, filename)
+    except OSError:
+        pass  # Evicted between the lookup and opening it, render it again
+
+    disk = PDF_CACHE.disk
+
+    def render():
+        if disk is not None:
+            tmp_path = disk.temp_path(cache_key)
+        else:
+            os.makedirs(PDF_SPOOL_DIR, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=PDF_SPOOL_DIR, suffix=".pdf")
+            os.close(fd)
+        try:
+            run_render(
+                render_pdf_file,
+                generate_content(data, template_key),
+                template_key,
+                color,
+                tmp_path,
+                profile,
+            )
+        except Exception:
+            DiskCache.discard(tmp_path)
+            raise
+        if disk is None:
+            return tmp_path
+        path = disk.commit(cache_key, tmp_path)
+        if path is None:
+            raise OSError("Could not store the rendered PDF")
+        return path
+
+    path = None
+    try:
+        if disk is None:
+            # A spool file belongs to one response, so there's nothing to share
+            path = render()
+        else:
+            path = coalesce(f"{cache_key}.file", render, lambda: disk.get_path(cache_key))
+        response = send(path)
+    except Exception as e:
+        if disk is None and path is not None:
+            DiskCache.discard(path)
+        return render_error_response(e, template_key)
+
+    if disk is None:
+        # send_file already holds the file open, so the spool file can go now
+        DiskCache.discard(path)
+    else:
+        with_pdf_links(response, cache_key, filename)
+    return response
+
+
+def render_thumbnail(content_html, template_key, color, width, fmt, mode):
+    """Render page 1 of a resume to an encoded image (see thumbnails.py)."""
+    document = render_document(content_html, template_key, color)
+
+    image = None
+    if mode == "full":
+        image = rasterize_pdf(document.write_pdf(), width)
+    if image is None:
+        image = paint_layout(document.pages[0], width)
+
+    METRICS.flush()
+    return encode_image(image, fmt)
+
+
+# --------- Helpers for async jobs --------- #
+
+
+def job_status(job, url=None):
+    status = {
+        "id": job["id"],
+        "status": job["status"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "finished_at": job["finished_at"],
+        "expires_at": job["expires_at"],
+    }
+    if url is not None:
+        status["url"] = url
+    return status
+
+
+def finish_job(job_id, job_url, template_key, cache_key, future, rendered=True):
+    """Store a job's PDF (or error) and fire its callback, if any."""
+    try:
+        pdf_bytes = future.result()
+    except Exception as e:
+        RENDER_FAILURES.inc(template=template_key, reason=render_failure_reason(e))
+        job = JOB_STORE.finish(job_id, error=f"Error generating PDF: {e}")
+    else:
+        if rendered:
+            PDF_CACHE.put(cache_key, pdf_bytes)
+        job = JOB_STORE.finish(job_id, pdf=pdf_bytes)
+
+    if job is not None:
+        JOBS.inc(status=job["status"])
+        if job["callback_url"]:
+            try:
+                notify_callback(
+                    job["callback_url"], job_status(job, job_url), timeout=JOB_CALLBACK_TIMEOUT
+                )
+            except OSError as e:
+                app.logger.warning("Callback for job %s failed: %s", job_id, e)
+
+    METRICS.flush()
+
+
+# --------- Helpers for batch output --------- #
+
+
+class _ZipSink:
+    """Write-only file object that buffers ZIP output until it's drained."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_batch_renders(payloads, lane, client):
+    """Render a batch of JSON resumes; see iter_pool_renders."""
+
+    def items():
+        for index, payload in enumerate(payloads):
+            try:
+                data = resume_data_from_dict(payload)
+            except ValueError as e:
+                yield index, None, str(e)
+                continue
+
+            template_key = data["template"]
+            color = data["color"] or "#2563eb"
+            yield (
+                index,
+                f"{index + 1:04d}_{resume_filename(data)}",
+                (
+                    template_key,
+                    color,
+                    resume_cache_key(data, template_key, color),
+                    lambda: generate_content(data, template_key),
+                ),
+            )
+
+    return iter_pool_renders(items(), lane, client)
+
+
+def parse_variants(variants):
+    """Validate a JSON list of {"template", "color"} objects into unique (template, color) pairs."""
+    if not isinstance(variants, list) or not variants:
+        raise ValueError("variants must be a non-empty JSON array")
+
+    pairs = []
+    for i, variant in enumerate(variants):
+        if not isinstance(variant, dict):
+            raise ValueError(f"variants[{i}] must be an object")
+        template_key = variant.get("template") or "modern"
+        color = variant.get("color") or "#2563eb"
+        if not isinstance(template_key, str) or template_key not in RESUME_TEMPLATES:
+            raise ValueError(f"variants[{i}].template must be one of: {', '.join(RESUME_TEMPLATES)}")
+        if not isinstance(color, str) or not HEX_COLOR.fullmatch(color):
+            raise ValueError(f"variants[{i}].color must be a hex color like #2563eb")
+        if (template_key, color) not in pairs:
+            pairs.append((template_key, color))
+    return pairs
+
+
+def iter_variant_renders(data, variants, lane, client):
+    """
+    Render one resume in several (template, color) variants; see
+    iter_pool_renders. Content HTML doesn't depend on the color, and modern
+    and classic share their markup, so it's generated once per layout.
+    """
+    contents = {}
+
+    def content(template_key):
+        layout = TEMPLATE_LAYOUTS.get(template_key, STANDARD_LAYOUT)[0]
+        if layout not in contents:
+            contents[layout] = generate_content(data, template_key)
+        return contents[layout]
+
+    def items():
+        for index, (template_key, color) in enumerate(variants):
+            yield (
+                index,
+                f"{index + 1:02d}_{template_key}_{color.lstrip('#')}_{resume_filename(data)}",
+                (
+                    template_key,
+                    color,
+                    resume_cache_key(data, template_key, color),
+                    lambda template_key=template_key: content(template_key),
+                ),
+            )
+
+    return iter_pool_renders(items(), lane, client)
+
+
+def iter_pool_renders(items, lane, client):
+    """
+    Render PDFs through the pool, yielding (index, filename, pdf, error) in
+    completion order.
+
+    ``items`` yields (index, filename, job), where job is either an error
+    message or (template_key, color, cache_key, content) and ``content`` is
+    a callable returning the content HTML, only called on a cache miss.
+
+    At most one job per pool worker is outstanding at a time, so memory stays
+    bounded by the pool size rather than the batch size.
+    """
+    window = max(1, RENDER_POOL.max_workers)
+    pending = {}
+    exhausted = False
+
+    try:
+        while True:
+            while not exhausted and len(pending) < window:
+                try:
+                    index, filename, job = next(items)
+                except StopIteration:
+                    exhausted = True
+                    break
+
+                if isinstance(job, str):
+                    yield index, filename, None, job
+                    continue
+
+                template_key, color, cache_key, content = job
+                pdf_bytes = cache_lookup(PDF_CACHE, "pdf", cache_key)
+                if pdf_bytes is not None:
+                    yield index, filename, pdf_bytes, None
+                    continue
+
+                try:
+                    acquire_slot(lane, client)
+                    try:
+                        future = RENDER_POOL.submit(
+                            render_pdf,
+                            content(),
+                            template_key,
+                            color,
+                            template_profile(template_key),
+                            block=True,
+                            timeout=RENDER_POOL.timeout,
+                        )
+                    except BaseException:
+                        SCHEDULER.release()
+                        raise
+                except (RenderPoolSaturated, QueueFull):
+                    RENDER_FAILURES.inc(template=template_key, reason="busy")
+                    yield index, filename, None, "Timed out waiting for a free renderer"
+                    continue
+                future.add_done_callback(lambda _: SCHEDULER.release())
+
+                pending[future] = (index, filename, template_key, cache_key, time.monotonic())
+
+            if not pending:
+                return
+
+            done, _ = wait(pending, timeout=RENDER_POOL.timeout, return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+
+            for future in list(pending):
+                index, filename, template_key, cache_key, started = pending[future]
+                if future in done:
+                    del pending[future]
+                    try:
+                        pdf_bytes = future.result()
+                    except Exception as e:
+                        RENDER_FAILURES.inc(template=template_key, reason=render_failure_reason(e))
+                        yield index, filename, None, f"Error generating PDF: {e}"
+                        continue
+                    PDF_CACHE.put(cache_key, pdf_bytes)
+                    yield index, filename, pdf_bytes, None
+                elif now - started >= RENDER_POOL.timeout:
+                    del pending[future]
+                    future.cancel()
+                    RENDER_FAILURES.inc(template=template_key, reason="timeout")
+                    yield index, filename, None, "Timed out generating PDF"
+    finally:
+        # Client went away or we bailed out early: don't render for nobody
+        for future in pending:
+            future.cancel()
+
+
+def stream_batch_zip(renders):
+    """Yield a ZIP archive of rendered resumes (from iter_pool_renders) chunk by chunk."""
+    sink = _ZipSink()
+    manifest = []
+
+    # PDFs are already compressed, so store them as-is
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as zf:
+        for index, filename, pdf_bytes, error in renders:
+            if error:
+                manifest.append({"index": index, "file": filename, "error": error})
+            else:
+                zf.writestr(filename, pdf_bytes)
+                manifest.append({"index": index, "file": filename, "error": None})
+            yield sink.drain()
+
+        manifest.sort(key=lambda entry: entry["index"])
+        zf.writestr("manifest.json", json.dumps({"items": manifest}, indent=2))
+
+    yield sink.drain()
 
 
 # --------- PDF Templates (CSS + structure) --------- #
 
-RESUME_TEMPLATES = {
+# Per-template stylesheets. These are compiled into weasyprint.CSS objects
+# once per (template, color) by get_stylesheet(), so a request only has to
+# parse the small document skeleton below.
+RESUME_STYLES = {
     "modern": """
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <style>
-        @page {
-            size: A4;
-            margin: 1.8cm 1.8cm 1.8cm 1.8cm;
-        }
-        * {
-            box-sizing: border-box;
-        }
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", system-ui, sans-serif;
-            line-height: 1.5;
-            color: #111827;
-            background: #ffffff;
-            font-size: 11pt;
-        }
+@page {
+    size: A4;
+    margin: 1.8cm 1.8cm 1.8cm 1.8cm;
+}
+* {
+    box-sizing: border-box;
+}
+body {
+    font-family: "Resume Sans", -apple-system, BlinkMacSystemFont, "Segoe UI", system-ui, sans-serif;
+    line-height: 1.5;
+    color: #111827;
+    background: #ffffff;
+    font-size: 11pt;
+}
 
-        .resume-root {
-        }
+.resume-root {
+}
 
-        .header {
-            padding-bottom: 6mm;
-            margin-bottom: 6mm;
-            border-bottom: 2px solid #e5e7eb;
-        }
+.header {
+    padding-bottom: 6mm;
+    margin-bottom: 6mm;
+    border-bottom: 2px solid #e5e7eb;
+}
 
-        h1 {
-            font-size: 22pt;
-            margin: 0 0 2mm 0;
-            color: {color};
-            font-weight: 700;
-            letter-spacing: 0.02em;
-        }
+h1 {
+    font-size: 22pt;
+    margin: 0 0 2mm 0;
+    color: {color};
+    font-weight: 700;
+    letter-spacing: 0.02em;
+}
 
-        .contact {
-            font-size: 9pt;
-            color: #4b5563;
-            display: flex;
-            flex-wrap: wrap;
-            gap: 4mm 6mm;
-            margin-top: 1mm;
-        }
+.contact {
+    font-size: 9pt;
+    color: #4b5563;
+    display: flex;
+    flex-wrap: wrap;
+    gap: 4mm 6mm;
+    margin-top: 1mm;
+}
 
-        .resume-section {
-            margin-bottom: 7mm;
-            page-break-inside: avoid;
-        }
+.resume-section {
+    margin-bottom: 7mm;
+    page-break-inside: avoid;
+}
 
-        .resume-section-title {
-            font-size: 10pt;
-            font-weight: 700;
-            text-transform: uppercase;
-            letter-spacing: 0.14em;
-            color: #111827;
-            margin-bottom: 3mm;
-            display: flex;
-            align-items: center;
-            gap: 4mm;
-        }
+.resume-section-title {
+    font-size: 10pt;
+    font-weight: 700;
+    text-transform: uppercase;
+    letter-spacing: 0.14em;
+    color: #111827;
+    margin-bottom: 3mm;
+    display: flex;
+    align-items: center;
+    gap: 4mm;
+}
 
-        .resume-section-title::after {
-            content: "";
-            flex: 1;
-            height: 1px;
-            background: linear-gradient(to right, {color}, transparent);
-        }
+.resume-section-title::after {
+    content: "";
+    flex: 1;
+    height: 1px;
+    background: linear-gradient(to right, {color}, transparent);
+}
 
-        .resume-summary,
-        .resume-languages {
-            font-size: 9.8pt;
-            line-height: 1.6;
-            color: #374151;
-        }
+.resume-summary,
+.resume-languages {
+    font-size: 9.8pt;
+    line-height: 1.6;
+    color: #374151;
+}
 
-        .item {
-            margin-bottom: 3.5mm;
-            page-break-inside: avoid;
-        }
+.item {
+    margin-bottom: 3.5mm;
+    page-break-inside: avoid;
+}
 
-        .item-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: baseline;
-            gap: 3mm;
-            margin-bottom: 1mm;
-        }
+.item-header {
+    display: flex;
+    justify-content: space-between;
+    align-items: baseline;
+    gap: 3mm;
+    margin-bottom: 1mm;
+}
 
-        .item-title {
-            font-weight: 600;
-            font-size: 10pt;
-            color: #111827;
-        }
+.item-title {
+    font-weight: 600;
+    font-size: 10pt;
+    color: #111827;
+}
 
-        .item-subtitle {
-            color: #6b7280;
-            font-size: 9pt;
-            font-style: italic;
-        }
+.item-subtitle {
+    color: #6b7280;
+    font-size: 9pt;
+    font-style: italic;
+}
 
-        .item-duration {
-            color: #6b7280;
-            font-size: 8.8pt;
-            white-space: nowrap;
-        }
+.item-duration {
+    color: #6b7280;
+    font-size: 8.8pt;
+    white-space: nowrap;
+}
 
-        .item-description {
-            font-size: 9pt;
-            line-height: 1.55;
-            color: #374151;
-            margin-top: 1mm;
-        }
+.item-description {
+    font-size: 9pt;
+    line-height: 1.55;
+    color: #374151;
+    margin-top: 1mm;
+}
 
-        .item-description ul {
-            margin: 0;
-            padding-left: 4mm;
-        }
+.item-description ul {
+    margin: 0;
+    padding-left: 4mm;
+}
 
-        .item-description li {
-            margin: 0 0 1mm 0;
-            padding: 0;
-        }
+.item-description li {
+    margin: 0 0 1mm 0;
+    padding: 0;
+}
 
-        .item-description li::marker {
-            color: {color};
-        }
+.item-description li::marker {
+    color: {color};
+}
 
-        .skills-list {
-            display: flex;
-            flex-wrap: wrap;
-            gap: 3mm;
-        }
+.skills-list {
+    display: flex;
+    flex-wrap: wrap;
+    gap: 3mm;
+}
 
-        .skill-tag {
-            padding: 1.8mm 5mm;
-            border-radius: 999px;
-            font-size: 9pt;
-            font-weight: 500;
-            border: none;
-            background: rgba(37, 99, 235, 0.10);
-            color: #111827;
-        }
-    </style>
+.skill-tag {
+    padding: 1.8mm 5mm;
+    border-radius: 999px;
+    font-size: 9pt;
+    font-weight: 500;
+    border: none;
+    background: rgba(37, 99, 235, 0.10);
+    color: #111827;
+}
+""",
+
+    "classic": """
+@page {
+    size: A4;
+    margin: 2.2cm;
+}
+body {
+    font-family: "Resume Serif", "Times New Roman", serif;
+    line-height: 1.6;
+    color: #000000;
+    background: #ffffff;
+    font-size: 11pt;
+}
+.header {
+    text-align: center;
+    border-bottom: 1px solid #000;
+    padding-bottom: 5mm;
+    margin-bottom: 7mm;
+}
+h1 {
+    font-size: 20pt;
+    margin: 0 0 3mm 0;
+    font-weight: 700;
+    text-transform: uppercase;
+    letter-spacing: 0.12em;
+}
+.contact {
+    font-size: 9.5pt;
+}
+.contact span {
+    margin: 0 4mm;
+}
+.resume-section {
+    margin-bottom: 7mm;
+    page-break-inside: avoid;
+}
+.resume-section-title {
+    font-size: 11.5pt;
+    font-weight: 700;
+    text-transform: uppercase;
+    border-bottom: 1px solid #000;
+    padding-bottom: 2mm;
+    margin-bottom: 3mm;
+    letter-spacing: 0.08em;
+}
+.resume-summary,
+.resume-languages {
+    font-size: 10pt;
+    text-align: justify;
+}
+.item {
+    margin-bottom: 4mm;
+    page-break-inside: avoid;
+}
+.item-header {
+    display: flex;
+    justify-content: space-between;
+    margin-bottom: 1mm;
+}
+.item-title {
+    font-weight: 700;
+    font-size: 10.5pt;
+}
+.item-subtitle {
+    font-style: italic;
+    font-size: 10pt;
+}
+.item-duration {
+    font-size: 9.5pt;
+    white-space: nowrap;
+}
+.item-description {
+    font-size: 10pt;
+    margin-top: 1mm;
+}
+.item-description ul {
+    margin: 0;
+    padding-left: 4mm;
+}
+.skills-list {
+    font-size: 10pt;
+}
+.skill-tag {
+    margin-right: 3mm;
+}
+""",
+
+    "creative": """
+@page {
+    size: A4;
+    margin: 0;
+}
+body {
+    font-family: "Resume Sans", -apple-system, BlinkMacSystemFont, "Segoe UI", system-ui, sans-serif;
+    line-height: 1.5;
+    color: #111827;
+    background: #ffffff;
+    font-size: 11pt;
+}
+.wrapper {
+    display: flex;
+    min-height: 100vh;
+}
+.sidebar {
+    width: 32%;
+    background: {color};
+    color: #ffffff;
+    padding: 22mm 10mm 18mm 18mm;
+    box-sizing: border-box;
+}
+.main {
+    width: 68%;
+    padding: 22mm 20mm 18mm 16mm;
+    box-sizing: border-box;
+}
+.sidebar h1 {
+    font-size: 20pt;
+    margin: 0 0 3mm 0;
+    font-weight: 700;
+}
+.sidebar .role {
+    font-size: 10pt;
+    opacity: 0.9;
+    margin-bottom: 6mm;
+}
+.sidebar .contact {
+    font-size: 9pt;
+    line-height: 1.8;
+    margin-bottom: 8mm;
+}
+.sidebar .section-title {
+    font-size: 10pt;
+    font-weight: 700;
+    text-transform: uppercase;
+    letter-spacing: 0.14em;
+    margin: 0 0 3mm 0;
+    border-bottom: 1px solid rgba(255,255,255,0.3);
+    padding-bottom: 2mm;
+}
+.sidebar .skills,
+.sidebar .languages {
+    font-size: 9pt;
+    line-height: 1.7;
+}
+
+.main .section {
+    margin-bottom: 8mm;
+    page-break-inside: avoid;
+}
+.main .section-title {
+    font-size: 10.5pt;
+    font-weight: 700;
+    text-transform: uppercase;
+    letter-spacing: 0.14em;
+    color: {color};
+    margin-bottom: 3mm;
+}
+.main .summary {
+    font-size: 10pt;
+    color: #374151;
+}
+.item {
+    margin-bottom: 4mm;
+    page-break-inside: avoid;
+}
+.item-header {
+    display: flex;
+    justify-content: space-between;
+    align-items: baseline;
+    margin-bottom: 1mm;
+}
+.item-title {
+    font-weight: 600;
+    font-size: 10.2pt;
+}
+.item-subtitle {
+    color: #6b7280;
+    font-size: 9.5pt;
+    font-style: italic;
+}
+.item-duration {
+    color: #6b7280;
+    font-size: 9pt;
+    white-space: nowrap;
+}
+.item-description {
+    font-size: 9.5pt;
+    color: #374151;
+}
+.item-description ul {
+    margin: 0;
+    padding-left: 4mm;
+}
+"""
+}
+
+RESUME_TEMPLATES = {
+    "modern": """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
 </head>
 <body>
     <div class="resume-root">
@@ -626,91 +2493,6 @@ RESUME_TEMPLATES = {
 <html>
 <head>
     <meta charset="utf-8">
-    <style>
-        @page {
-            size: A4;
-            margin: 2.2cm;
-        }
-        body {
-            font-family: "Times New Roman", serif;
-            line-height: 1.6;
-            color: #000000;
-            background: #ffffff;
-            font-size: 11pt;
-        }
-        .header {
-            text-align: center;
-            border-bottom: 1px solid #000;
-            padding-bottom: 5mm;
-            margin-bottom: 7mm;
-        }
-        h1 {
-            font-size: 20pt;
-            margin: 0 0 3mm 0;
-            font-weight: 700;
-            text-transform: uppercase;
-            letter-spacing: 0.12em;
-        }
-        .contact {
-            font-size: 9.5pt;
-        }
-        .contact span {
-            margin: 0 4mm;
-        }
-        .resume-section {
-            margin-bottom: 7mm;
-            page-break-inside: avoid;
-        }
-        .resume-section-title {
-            font-size: 11.5pt;
-            font-weight: 700;
-            text-transform: uppercase;
-            border-bottom: 1px solid #000;
-            padding-bottom: 2mm;
-            margin-bottom: 3mm;
-            letter-spacing: 0.08em;
-        }
-        .resume-summary,
-        .resume-languages {
-            font-size: 10pt;
-            text-align: justify;
-        }
-        .item {
-            margin-bottom: 4mm;
-            page-break-inside: avoid;
-        }
-        .item-header {
-            display: flex;
-            justify-content: space-between;
-            margin-bottom: 1mm;
-        }
-        .item-title {
-            font-weight: 700;
-            font-size: 10.5pt;
-        }
-        .item-subtitle {
-            font-style: italic;
-            font-size: 10pt;
-        }
-        .item-duration {
-            font-size: 9.5pt;
-            white-space: nowrap;
-        }
-        .item-description {
-            font-size: 10pt;
-            margin-top: 1mm;
-        }
-        .item-description ul {
-            margin: 0;
-            padding-left: 4mm;
-        }
-        .skills-list {
-            font-size: 10pt;
-        }
-        .skill-tag {
-            margin-right: 3mm;
-        }
-    </style>
 </head>
 <body>
     <div class="resume-root">
@@ -725,113 +2507,6 @@ RESUME_TEMPLATES = {
 <html>
 <head>
     <meta charset="utf-8">
-    <style>
-        @page {
-            size: A4;
-            margin: 0;
-        }
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", system-ui, sans-serif;
-            line-height: 1.5;
-            color: #111827;
-            background: #ffffff;
-            font-size: 11pt;
-        }
-        .wrapper {
-            display: flex;
-            min-height: 100vh;
-        }
-        .sidebar {
-            width: 32%;
-            background: {color};
-            color: #ffffff;
-            padding: 22mm 10mm 18mm 18mm;
-            box-sizing: border-box;
-        }
-        .main {
-            width: 68%;
-            padding: 22mm 20mm 18mm 16mm;
-            box-sizing: border-box;
-        }
-        .sidebar h1 {
-            font-size: 20pt;
-            margin: 0 0 3mm 0;
-            font-weight: 700;
-        }
-        .sidebar .role {
-            font-size: 10pt;
-            opacity: 0.9;
-            margin-bottom: 6mm;
-        }
-        .sidebar .contact {
-            font-size: 9pt;
-            line-height: 1.8;
-            margin-bottom: 8mm;
-        }
-        .sidebar .section-title {
-            font-size: 10pt;
-            font-weight: 700;
-            text-transform: uppercase;
-            letter-spacing: 0.14em;
-            margin: 0 0 3mm 0;
-            border-bottom: 1px solid rgba(255,255,255,0.3);
-            padding-bottom: 2mm;
-        }
-        .sidebar .skills,
-        .sidebar .languages {
-            font-size: 9pt;
-            line-height: 1.7;
-        }
-
-        .main .section {
-            margin-bottom: 8mm;
-            page-break-inside: avoid;
-        }
-        .main .section-title {
-            font-size: 10.5pt;
-            font-weight: 700;
-            text-transform: uppercase;
-            letter-spacing: 0.14em;
-            color: {color};
-            margin-bottom: 3mm;
-        }
-        .main .summary {
-            font-size: 10pt;
-            color: #374151;
-        }
-        .item {
-            margin-bottom: 4mm;
-            page-break-inside: avoid;
-        }
-        .item-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: baseline;
-            margin-bottom: 1mm;
-        }
-        .item-title {
-            font-weight: 600;
-            font-size: 10.2pt;
-        }
-        .item-subtitle {
-            color: #6b7280;
-            font-size: 9.5pt;
-            font-style: italic;
-        }
-        .item-duration {
-            color: #6b7280;
-            font-size: 9pt;
-            white-space: nowrap;
-        }
-        .item-description {
-            font-size: 9.5pt;
-            color: #374151;
-        }
-        .item-description ul {
-            margin: 0;
-            padding-left: 4mm;
-        }
-    </style>
 </head>
 <body>
     <div class="wrapper">
@@ -843,5 +2518,56 @@ RESUME_TEMPLATES = {
 }
 
 
+# --------- Warmup --------- #
+
+# Throwaway resume that touches every section, so warmup exercises the same
+# fonts (weights, italics) and CSS rules as real documents.
+WARMUP_RESUME = {
+    "name": "Warmup Resume",
+    "email": "warmup@example.com",
+    "phone": "+1 555 0100",
+    "location": "Springfield",
+    "linkedin": "linkedin.com/in/warmup",
+    "website": "example.com",
+    "summary": "Engineer who keeps the first request fast.",
+    "skills": "Python, Flask, WeasyPrint",
+    "languages": "English, French",
+    "exp": [
+        {
+            "title": "Engineer",
+            "company": "Example Co",
+            "duration": "2020 - Present",
+            "description": "Rendered resumes\nKept them fast",
+        }
+    ],
+    "edu": [{"degree": "BSc Computer Science", "institution": "State University", "year": "2019"}],
+    "proj": [{"name": "Resume Generator", "description": "PDF resumes", "link": "example.com"}],
+    "cert": [{"name": "Certified Renderer", "issuer": "Example Org", "year": "2021"}],
+}
+
+
+def warmup():
+    """
+    Render a throwaway resume with every template so WeasyPrint's lazy
+    imports, font loading and stylesheet parsing happen before the first real
+    request. Returns the seconds spent per template.
+    """
+    timings = {}
+    for template_key in RESUME_TEMPLATES:
+        started = time.perf_counter()
+        data = resume_data_from_dict({**WARMUP_RESUME, "template": template_key})
+        render_pdf(
+            generate_content(data, template_key),
+            template_key,
+            data["color"],
+            template_profile(template_key),
+        )
+        timings[template_key] = time.perf_counter() - started
+
+    # Warmup renders aren't traffic; keep them out of /metrics
+    METRICS.reset()
+    return timings
+
+
 if __name__ == "__main__":
     app.run(debug=True, host="0.0.0.0", port=5000)
@@ -0,0 +1,267 @@
+"""
+Deduplicated on-disk store for rendered PDFs.
+
+Files are addressed by the SHA-256 of their bytes, so a PDF is stored once
+no matter how many cache keys (resume + template + color + profile) render
+to it. A SQLite index next to the files maps cache keys to digests and
+tracks each file's size, creation and last access time, plus the download
+name given to it with set_filename():
+
+    <directory>/objects/ab/<digest>.pdf
+    <directory>/index.sqlite
+
+ArtifactStore has DiskCache's interface (get, get_path, put, temp_path,
+commit, discard), so it can be PDFCache's disk tier. Garbage collection
+runs at most every ``gc_interval`` seconds, piggybacking on writes: files
+not served or stored again for ``max_age`` seconds are dropped, then the
+least recently used ones until the store fits in ``max_bytes``.
+
+Like SQLiteJobStore, it is safe to share between gunicorn workers and to
+build before they fork.
+"""
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+# Temp files this old were abandoned by a crashed writer
+_STALE_TEMP_SECONDS = 3600
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    def __init__(
+        self,
+        directory,
+        max_bytes=1024 * 1024 * 1024,
+        max_age=30 * 24 * 3600,
+        gc_interval=300,
+        suffix=".pdf",
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.gc_interval = gc_interval
+        self.suffix = suffix
+        self.index_path = os.path.join(directory, "index.sqlite")
+        self._objects = os.path.join(directory, "objects")
+        self._tmp = os.path.join(directory, "tmp")
+        self._local = threading.local()
+        self._last_gc = 0.0
+
+        os.makedirs(self._objects, exist_ok=True)
+        os.makedirs(self._tmp, exist_ok=True)
+
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS objects (
+                    digest TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS objects_accessed_at ON objects (accessed_at);
+                CREATE TABLE IF NOT EXISTS keys (
+                    key TEXT PRIMARY KEY,
+                    digest TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS keys_digest ON keys (digest);
+                CREATE TABLE IF NOT EXISTS filenames (
+                    digest TEXT PRIMARY KEY,
+                    filename TEXT NOT NULL
+                );
+                """
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _conn(self):
+        pid, conn = getattr(self._local, "conn", (None, None))
+        if pid != os.getpid():
+            conn = sqlite3.connect(self.index_path, timeout=30)
+            self._local.conn = (os.getpid(), conn)
+        return conn
+
+    def path_for_digest(self, digest):
+        return os.path.join(self._objects, digest[:2], digest + self.suffix)
+
+    # --------- Lookups --------- #
+
+    def digest_for(self, key):
+        """The digest of the file stored for ``key``, or None."""
+        row = self._conn().execute("SELECT digest FROM keys WHERE key = ?", (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    def filename_for(self, digest):
+        """The download name recorded for a stored file, or None."""
+        row = self._conn().execute(
+            "SELECT filename FROM filenames WHERE digest = ?", (digest,)
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def open_digest(self, digest):
+        """
+        Path of the stored file with this digest, marking it as used, or
+        None if it has been collected.
+        """
+        path = self.path_for_digest(digest)
+        conn = self._conn()
+        with conn:
+            found = conn.execute(
+                "UPDATE objects SET accessed_at = ? WHERE digest = ?", (time.time(), digest)
+            ).rowcount
+        if found and os.path.exists(path):
+            return path
+        if found:
+            self._forget(digest)  # The file went missing under us
+        return None
+
+    def get_path(self, key):
+        digest = self.digest_for(key)
+        return self.open_digest(digest) if digest is not None else None
+
+    def get(self, key):
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as fh:
+                return fh.read()
+        except OSError:
+            return None
+
+    # --------- Writes --------- #
+
+    def put(self, key, value):
+        tmp_path = self.temp_path(key)
+        try:
+            with open(tmp_path, "wb") as fh:
+                fh.write(value)
+        except OSError:
+            self.discard(tmp_path)
+            return
+        self.commit(key, tmp_path)
+
+    def temp_path(self, key):
+        """An empty temp file for a writer to fill; hand it to commit() or discard()."""
+        fd, tmp_path = tempfile.mkstemp(dir=self._tmp, suffix=".tmp")
+        os.close(fd)
+        return tmp_path
+
+    def commit(self, key, tmp_path):
+        """
+        Store a finished temp file under ``key`` and return the stored path
+        (or None). If identical bytes are already stored, the temp file is
+        dropped and ``key`` points at the existing copy.
+        """
+        try:
+            digest = file_digest(tmp_path)
+            size = os.path.getsize(tmp_path)
+            path = self.path_for_digest(digest)
+            if os.path.exists(path):
+                self.discard(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+        except OSError:
+            self.discard(tmp_path)
+            return None
+
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT INTO objects (digest, size, created_at, accessed_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (digest) DO UPDATE SET accessed_at = excluded.accessed_at",
+                (digest, size, now, now),
+            )
+            conn.execute(
+                "INSERT INTO keys (key, digest) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET digest = excluded.digest",
+                (key, digest),
+            )
+
+        if now - self._last_gc >= self.gc_interval:
+            self.gc()
+        return path
+
+    def set_filename(self, digest, filename):
+        """Record the name a stored file is downloaded under."""
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT INTO filenames (digest, filename) VALUES (?, ?) "
+                "ON CONFLICT (digest) DO UPDATE SET filename = excluded.filename "
+                "WHERE filename != excluded.filename",
+                (digest, filename),
+            )
+
+    @staticmethod
+    def discard(tmp_path):
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+    # --------- Garbage collection --------- #
+
+    def _forget(self, digest):
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM keys WHERE digest = ?", (digest,))
+            conn.execute("DELETE FROM filenames WHERE digest = ?", (digest,))
+            conn.execute("DELETE FROM objects WHERE digest = ?", (digest,))
+
+    def _remove(self, digest):
+        self._forget(digest)
+        self.discard(self.path_for_digest(digest))
+
+    def gc(self):
+        """Apply the age and size policies; returns the number of files removed."""
+        now = self._last_gc = time.time()
+        conn = self._conn()
+        removed = 0
+
+        if self.max_age:
+            expired = conn.execute(
+                "SELECT digest FROM objects WHERE accessed_at <= ?", (now - self.max_age,)
+            ).fetchall()
+            for (digest,) in expired:
+                self._remove(digest)
+                removed += 1
+
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+        if self.max_bytes and total > self.max_bytes:
+            # Least recently used first, down to ~90% of the budget
+            target = int(self.max_bytes * 0.9)
+            rows = conn.execute(
+                "SELECT digest, size FROM objects ORDER BY accessed_at"
+            ).fetchall()
+            for digest, size in rows:
+                if total <= target:
+                    break
+                self._remove(digest)
+                total -= size
+                removed += 1
+
+        for entry in os.scandir(self._tmp):
+            try:
+                if now - entry.stat().st_mtime > _STALE_TEMP_SECONDS:
+                    self.discard(entry.path)
+            except OSError:
+                continue
+        return removed
@@ -0,0 +1,381 @@
+"""
+Microbenchmark for the HTML content generators.
+
+Usage:
+    python benchmarks/bench_content.py [--repeat 20] [--rounds 25]
+
+Times app.build_content, the builder behind app.generate_content (which
+only adds the html stage timer), against the original `html += ...`
+implementations (kept verbatim below) on small, typical and pathological
+resumes, checks both produce identical output, and exits non-zero if the
+new path is slower than the old one on any of them.
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+
+def make_resume(n_exp, n_proj, n_edu, n_cert, bullets):
+    description = "\n".join(
+        f"• Delivered improvement number {i} across the platform" for i in range(bullets)
+    )
+    return {
+        "name": "Jane Doe",
+        "email": "jane@example.com",
+        "phone": "+1 555 0100",
+        "location": "New York, NY",
+        "linkedin": "linkedin.com/in/janedoe",
+        "website": "janedoe.dev",
+        "summary": "Engineer with eight years of experience building web platforms.",
+        "skills": ", ".join(f"Skill {i}" for i in range(12)),
+        "languages": "English (Native), Spanish (Fluent)",
+        "template": "modern",
+        "color": "#2563eb",
+        "exp": [
+            {
+                "title": f"Engineer {i}",
+                "company": "Tech Corp",
+                "duration": "2019 - 2021",
+                "description": description,
+            }
+            for i in range(n_exp)
+        ],
+        "proj": [
+            {"name": f"Project {i}", "description": description, "link": "github.com/jane/p"}
+            for i in range(n_proj)
+        ],
+        "edu": [
+            {"degree": f"Degree {i}", "institution": "State University", "year": "2015"}
+            for i in range(n_edu)
+        ],
+        "cert": [
+            {"name": f"Cert {i}", "issuer": "Issuer", "year": "2022"}
+            for i in range(n_cert)
+        ],
+    }
+
+
+CASES = {
+    "small": make_resume(1, 0, 1, 0, bullets=2),
+    "typical": make_resume(4, 2, 2, 2, bullets=5),
+    "pathological": make_resume(150, 100, 20, 50, bullets=12),
+}
+
+
+# --------- Original implementations, for comparison --------- #
+
+
+def legacy_format_multiline_as_bullets(text: str) -> str:
+    """
+    Turn a multiline textarea into <ul><li>…</li></ul>
+    for cleaner PDF bullet lists.
+    """
+    lines = [line.strip() for line in text.splitlines()]
+    lines = [l for l in lines if l]
+
+    if not lines:
+        return ""
+
+    items = []
+    for line in lines:
+        if line.startswith("•"):
+            line = line.lstrip("•").strip()
+        items.append(line)
+
+    html = "<ul>"
+    for item in items:
+        html += f"<li>{item}</li>"
+    html += "</ul>"
+    return html
+
+
+def legacy_generate_standard_content(data):
+    """
+    Single-column, modern/classic layout.
+    This structure will be mirrored in the live preview.
+    """
+    name = data["name"] or "Your Name"
+
+    html = '<div class="resume-root">'
+    # Header
+    html += '<div class="header">'
+    html += f"<h1>{name}</h1>"
+
+    # Contact row
+    contact_bits = []
+    if data["email"]:
+        contact_bits.append(data["email"])
+    if data["phone"]:
+        contact_bits.append(data["phone"])
+    if data["location"]:
+        contact_bits.append(data["location"])
+    if data["linkedin"]:
+        contact_bits.append(data["linkedin"])
+    if data["website"]:
+        contact_bits.append(data["website"])
+
+    html += '<div class="contact">'
+    for bit in contact_bits:
+        html += f"<span>{bit}</span>"
+    html += "</div>"  # .contact
+    html += "</div>"  # .header
+
+    # Summary
+    if data["summary"]:
+        html += '<div class="resume-section">'
+        html += '<div class="resume-section-title">Professional Summary</div>'
+        html += f'<div class="resume-summary">{data["summary"]}</div>'
+        html += "</div>"
+
+    # Experience
+    if data["exp"]:
+        html += '<div class="resume-section">'
+        html += '<div class="resume-section-title">Work Experience</div>'
+        for exp in data["exp"]:
+            html += '<div class="item">'
+            html += '<div class="item-header">'
+            html += "<div>"
+            html += f'<div class="item-title">{exp["title"]}</div>'
+            if exp["company"]:
+                html += f'<div class="item-subtitle">{exp["company"]}</div>'
+            html += "</div>"
+            if exp["duration"]:
+                html += f'<div class="item-duration">{exp["duration"]}</div>'
+            html += "</div>"  # .item-header
+
+            if exp["description"]:
+                desc_html = legacy_format_multiline_as_bullets(exp["description"])
+                html += f'<div class="item-description">{desc_html}</div>'
+            html += "</div>"  # .item
+        html += "</div>"  # .resume-section
+
+    # Projects
+    if data["proj"]:
+        html += '<div class="resume-section">'
+        html += '<div class="resume-section-title">Projects</div>'
+        for proj in data["proj"]:
+            html += '<div class="item">'
+            html += f'<div class="item-title">{proj["name"]}</div>'
+            if proj["link"]:
+                html += f'<div class="item-subtitle">{proj["link"]}</div>'
+            if proj["description"]:
+                desc_html = legacy_format_multiline_as_bullets(proj["description"])
+                html += f'<div class="item-description">{desc_html}</div>'
+            html += "</div>"
+        html += "</div>"
+
+    # Education
+    if data["edu"]:
+        html += '<div class="resume-section">'
+        html += '<div class="resume-section-title">Education</div>'
+        for edu in data["edu"]:
+            html += '<div class="item">'
+            html += '<div class="item-header">'
+            html += "<div>"
+            html += f'<div class="item-title">{edu["degree"]}</div>'
+            if edu["institution"]:
+                html += f'<div class="item-subtitle">{edu["institution"]}</div>'
+            html += "</div>"
+            if edu["year"]:
+                html += f'<div class="item-duration">{edu["year"]}</div>'
+            html += "</div></div>"
+        html += "</div>"
+
+    # Certifications
+    if data["cert"]:
+        html += '<div class="resume-section">'
+        html += '<div class="resume-section-title">Certifications</div>'
+        for cert in data["cert"]:
+            html += '<div class="item">'
+            html += '<div class="item-header">'
+            html += "<div>"
+            html += f'<div class="item-title">{cert["name"]}</div>'
+            if cert["issuer"]:
+                html += f'<div class="item-subtitle">{cert["issuer"]}</div>'
+            html += "</div>"
+            if cert["year"]:
+                html += f'<div class="item-duration">{cert["year"]}</div>'
+            html += "</div></div>"
+        html += "</div>"
+
+    # Skills
+    if data["skills"]:
+        html += '<div class="resume-section">'
+        html += '<div class="resume-section-title">Skills</div>'
+        html += '<div class="skills-list">'
+        for skill in data["skills"].split(","):
+            skill = skill.strip()
+            if skill:
+                html += f'<span class="skill-tag">{skill}</span>'
+        html += "</div></div>"
+
+    # Languages
+    if data["languages"]:
+        html += '<div class="resume-section">'
+        html += '<div class="resume-section-title">Languages</div>'
+        html += f'<div class="resume-languages">{data["languages"]}</div>'
+        html += "</div>"
+
+    html += "</div>"  # .resume-root
+    return html
+
+
+def legacy_generate_creative_content(data):
+    """Two-column 'creative' layout content (sidebar + main)."""
+    # Sidebar
+    sidebar = '<div class="sidebar">'
+    sidebar += f"<h1>{data['name'] or 'Your Name'}</h1>"
+    sidebar += '<div class="contact">'
+    if data["email"]:
+        sidebar += f"<div>{data['email']}</div>"
+    if data["phone"]:
+        sidebar += f"<div>{data['phone']}</div>"
+    if data["location"]:
+        sidebar += f"<div>{data['location']}</div>"
+    if data["linkedin"]:
+        sidebar += f"<div>{data['linkedin']}</div>"
+    if data["website"]:
+        sidebar += f"<div>{data['website']}</div>"
+    sidebar += "</div>"
+
+    if data["skills"]:
+        sidebar += '<div class="section-title">Skills</div>'
+        sidebar += '<div class="skills">'
+        skills_lines = [s.strip() for s in data["skills"].split(",") if s.strip()]
+        sidebar += "<br>".join(skills_lines)
+        sidebar += "</div>"
+
+    if data["languages"]:
+        sidebar += '<div class="section-title">Languages</div>'
+        sidebar += f'<div class="skills">{data["languages"]}</div>'
+
+    sidebar += "</div>"
+
+    # Main column
+    main = '<div class="main">'
+
+    if data["summary"]:
+        main += '<div class="section">'
+        main += '<div class="section-title">About Me</div>'
+        main += f'<div class="summary">{data["summary"]}</div>'
+        main += "</div>"
+
+    if data["exp"]:
+        main += '<div class="section">'
+        main += '<div class="section-title">Experience</div>'
+        for exp in data["exp"]:
+            main += '<div class="item">'
+            main += '<div class="item-header">'
+            main += "<div>"
+            main += f'<div class="item-title">{exp["title"]}</div>'
+            if exp["company"]:
+                main += f'<div class="item-subtitle">{exp["company"]}</div>'
+            main += "</div>"
+            if exp["duration"]:
+                main += f'<div class="item-duration">{exp["duration"]}</div>'
+            main += "</div>"
+            if exp["description"]:
+                desc_html = legacy_format_multiline_as_bullets(exp["description"])
+                main += f'<div class="item-description">{desc_html}</div>'
+            main += "</div>"
+        main += "</div>"
+
+    if data["proj"]:
+        main += '<div class="section">'
+        main += '<div class="section-title">Projects</div>'
+        for proj in data["proj"]:
+            main += '<div class="item">'
+            main += f'<div class="item-title">{proj["name"]}</div>'
+            if proj["link"]:
+                main += f'<div class="item-subtitle">{proj["link"]}</div>'
+            if proj["description"]:
+                desc_html = legacy_format_multiline_as_bullets(proj["description"])
+                main += f'<div class="item-description">{desc_html}</div>'
+            main += "</div>"
+        main += "</div>"
+
+    if data["edu"]:
+        main += '<div class="section">'
+        main += '<div class="section-title">Education</div>'
+        for edu in data["edu"]:
+            main += '<div class="item">'
+            main += '<div class="item-header">'
+            main += "<div>"
+            main += f'<div class="item-title">{edu["degree"]}</div>'
+            if edu["institution"]:
+                main += f'<div class="item-subtitle">{edu["institution"]}</div>'
+            main += "</div>"
+            if edu["year"]:
+                main += f'<div class="item-duration">{edu["year"]}</div>'
+            main += "</div></div>"
+        main += "</div>"
+
+    if data["cert"]:
+        main += '<div class="section">'
+        main += '<div class="section-title">Certifications</div>'
+        for cert in data["cert"]:
+            main += '<div class="item">'
+            main += f'<div class="item-title">{cert["name"]}</div>'
+            if cert["issuer"] or cert["year"]:
+                details = cert["issuer"] or ""
+                if cert["year"]:
+                    details = f"{details} • {cert['year']}" if details else cert["year"]
+                main += f'<div class="item-subtitle">{details}</div>'
+            main += "</div>"
+        main += "</div>"
+
+    main += "</div>"  # .main
+
+    return sidebar + main
+
+
+# --------- Runner --------- #
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20, help="calls per timing round")
+    parser.add_argument("--rounds", type=int, default=25)
+    args = parser.parse_args()
+
+    pairs = [
+        ("standard", legacy_generate_standard_content, "modern"),
+        ("creative", legacy_generate_creative_content, "creative"),
+    ]
+
+    def per_call_us(*fns):
+        # Many short rounds, alternating between the functions, so a noisy
+        # spell can't skew one side; the fastest round of each is kept
+        best = [float("inf")] * len(fns)
+        for _ in range(args.rounds):
+            for i, fn in enumerate(fns):
+                best[i] = min(best[i], timeit.timeit(fn, number=args.repeat))
+        return [seconds / args.repeat * 1e6 for seconds in best]
+
+    slower = []
+    print(f"{'case':<14} {'layout':<10} {'old us':>10} {'new us':>10} {'speedup':>8}")
+    for case_name, data in CASES.items():
+        for layout, old, template_key in pairs:
+            new = app.build_content
+            assert old(data) == new(data, template_key), f"{layout} output differs for {case_name}"
+
+            old_us, new_us = per_call_us(lambda: old(data), lambda: new(data, template_key))
+            print(
+                f"{case_name:<14} {layout:<10} {old_us:>10.1f} {new_us:>10.1f} "
+                f"{old_us / new_us:>7.2f}x"
+            )
+            if new_us > old_us:
+                slower.append(f"{case_name}/{layout}")
+
+    if slower:
+        sys.exit(f"build_content is slower than the original for: {', '.join(slower)}")
+
+
+if __name__ == "__main__":
+    main()
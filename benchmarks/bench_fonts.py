@@ -0,0 +1,89 @@
+"""
+Compare per-render font setup against the shared, bundled font configuration.
+
+Usage:
+    python benchmarks/bench_fonts.py [--iterations 20]
+
+For each template this renders the same resume to PDF two ways:
+
+* system:  the old behaviour, with a fresh FontConfiguration per render and
+           the templates' system font stacks (full fonts discovered through
+           fontconfig, subsetted from scratch every time)
+* bundled: app.FONT_CONFIG shared across renders, plus the pre-subsetted
+           fonts from fonts/
+
+and reports mean render time (layout + PDF) and PDF size.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from weasyprint import CSS, HTML  # noqa: E402
+from weasyprint.text.fonts import FontConfiguration  # noqa: E402
+
+import app  # noqa: E402
+from bench_stylesheets import SAMPLE  # noqa: E402
+
+
+def render_system(body, template_key, color):
+    font_config = FontConfiguration()
+    css = app.RESUME_STYLES[template_key].replace("{color}", color)
+    css = css.replace('"Resume Sans", ', "").replace('"Resume Serif", ', "")
+    stylesheet = CSS(string=css, font_config=font_config)
+    return HTML(string=body).write_pdf(stylesheets=[stylesheet], font_config=font_config)
+
+
+def render_bundled(body, template_key, color):
+    stylesheets = [app.get_font_stylesheet(), app.get_stylesheet(template_key, color)]
+    return HTML(string=body).write_pdf(stylesheets=stylesheets, font_config=app.FONT_CONFIG)
+
+
+def measure(fn, iterations):
+    samples = []
+    pdf = b""
+    for _ in range(iterations):
+        start = time.perf_counter()
+        pdf = fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.mean(samples) * 1000, len(pdf)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    color = SAMPLE["color"]
+    print(
+        f"{'template':<10} {'system ms':>10} {'bundled ms':>11} "
+        f"{'system KB':>10} {'bundled KB':>11}"
+    )
+
+    for template_key in app.RESUME_TEMPLATES:
+        body = app.RESUME_TEMPLATES[template_key].replace(
+            "{content}", app.generate_content(SAMPLE, template_key)
+        )
+
+        # One untimed render each so imports and the stylesheet memo are warm
+        render_system(body, template_key, color)
+        render_bundled(body, template_key, color)
+
+        system_ms, system_size = measure(
+            lambda: render_system(body, template_key, color), args.iterations
+        )
+        bundled_ms, bundled_size = measure(
+            lambda: render_bundled(body, template_key, color), args.iterations
+        )
+        print(
+            f"{template_key:<10} {system_ms:>10.1f} {bundled_ms:>11.1f} "
+            f"{system_size / 1024:>10.1f} {bundled_size / 1024:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,454 @@
+"""
+Load test /generate and /preview, in-process and against a local gunicorn.
+
+Usage:
+    python benchmarks/bench_load.py [--target client|gunicorn|both]
+        [--requests 40] [--concurrency 4] [--workers 2]
+        [--output results.json] [--compare previous.json]
+
+Drives every endpoint x template x resume size (small, typical, huge) with
+form posts identical to the browser's, and reports per scenario:
+
+* p50/p95/p99 and mean latency
+* throughput (requests/s) and throughput per core (requests per CPU-second
+  consumed by the server's whole process tree, render pool included; for
+  the test client that tree is this process, load generator and all)
+* peak RSS of that process tree
+
+"client" runs the app in this process through Flask's test client;
+"gunicorn" starts `gunicorn app:app` (gunicorn.conf.py, so preloading and
+warmup included) on a free local port and talks HTTP to it. Every request
+carries a unique summary, so each /generate is a real render rather than
+a PDF cache hit; /preview re-renders the summary section and reuses the
+others, as it does while someone types.
+
+Results are written as JSON (by default benchmarks/results/<commit>.json)
+so runs can be compared between commits with --compare. CPU and memory
+are read from /proc, so those columns are Linux only.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_content import make_resume  # noqa: E402
+
+SIZES = {
+    "small": make_resume(1, 0, 1, 0, bullets=2),
+    "typical": make_resume(4, 2, 2, 2, bullets=5),
+    "huge": make_resume(30, 15, 6, 12, bullets=8),
+}
+
+ENDPOINTS = {"generate": "/generate", "preview": "/preview"}
+
+FORM_TYPE = "application/x-www-form-urlencoded"
+
+
+def form_body(data, template_key, tag):
+    """URL-encode a resume the way the browser's FormData posts it."""
+    fields = [
+        (key, data[key])
+        for key in ("name", "email", "phone", "location", "linkedin", "website", "skills",
+                    "languages")
+    ]
+    fields += [
+        ("summary", f"{data['summary']} ({tag})"),
+        ("template", template_key),
+        ("color", data["color"]),
+    ]
+    for exp in data["exp"]:
+        fields += [
+            ("exp_title[]", exp["title"]),
+            ("exp_company[]", exp["company"]),
+            ("exp_duration[]", exp["duration"]),
+            ("exp_description[]", exp["description"]),
+        ]
+    for edu in data["edu"]:
+        fields += [
+            ("edu_degree[]", edu["degree"]),
+            ("edu_institution[]", edu["institution"]),
+            ("edu_year[]", edu["year"]),
+        ]
+    for proj in data["proj"]:
+        fields += [
+            ("proj_name[]", proj["name"]),
+            ("proj_description[]", proj["description"]),
+            ("proj_link[]", proj["link"]),
+        ]
+    for cert in data["cert"]:
+        fields += [
+            ("cert_name[]", cert["name"]),
+            ("cert_issuer[]", cert["issuer"]),
+            ("cert_year[]", cert["year"]),
+        ]
+    return urlencode(fields).encode("utf-8")
+
+
+# --------- Process tree accounting (/proc) --------- #
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def _proc_stat(pid):
+    """(ppid, cpu seconds) for a pid, or None if it is gone."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # The command name may contain spaces; fields resume after its ')'
+    fields = stat[stat.rindex(")") + 2:].split()
+    return int(fields[1]), (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+
+def _proc_rss(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def process_tree(root):
+    """{pid: cpu seconds} for root and all of its descendants."""
+    stats = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            stat = _proc_stat(int(entry))
+            if stat is not None:
+                stats[int(entry)] = stat
+
+    tree = {root: stats[root][1]} if root in stats else {}
+    added = True
+    while added:
+        added = False
+        for pid, (ppid, cpu) in stats.items():
+            if ppid in tree and pid not in tree:
+                tree[pid] = cpu
+                added = True
+    return tree
+
+
+class TreeMonitor:
+    """Samples CPU time and total RSS of a process tree while a scenario runs."""
+
+    def __init__(self, root, interval=0.05):
+        self.root = root
+        self.interval = interval
+        self.available = os.path.isdir("/proc")
+        self.peak_rss = 0
+        self._start = {}
+        self._last = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        tree = process_tree(self.root)
+        self._last.update(tree)
+        self.peak_rss = max(self.peak_rss, sum(_proc_rss(pid) for pid in tree))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        if self.available:
+            self._start = process_tree(self.root)
+            self._sample()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._sample()
+
+    @property
+    def cpu_seconds(self):
+        if not self.available:
+            return None
+        # Processes that exited mid-run keep their last sampled CPU time
+        return sum(cpu - self._start.get(pid, 0.0) for pid, cpu in self._last.items())
+
+
+# --------- Targets --------- #
+
+
+class ClientTarget:
+    """The app in this process, through Flask's test client."""
+
+    name = "client"
+
+    def __init__(self, args):
+        import app
+
+        self.app = app
+        app.warmup()
+        app.RENDER_POOL.start()
+        self.pid = os.getpid()
+        self._local = threading.local()
+
+    def post(self, path, body):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.app.test_client()
+        response = client.post(path, data=body, content_type=FORM_TYPE)
+        response.get_data()
+        return response.status_code
+
+    def close(self):
+        # The render pool goes away with this process
+        pass
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class GunicornTarget:
+    """A local `gunicorn app:app`, talked to over keep-alive HTTP."""
+
+    name = "gunicorn"
+
+    def __init__(self, args):
+        self.port = free_port()
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-m", "gunicorn", "app:app",
+                "--bind", f"127.0.0.1:{self.port}",
+                "--workers", str(args.workers),
+                "--log-level", "warning",
+            ],
+            cwd=ROOT,
+        )
+        self.pid = self.process.pid
+        self._local = threading.local()
+        self._wait_ready(args.startup_timeout)
+
+    def _wait_ready(self, timeout):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"gunicorn exited with status {self.process.returncode}")
+            try:
+                conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=5)
+                conn.request("GET", "/")
+                if conn.getresponse().status == 200:
+                    conn.close()
+                    return
+            except OSError:
+                pass
+            time.sleep(0.2)
+        self.close()
+        raise RuntimeError(f"gunicorn did not come up within {timeout}s")
+
+    def post(self, path, body):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(
+                "127.0.0.1", self.port, timeout=300
+            )
+        try:
+            conn.request("POST", path, body=body, headers={"Content-Type": FORM_TYPE})
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            self._local.conn = None
+            raise
+        return response.status
+
+    def close(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+TARGETS = {"client": ClientTarget, "gunicorn": GunicornTarget}
+
+
+# --------- Running scenarios --------- #
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def run_scenario(target, endpoint, template_key, size, args, run_id):
+    data = SIZES[size]
+    path = ENDPOINTS[endpoint]
+    bodies = [
+        form_body(data, template_key, f"{run_id}-{endpoint}-{size}-{i}")
+        for i in range(args.requests)
+    ]
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(body):
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            ok = target.post(path, body) == 200
+        except (OSError, http.client.HTTPException):
+            ok = False
+        elapsed = time.perf_counter() - start
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors += 1
+
+    # Untimed requests so per-scenario first-use costs don't skew p99
+    for i in range(min(args.warmup, len(bodies))):
+        target.post(path, form_body(data, template_key, f"{run_id}-warmup-{i}"))
+
+    with TreeMonitor(target.pid) as monitor:
+        wall_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            list(executor.map(one, bodies))
+        wall = time.perf_counter() - wall_start
+
+    cpu = monitor.cpu_seconds
+    result = {
+        "target": target.name,
+        "endpoint": endpoint,
+        "template": template_key,
+        "size": size,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "errors": errors,
+        "wall_s": round(wall, 3),
+        "rps": round(len(latencies) / wall, 2) if wall else None,
+        "cpu_s": round(cpu, 3) if cpu is not None else None,
+        "rps_per_core": round(len(latencies) / cpu, 2) if cpu else None,
+        "peak_rss_mb": round(monitor.peak_rss / 2**20, 1) if monitor.available else None,
+    }
+    if latencies:
+        result.update(
+            mean_ms=round(statistics.mean(latencies) * 1000, 2),
+            p50_ms=round(percentile(latencies, 50) * 1000, 2),
+            p95_ms=round(percentile(latencies, 95) * 1000, 2),
+            p99_ms=round(percentile(latencies, 99) * 1000, 2),
+        )
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def scenario_key(result):
+    return (result["target"], result["endpoint"], result["template"], result["size"])
+
+
+def print_result(result, baseline=None):
+    line = (
+        f"{result['target']:<9} {result['endpoint']:<9} {result['template']:<9} "
+        f"{result['size']:<8} {result.get('p50_ms', 0):>8.1f} {result.get('p95_ms', 0):>8.1f} "
+        f"{result.get('p99_ms', 0):>8.1f} {result['rps'] or 0:>7.1f} "
+        f"{result['rps_per_core'] or 0:>8.1f} {result['peak_rss_mb'] or 0:>8.1f} "
+        f"{result['errors']:>4}"
+    )
+    if baseline is not None and baseline.get("p95_ms") and result.get("p95_ms"):
+        change = result["p95_ms"] / baseline["p95_ms"] - 1
+        line += f"  p95 {change:+.0%} vs {baseline['p95_ms']:.1f}"
+    print(line, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--target", choices=("client", "gunicorn", "both"), default="both")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS))
+    parser.add_argument("--templates", default="modern,classic,creative")
+    parser.add_argument("--sizes", default=",".join(SIZES))
+    parser.add_argument("--requests", type=int, default=40, help="timed requests per scenario")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn workers")
+    parser.add_argument("--startup-timeout", type=float, default=120)
+    parser.add_argument("--output", help="JSON results path")
+    parser.add_argument("--compare", help="previous JSON results to compare p95 against")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", f"{commit}.json")
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {scenario_key(r): r for r in json.load(f)["results"]}
+
+    targets = ["client", "gunicorn"] if args.target == "both" else [args.target]
+    run_id = f"{commit}-{os.getpid()}-{time.time():.0f}"
+
+    print(
+        f"{'target':<9} {'endpoint':<9} {'template':<9} {'size':<8} {'p50 ms':>8} "
+        f"{'p95 ms':>8} {'p99 ms':>8} {'req/s':>7} {'req/cpu':>8} {'RSS MB':>8} {'err':>4}"
+    )
+    results = []
+    for target_name in targets:
+        target = TARGETS[target_name](args)
+        try:
+            for endpoint in args.endpoints.split(","):
+                for template_key in args.templates.split(","):
+                    for size in args.sizes.split(","):
+                        result = run_scenario(target, endpoint, template_key, size, args, run_id)
+                        print_result(result, baseline.get(scenario_key(result)))
+                        results.append(result)
+        finally:
+            target.close()
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(
+            {
+                "commit": commit,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "settings": {
+                    key: getattr(args, key)
+                    for key in ("requests", "warmup", "concurrency", "workers")
+                },
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
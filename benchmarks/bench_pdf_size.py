@@ -0,0 +1,68 @@
+"""
+Compare PDF output profiles: bytes saved versus extra serialization CPU.
+
+Usage:
+    python benchmarks/bench_pdf_size.py [--iterations 10]
+
+For each template this lays the same resume out once and then serializes
+it with every profile from pdf_profiles.py (speed, balanced, size),
+reporting mean write_pdf() time and PDF size, each relative to balanced
+(WeasyPrint's defaults). Layout is identical for every profile, so it is
+left out of the timings.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+from bench_stylesheets import SAMPLE  # noqa: E402
+from pdf_profiles import DEFAULT_PROFILE, PDF_PROFILES, write_options  # noqa: E402
+
+
+def measure(document, profile, iterations):
+    samples = []
+    pdf = b""
+    for _ in range(iterations):
+        start = time.process_time()
+        pdf = document.write_pdf(**write_options(profile))
+        samples.append(time.process_time() - start)
+    return statistics.mean(samples) * 1000, len(pdf)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    print(
+        f"{'template':<10} {'profile':<9} {'cpu ms':>8} {'KB':>8} "
+        f"{'bytes saved':>12} {'extra cpu ms':>13}"
+    )
+
+    for template_key in app.RESUME_TEMPLATES:
+        document = app.render_document(
+            app.generate_content(SAMPLE, template_key), template_key, SAMPLE["color"]
+        )
+        # One untimed write so fonts are subsetted and caches are warm
+        document.write_pdf()
+
+        results = {
+            profile: measure(document, profile, args.iterations) for profile in PDF_PROFILES
+        }
+        base_ms, base_size = results[DEFAULT_PROFILE]
+
+        for profile, (cpu_ms, size) in results.items():
+            saved = base_size - size
+            print(
+                f"{template_key:<10} {profile:<9} {cpu_ms:>8.1f} {size / 1024:>8.1f} "
+                f"{saved:>+7d} ({saved / base_size:>+4.0%}) {cpu_ms - base_ms:>+13.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Compare per-request cost of inline <style> blocks vs. precompiled stylesheets.
+
+Usage:
+    python benchmarks/bench_stylesheets.py [--iterations 30]
+
+For each template this renders the same resume two ways:
+
+* inline:  the old approach, with the template CSS substituted into a <style>
+           block that WeasyPrint re-parses on every request
+* shared:  the body-only skeleton, with the memoized CSS object from
+           app.get_stylesheet() passed through stylesheets=
+
+and reports the mean layout time (HTML + CSS parse, cascade and layout; PDF
+serialization is identical in both cases so it is left out).
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from weasyprint import HTML  # noqa: E402
+
+import app  # noqa: E402
+
+SAMPLE = {
+    "name": "Jane Doe",
+    "email": "jane@example.com",
+    "phone": "+1 555 0100",
+    "location": "New York, NY",
+    "linkedin": "linkedin.com/in/janedoe",
+    "website": "janedoe.dev",
+    "summary": "Engineer with eight years of experience building web platforms.",
+    "skills": "Python, Flask, PostgreSQL, Docker, AWS",
+    "languages": "English (Native), Spanish (Fluent)",
+    "template": "modern",
+    "color": "#2563eb",
+    "exp": [
+        {
+            "title": f"Senior Engineer {i}",
+            "company": "Tech Corp",
+            "duration": "2019 - Present",
+            "description": "• Led platform work\n• Cut p95 latency by 40%\n• Mentored juniors",
+        }
+        for i in range(4)
+    ],
+    "edu": [{"degree": "BSc Computer Science", "institution": "State U", "year": "2015"}],
+    "proj": [{"name": "Resume Generator", "description": "Flask + WeasyPrint", "link": ""}],
+    "cert": [{"name": "AWS SA", "issuer": "Amazon", "year": "2022"}],
+}
+
+
+def inline_html(content_html, template_key, color):
+    css = app.RESUME_STYLES[template_key].replace("{color}", color)
+    skeleton = app.RESUME_TEMPLATES[template_key]
+    skeleton = skeleton.replace("</head>", f"<style>{css}</style>\n</head>")
+    return skeleton.replace("{content}", content_html)
+
+
+def time_it(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.mean(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+
+    color = SAMPLE["color"]
+    print(f"{'template':<10} {'inline ms':>10} {'shared ms':>10} {'saved ms':>10}")
+
+    for template_key in app.RESUME_TEMPLATES:
+        content_html = app.generate_content(SAMPLE, template_key)
+
+        full = inline_html(content_html, template_key, color)
+        body = app.RESUME_TEMPLATES[template_key].replace("{content}", content_html)
+        fonts = app.get_font_stylesheet()
+        stylesheet = app.get_stylesheet(template_key, color)
+
+        def render_inline():
+            return HTML(string=full).render(stylesheets=[fonts], font_config=app.FONT_CONFIG)
+
+        def render_shared():
+            return HTML(string=body).render(
+                stylesheets=[fonts, stylesheet], font_config=app.FONT_CONFIG
+            )
+
+        # Warm up fonts and the stylesheet memo before timing anything
+        render_inline()
+        render_shared()
+
+        inline_ms = time_it(render_inline, args.iterations)
+        shared_ms = time_it(render_shared, args.iterations)
+        print(
+            f"{template_key:<10} {inline_ms:>10.2f} {shared_ms:>10.2f} "
+            f"{inline_ms - shared_ms:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+"""
+Render resumes in bulk, offline, e.g. for nightly regeneration.
+
+Usage:
+    python -m bulk_render INPUT (--out DIR | --zip FILE) [--format jsonl|csv]
+        [--workers N] [--timeout SECONDS] [--progress FILE] [--stats-interval 10]
+
+INPUT is JSONL, one resume per line shaped like a /generate/batch item, or
+CSV, one resume per row with columns named like the form fields (repeat
+exp_title[], exp_company[], ... for list entries). "-" reads stdin. The
+format follows the file extension unless --format is given. Records are
+normalized by resume_data_from_dict / build_resume_data, so they hit the
+same validation and size limits as the web app.
+
+An optional "id" field (or column) names a record's PDF <id>.pdf;
+without one it is <line>_<Name>_Resume.pdf.
+
+Input is streamed, and PDFs are rendered by a RenderPool sized to the
+available cores (with the app's RENDER_TIMEOUT and RENDER_MEMORY_LIMIT_MB
+caps), each render process writing its PDF straight to disk.
+
+Every finished record is appended to a progress file (DIR/.progress.jsonl,
+or FILE.progress.jsonl for --zip). Rerunning with the same arguments skips
+the records that already succeeded, so an interrupted run picks up where
+it stopped; failed records are tried again. With --zip, PDFs collect in
+FILE.parts/ and are packed (with a manifest.json like /generate/batch's)
+at the end of each run; the parts and progress file are removed once every
+record has succeeded.
+
+Throughput is printed to stderr every --stats-interval seconds and at the
+end. The exit status is 1 if any record failed.
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+# Bulk renders are not web traffic; keep them out of the app's /metrics
+os.environ.setdefault(
+    "METRICS_DIR", os.path.join(tempfile.gettempdir(), "resume-bulk-metrics")
+)
+
+from werkzeug.datastructures import MultiDict  # noqa: E402
+
+import app  # noqa: E402
+from cache import DiskCache  # noqa: E402
+from render_pool import RenderPool  # noqa: E402
+
+# Records whose render process died (another render's timeout or crash can
+# take its neighbours down) get this many extra attempts
+CRASH_RETRIES = 1
+
+
+def available_cores():
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+# --------- Input --------- #
+
+
+def read_records(fh, fmt):
+    """Yield (key, line, record) per input record; record is a dict or MultiDict."""
+    if fmt == "csv":
+        reader = csv.reader(fh)
+        header = next(reader, None) or []
+        for line, row in enumerate(reader, start=2):
+            form = MultiDict(zip(header, row))
+            yield form.get("id", "").strip() or f"#{line}", line, form
+        return
+
+    for line, text in enumerate(fh, start=1):
+        if not text.strip():
+            continue
+        try:
+            payload = json.loads(text)
+        except ValueError as e:
+            yield f"#{line}", line, f"Invalid JSON: {e}"
+            continue
+        record_id = payload.get("id") if isinstance(payload, dict) else None
+        yield (str(record_id) if record_id not in (None, "") else f"#{line}"), line, payload
+
+
+def parse_record(record):
+    """Normalized resume data for a record. Raises ValueError if it's invalid."""
+    if isinstance(record, str):
+        raise ValueError(record)
+    if isinstance(record, MultiDict):
+        return app.build_resume_data(record)
+    return app.resume_data_from_dict(record)
+
+
+def output_name(key, line, data):
+    if key.startswith("#"):
+        return f"{line:06d}_{app.resume_filename(data)}"
+    return re.sub(r"[^\w.-]", "_", key) + ".pdf"
+
+
+# --------- Rendering --------- #
+
+
+def render_to_file(data, template_key, color, path):
+    """Render one resume into ``path`` (in a pool process); returns (seconds, bytes)."""
+    started = time.perf_counter()
+    size = app.render_pdf_file(
+        app.generate_content(data, template_key),
+        template_key,
+        color,
+        path,
+        app.template_profile(template_key),
+    )
+    return time.perf_counter() - started, size
+
+
+class Stats:
+    def __init__(self, workers):
+        self.workers = workers
+        self.started = time.monotonic()
+        self.rendered = 0
+        self.failed = 0
+        self.skipped = 0
+        self.bytes = 0
+        self.seconds = []
+
+    def line(self):
+        elapsed = time.monotonic() - self.started
+        rate = self.rendered / elapsed if elapsed else 0.0
+        text = (
+            f"{self.rendered} rendered, {self.failed} failed, {self.skipped} skipped "
+            f"in {elapsed:.0f}s: {rate:.1f}/s ({rate / self.workers:.2f}/s per worker), "
+            f"{self.bytes / 1e6:.1f} MB"
+        )
+        if len(self.seconds) >= 2:
+            quantiles = statistics.quantiles(self.seconds, n=20)
+            text += f", render p50 {quantiles[9]:.2f}s p95 {quantiles[18]:.2f}s"
+        return text
+
+
+# --------- Progress and output --------- #
+
+
+def load_progress(path):
+    """{key: entry} from a progress file; later entries win."""
+    entries = {}
+    try:
+        with open(path) as fh:
+            for text in fh:
+                try:
+                    entry = json.loads(text)
+                except ValueError:
+                    continue  # A line cut short by the interruption
+                entries[entry["key"]] = entry
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def remove_partial_files(directory):
+    """Drop PDFs an interrupted run left half-written."""
+    for entry in os.scandir(directory):
+        if entry.name.endswith(".part"):
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+
+
+def pack_zip(zip_path, parts_dir, entries):
+    """Write the finished PDFs and a manifest into ``zip_path``."""
+    manifest = []
+    tmp_path = f"{zip_path}.tmp"
+    # PDFs are already compressed, so store them as-is
+    with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_STORED) as zf:
+        for key, entry in entries.items():
+            if entry.get("error"):
+                manifest.append({"id": key, "file": entry.get("file"), "error": entry["error"]})
+                continue
+            zf.write(os.path.join(parts_dir, entry["file"]), entry["file"])
+            manifest.append({"id": key, "file": entry["file"]})
+        zf.writestr("manifest.json", json.dumps(manifest, indent=2))
+    os.replace(tmp_path, zip_path)
+
+
+# --------- Main loop --------- #
+
+
+def bulk_render(records, out_dir, progress_path, pool, stats, stats_interval):
+    """Render every record not yet done into ``out_dir``, logging to ``progress_path``."""
+    entries = load_progress(progress_path)
+    done = {
+        key
+        for key, entry in entries.items()
+        if not entry.get("error") and os.path.exists(os.path.join(out_dir, entry["file"]))
+    }
+    remove_partial_files(out_dir)
+
+    seen = set()
+    retries = deque()
+    pending = {}
+    window = 2 * max(1, pool.max_workers)
+    exhausted = False
+    last_report = time.monotonic()
+
+    with open(progress_path, "a") as progress:
+
+        def finish(key, filename, error=None):
+            entry = {"key": key, "file": filename}
+            if error:
+                entry["error"] = error
+            progress.write(json.dumps(entry) + "\n")
+            progress.flush()
+            entries[key] = entry
+
+        try:
+            while True:
+                while len(pending) < window:
+                    if retries:
+                        job = retries.popleft()
+                    elif exhausted:
+                        break
+                    else:
+                        try:
+                            key, line, record = next(records)
+                        except StopIteration:
+                            exhausted = True
+                            continue
+
+                        if key in seen:
+                            stats.failed += 1
+                            finish(f"#{line}", None, f"Duplicate id {key!r}")
+                            continue
+                        seen.add(key)
+                        if key in done:
+                            stats.skipped += 1
+                            continue
+
+                        try:
+                            data = parse_record(record)
+                        except ValueError as e:
+                            stats.failed += 1
+                            finish(key, None, str(e))
+                            continue
+                        job = (key, output_name(key, line, data), data, 0)
+
+                    key, filename, data, attempt = job
+                    part_path = os.path.join(out_dir, f".{filename}.part")
+                    future = pool.submit(
+                        render_to_file,
+                        data,
+                        data["template"],
+                        data["color"] or "#2563eb",
+                        part_path,
+                        block=True,
+                    )
+                    pending[future] = (job, part_path)
+
+                if not pending:
+                    break
+
+                done_futures, _ = wait(pending, timeout=stats_interval, return_when=FIRST_COMPLETED)
+                for future in done_futures:
+                    job, part_path = pending.pop(future)
+                    key, filename, data, attempt = job
+                    try:
+                        seconds, size = future.result()
+                    except BrokenProcessPool:
+                        DiskCache.discard(part_path)
+                        if attempt < CRASH_RETRIES:
+                            retries.append((key, filename, data, attempt + 1))
+                            continue
+                        stats.failed += 1
+                        finish(key, filename, "The render process crashed")
+                    except Exception as e:
+                        DiskCache.discard(part_path)
+                        stats.failed += 1
+                        finish(key, filename, f"Error generating PDF: {e}")
+                    else:
+                        os.replace(part_path, os.path.join(out_dir, filename))
+                        stats.rendered += 1
+                        stats.bytes += size
+                        stats.seconds.append(seconds)
+                        finish(key, filename)
+
+                if time.monotonic() - last_report >= stats_interval:
+                    last_report = time.monotonic()
+                    print(stats.line(), file=sys.stderr)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    return entries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bulk_render", description="Render resumes in bulk from JSONL or CSV."
+    )
+    parser.add_argument("input", help="JSONL or CSV file, or - for stdin")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("--out", help="directory to write the PDFs into")
+    output.add_argument("--zip", help="ZIP archive to write the PDFs into")
+    parser.add_argument("--format", choices=("jsonl", "csv"))
+    parser.add_argument("--workers", type=int, default=available_cores())
+    parser.add_argument("--timeout", type=float, default=app.RENDER_POOL.timeout)
+    parser.add_argument("--progress", help="progress file (default: next to the output)")
+    parser.add_argument("--stats-interval", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.input.lower().endswith(".csv") else "jsonl")
+    if args.zip:
+        out_dir = f"{args.zip}.parts"
+        progress_path = args.progress or f"{args.zip}.progress.jsonl"
+    else:
+        out_dir = args.out
+        progress_path = args.progress or os.path.join(out_dir, ".progress.jsonl")
+    os.makedirs(out_dir, exist_ok=True)
+
+    pool = RenderPool(
+        max_workers=max(1, args.workers),
+        max_queue=max(1, args.workers),
+        timeout=args.timeout,
+        initializer=app._warm_render_process,
+        kill_grace=app.RENDER_POOL.kill_grace,
+        memory_limit=app.RENDER_POOL.memory_limit,
+    )
+    pool.start()
+    stats = Stats(pool.max_workers)
+
+    # newline="" lets the csv module handle newlines inside quoted fields
+    fh = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    try:
+        entries = bulk_render(
+            read_records(fh, fmt), out_dir, progress_path, pool, stats, args.stats_interval
+        )
+    except KeyboardInterrupt:
+        print(f"Interrupted: {stats.line()}", file=sys.stderr)
+        print("Run the same command again to resume.", file=sys.stderr)
+        return 130
+    finally:
+        pool.shutdown(cancel_futures=True)
+        if fh is not sys.stdin:
+            fh.close()
+
+    print(stats.line(), file=sys.stderr)
+    failed = sum(1 for entry in entries.values() if entry.get("error"))
+
+    if args.zip:
+        pack_zip(args.zip, out_dir, entries)
+        if not failed:
+            for entry in entries.values():
+                DiskCache.discard(os.path.join(out_dir, entry["file"]))
+            DiskCache.discard(progress_path)
+            try:
+                os.rmdir(out_dir)
+            except OSError:
+                pass
+    if failed:
+        print(f"{failed} record(s) failed; see {progress_path}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+"""
+Content-addressed caches for rendered resume artifacts.
+
+Rendering a PDF is by far the most expensive thing this app does, and the
+output depends only on the normalized resume data plus the template and
+color. So we key everything on a canonical hash of those inputs and keep
+the bytes around in a bounded in-memory LRU, optionally backed by a shared
+on-disk tier with size-based eviction.
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+# Bump this whenever the generated HTML/CSS changes in a way that should
+# invalidate previously cached renders.
+CACHE_VERSION = "2"
+
+
+def _jsonable(value):
+    # Typed resumes (schema.py) hash exactly like the equivalent dicts
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    raise TypeError(f"Can't hash {type(value).__name__}")
+
+
+def content_hash(*parts):
+    """Return a stable hex digest of JSON-serializable parts (dataclasses allowed)."""
+    payload = json.dumps(
+        [CACHE_VERSION, *parts],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_jsonable,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def resume_cache_key(data, template_key, color, *extra):
+    """Return a stable hex digest for a normalized resume + render options."""
+    return content_hash(data, template_key, color, *extra)
+
+
+class LRUCache:
+    """Thread-safe LRU mapping bounded by entry count and (optionally) total size."""
+
+    def __init__(self, max_entries=128, max_bytes=None, weigh=len):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._weigh = weigh
+        self._items = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._items[key]
+            except KeyError:
+                return default
+            self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        weight = self._weigh(value) if self.max_bytes is not None else 0
+
+        # Never let a single oversized value flush the whole cache
+        if self.max_bytes is not None and weight > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None and self.max_bytes is not None:
+                self._size -= self._weigh(old)
+
+            self._items[key] = value
+            self._size += weight
+
+            while len(self._items) > self.max_entries or (
+                self.max_bytes is not None and self._size > self.max_bytes
+            ):
+                _, evicted = self._items.popitem(last=False)
+                if self.max_bytes is not None:
+                    self._size -= self._weigh(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+
+class DiskCache:
+    """
+    Directory of content-addressed files with size-based eviction.
+
+    Files are sharded by the first two hex chars of the key. Hits bump the
+    file's mtime, so eviction drops the least recently used files first.
+    Safe to share between gunicorn workers: writes go through a temp file
+    and an atomic rename, and eviction tolerates files vanishing under it.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024, suffix=".pdf"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = self._scan_size()
+
+    def path_for(self, key):
+        return os.path.join(self.directory, key[:2], key + self.suffix)
+
+    def get(self, key):
+        path = self.path_for(key)
+        try:
+            with open(path, "rb") as fh:
+                value = fh.read()
+        except OSError:
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def get_path(self, key):
+        """Return the path of a cached file without reading it, or None."""
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def put(self, key, value):
+        tmp_path = self.temp_path(key)
+        try:
+            with open(tmp_path, "wb") as fh:
+                fh.write(value)
+        except OSError:
+            self.discard(tmp_path)
+            return
+        self.commit(key, tmp_path)
+
+    def temp_path(self, key):
+        """
+        Create an empty temp file next to where ``key`` will live, for
+        writers (e.g. a render process) that produce the file themselves.
+        Hand it to commit() when it's complete, or discard() on failure.
+        """
+        directory = os.path.dirname(self.path_for(key))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        os.close(fd)
+        return tmp_path
+
+    def commit(self, key, tmp_path):
+        """Atomically move a finished temp file into place; returns its path (or None)."""
+        path = self.path_for(key)
+        with self._lock:
+            try:
+                size = os.path.getsize(tmp_path)
+                try:
+                    # An identical concurrent miss may have stored it first
+                    replaced = os.path.getsize(path)
+                except FileNotFoundError:
+                    replaced = 0
+                os.replace(tmp_path, path)
+            except OSError:
+                self.discard(tmp_path)
+                return None
+
+            self._size += size - replaced
+            if self._size > self.max_bytes:
+                self._evict()
+        return path
+
+    @staticmethod
+    def discard(tmp_path):
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+    def _entries(self):
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith(self.suffix):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                yield entry.path, st.st_size, st.st_mtime
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """Drop least recently used files until we're at ~90% of the budget."""
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+
+        self._size = total
+
+
+class PDFCache:
+    """Two-tier (memory, then optional disk) cache for rendered PDF bytes."""
+
+    def __init__(self, memory, disk=None):
+        self.memory = memory
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.put(key, value)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def get_file(self, key):
+        """
+        Like get(), but a disk hit returns the file's path instead of reading
+        it into memory: (bytes, None), (None, path) or (None, None).
+        """
+        value = self.memory.get(key)
+        path = None
+        if value is None and self.disk is not None:
+            path = self.disk.get_path(key)
+
+        if value is None and path is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value, path
+
+    def put(self, key, value):
+        self.memory.put(key, value)
+        if self.disk is not None:
+            self.disk.put(key, value)
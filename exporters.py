@@ -0,0 +1,269 @@
+"""
+Non-PDF exports of a resume: plain text, Markdown and Word (.docx).
+
+Exporters read the same normalized data the HTML generators do (the dict
+from build_resume_data, or a schema.Resume) and never touch WeasyPrint, so
+they cost microseconds rather than a layout pass. The .docx is a minimal
+WordprocessingML package written directly with zipfile: one document, a
+handful of named styles (so ATS parsers see real headings) and a bullet
+list definition.
+
+Sections come out in the same order as the modern/classic PDF.
+"""
+
+import io
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+CONTACT_FIELDS = ("email", "phone", "location", "linkedin", "website")
+
+
+def _bullets(text):
+    """Lines of a multiline textarea, minus blanks and leading bullet glyphs."""
+    items = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("•"):
+            line = line.lstrip("•").strip()
+        if line:
+            items.append(line)
+    return items
+
+
+def _skills(text):
+    return [skill.strip() for skill in text.split(",") if skill.strip()]
+
+
+def _entries(data):
+    """
+    Yield (heading, [(title, subtitle parts, bullets)]) for each non-empty
+    list section, in document order.
+    """
+    sections = (
+        ("Work Experience", "exp", "title", ("company", "duration"), "description"),
+        ("Projects", "proj", "name", ("link",), "description"),
+        ("Education", "edu", "degree", ("institution", "year"), None),
+        ("Certifications", "cert", "name", ("issuer", "year"), None),
+    )
+    for heading, key, title, subtitles, body in sections:
+        if not data[key]:
+            continue
+        yield heading, [
+            (
+                entry[title],
+                [entry[field] for field in subtitles if entry[field]],
+                _bullets(entry[body]) if body else [],
+            )
+            for entry in data[key]
+        ]
+
+
+# --------- Plain text --------- #
+
+
+def export_text(data):
+    lines = [(data["name"] or "Your Name").upper()]
+    contact = [data[key] for key in CONTACT_FIELDS if data[key]]
+    if contact:
+        lines.append(" | ".join(contact))
+
+    def section(heading):
+        lines.extend(["", heading.upper()])
+
+    if data["summary"]:
+        section("Professional Summary")
+        lines.append(data["summary"])
+
+    for heading, entries in _entries(data):
+        section(heading)
+        for i, (title, subtitles, bullets) in enumerate(entries):
+            if i:
+                lines.append("")
+            lines.append(title)
+            if subtitles:
+                lines.append(" | ".join(subtitles))
+            lines.extend(f"- {item}" for item in bullets)
+
+    if data["skills"]:
+        section("Skills")
+        lines.append(", ".join(_skills(data["skills"])))
+
+    if data["languages"]:
+        section("Languages")
+        lines.append(data["languages"])
+
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+# --------- Markdown --------- #
+
+
+def export_markdown(data):
+    lines = [f"# {data['name'] or 'Your Name'}"]
+    contact = [data[key] for key in CONTACT_FIELDS if data[key]]
+    if contact:
+        lines.extend(["", " · ".join(contact)])
+
+    def section(heading):
+        lines.extend(["", f"## {heading}", ""])
+
+    if data["summary"]:
+        section("Professional Summary")
+        lines.append(data["summary"])
+
+    for heading, entries in _entries(data):
+        section(heading)
+        for i, (title, subtitles, bullets) in enumerate(entries):
+            if i:
+                lines.append("")
+            lines.append(f"### {title}")
+            if subtitles:
+                lines.extend(["", " · ".join(f"*{part}*" for part in subtitles)])
+            if bullets:
+                lines.append("")
+                lines.extend(f"- {item}" for item in bullets)
+
+    if data["skills"]:
+        section("Skills")
+        lines.append(", ".join(_skills(data["skills"])))
+
+    if data["languages"]:
+        section("Languages")
+        lines.append(data["languages"])
+
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+# --------- Word (.docx) --------- #
+
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+# XML 1.0 forbids most control characters, which can sneak in via pasted text
+_INVALID_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>
+<Override PartName="/word/numbering.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"/>
+</Types>"""
+
+_PACKAGE_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+_DOCUMENT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/numbering" Target="numbering.xml"/>
+</Relationships>"""
+
+_STYLES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:styles xmlns:w="{ns}">
+<w:docDefaults>
+<w:rPrDefault><w:rPr><w:rFonts w:ascii="Calibri" w:hAnsi="Calibri" w:cs="Calibri"/><w:sz w:val="21"/></w:rPr></w:rPrDefault>
+<w:pPrDefault><w:pPr><w:spacing w:after="60"/></w:pPr></w:pPrDefault>
+</w:docDefaults>
+<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/></w:style>
+<w:style w:type="paragraph" w:styleId="Title"><w:name w:val="Title"/><w:basedOn w:val="Normal"/><w:next w:val="Normal"/>
+<w:rPr><w:b/><w:color w:val="{color}"/><w:sz w:val="44"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/><w:basedOn w:val="Normal"/><w:next w:val="Normal"/>
+<w:pPr><w:keepNext/><w:spacing w:before="240" w:after="80"/><w:pBdr><w:bottom w:val="single" w:sz="6" w:space="1" w:color="{color}"/></w:pBdr><w:outlineLvl w:val="0"/></w:pPr>
+<w:rPr><w:b/><w:caps/><w:color w:val="{color}"/><w:sz w:val="24"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Heading2"><w:name w:val="heading 2"/><w:basedOn w:val="Normal"/><w:next w:val="Normal"/>
+<w:pPr><w:keepNext/><w:spacing w:before="120" w:after="0"/><w:outlineLvl w:val="1"/></w:pPr>
+<w:rPr><w:b/><w:sz w:val="22"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Subtitle"><w:name w:val="Subtitle"/><w:basedOn w:val="Normal"/>
+<w:rPr><w:i/><w:color w:val="4B5563"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="ListBullet"><w:name w:val="List Bullet"/><w:basedOn w:val="Normal"/>
+<w:pPr><w:numPr><w:numId w:val="1"/></w:numPr><w:spacing w:after="0"/></w:pPr></w:style>
+</w:styles>"""
+
+_NUMBERING = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:numbering xmlns:w="{ns}">
+<w:abstractNum w:abstractNumId="0"><w:lvl w:ilvl="0"><w:start w:val="1"/><w:numFmt w:val="bullet"/>
+<w:lvlText w:val="•"/><w:lvlJc w:val="left"/><w:pPr><w:ind w:left="360" w:hanging="240"/></w:pPr></w:lvl></w:abstractNum>
+<w:num w:numId="1"><w:abstractNumId w:val="0"/></w:num>
+</w:numbering>""".format(ns=_W_NS)
+
+
+def _paragraph(text, style=None):
+    props = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+    text = escape(_INVALID_XML.sub("", text))
+    return f'<w:p>{props}<w:r><w:t xml:space="preserve">{text}</w:t></w:r></w:p>'
+
+
+def _docx_color(color):
+    color = color.lstrip("#")
+    return color.upper() if re.fullmatch(r"[0-9a-fA-F]{6}", color) else "2563EB"
+
+
+def export_docx(data):
+    paragraphs = [_paragraph(data["name"] or "Your Name", "Title")]
+    contact = [data[key] for key in CONTACT_FIELDS if data[key]]
+    if contact:
+        paragraphs.append(_paragraph(" | ".join(contact)))
+
+    if data["summary"]:
+        paragraphs.append(_paragraph("Professional Summary", "Heading1"))
+        paragraphs.append(_paragraph(data["summary"]))
+
+    for heading, entries in _entries(data):
+        paragraphs.append(_paragraph(heading, "Heading1"))
+        for title, subtitles, bullets in entries:
+            paragraphs.append(_paragraph(title, "Heading2"))
+            if subtitles:
+                paragraphs.append(_paragraph(" | ".join(subtitles), "Subtitle"))
+            paragraphs.extend(_paragraph(item, "ListBullet") for item in bullets)
+
+    if data["skills"]:
+        paragraphs.append(_paragraph("Skills", "Heading1"))
+        paragraphs.append(_paragraph(", ".join(_skills(data["skills"]))))
+
+    if data["languages"]:
+        paragraphs.append(_paragraph("Languages", "Heading1"))
+        paragraphs.append(_paragraph(data["languages"]))
+
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{_W_NS}"><w:body>'
+        + "".join(paragraphs)
+        + '<w:sectPr><w:pgSz w:w="12240" w:h="15840"/>'
+        '<w:pgMar w:top="1080" w:right="1080" w:bottom="1080" w:left="1080"'
+        ' w:header="720" w:footer="720" w:gutter="0"/></w:sectPr>'
+        "</w:body></w:document>"
+    )
+
+    parts = (
+        ("[Content_Types].xml", _CONTENT_TYPES),
+        ("_rels/.rels", _PACKAGE_RELS),
+        ("word/_rels/document.xml.rels", _DOCUMENT_RELS),
+        ("word/document.xml", document),
+        ("word/styles.xml", _STYLES.format(ns=_W_NS, color=_docx_color(data["color"]))),
+        ("word/numbering.xml", _NUMBERING),
+    )
+
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, xml in parts:
+            # Fixed timestamps keep the bytes (and so the ETag) reproducible
+            info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, xml.encode("utf-8"))
+    return out.getvalue()
+
+
+# format -> (exporter, mimetype, file extension)
+EXPORT_FORMATS = {
+    "txt": (export_text, "text/plain; charset=utf-8", "txt"),
+    "md": (export_markdown, "text/markdown; charset=utf-8", "md"),
+    "docx": (
+        export_docx,
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        "docx",
+    ),
+}
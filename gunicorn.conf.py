@@ -0,0 +1,58 @@
+"""
+Gunicorn settings, picked up automatically from the working directory.
+
+With GUNICORN_PRELOAD=1 (the default) the app is imported and warmed up once
+in the master before any worker is forked, so WeasyPrint's imports, font
+configuration and parsed stylesheets are shared copy-on-write by every
+worker. With GUNICORN_PRELOAD=0 each worker warms itself up after booting.
+Either way, each worker then starts its render pool, whose processes warm
+up on their own (see RenderPool's initializer in app.py).
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+# Threaded workers: requests wait on the render process pool without
+# blocking cheap routes like / and /preview
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "8"))
+
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") != "0"
+
+
+def _warmup(log):
+    import app
+
+    try:
+        timings = app.warmup()
+    except Exception:
+        log.exception("Warmup failed; first requests will be slow")
+        return
+    log.info(
+        "Warmed up %s",
+        ", ".join(f"{name} in {seconds:.2f}s" for name, seconds in timings.items()),
+    )
+
+
+def on_starting(server):
+    # Snapshots left by an earlier run (or its dead workers) would be summed
+    # into every scrape; start each server with an empty metrics directory
+    from metrics import DEFAULT_DIRECTORY, clear_directory
+
+    clear_directory(os.environ.get("METRICS_DIR") or DEFAULT_DIRECTORY)
+
+
+def when_ready(server):
+    # Runs in the master after the app is preloaded and before workers fork
+    if preload_app:
+        _warmup(server.log)
+
+
+def post_worker_init(worker):
+    if not preload_app:
+        _warmup(worker.log)
+
+    import app
+
+    app.RENDER_POOL.start()
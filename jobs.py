@@ -0,0 +1,265 @@
+"""
+Storage for asynchronous render jobs.
+
+A job is a plain dict:
+
+    id, status ("pending" | "done" | "failed"), template, filename,
+    cache_key, callback_url, error, pdf, created_at, finished_at, expires_at
+
+Every job expires ``ttl`` seconds after it was created, and finished jobs get
+a fresh ``ttl`` from the time they finished, so artifacts that are never
+fetched don't pile up. Two backends share the same interface:
+
+* MemoryJobStore: a dict in this process. Fast, but jobs are lost on restart
+  and are only visible to the gunicorn worker that created them.
+* SQLiteJobStore: a database file shared by every worker on the host, which
+  survives restarts.
+"""
+
+import http.client
+import ipaddress
+import json
+import os
+import sqlite3
+import threading
+import time
+import urllib.request
+import uuid
+from urllib.parse import urlsplit
+
+_COLUMNS = (
+    "id",
+    "status",
+    "template",
+    "filename",
+    "cache_key",
+    "callback_url",
+    "error",
+    "pdf",
+    "created_at",
+    "finished_at",
+    "expires_at",
+)
+
+
+def new_job(template, filename, cache_key, callback_url=None, ttl=3600):
+    now = time.time()
+    return {
+        "id": uuid.uuid4().hex,
+        "status": "pending",
+        "template": template,
+        "filename": filename,
+        "cache_key": cache_key,
+        "callback_url": callback_url,
+        "error": None,
+        "pdf": None,
+        "created_at": now,
+        "finished_at": None,
+        "expires_at": now + ttl,
+    }
+
+
+class MemoryJobStore:
+    """In-process job store; see the module docstring for the trade-offs."""
+
+    def __init__(self, ttl=3600):
+        self.ttl = ttl
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def create(self, template, filename, cache_key, callback_url=None):
+        job = new_job(template, filename, cache_key, callback_url, self.ttl)
+        with self._lock:
+            self._purge(job["created_at"])
+            self._jobs[job["id"]] = job
+        return dict(job)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["expires_at"] <= time.time():
+                return None
+            return dict(job)
+
+    def finish(self, job_id, pdf=None, error=None):
+        """Record a job's outcome and return the updated job (None if it expired)."""
+        now = time.time()
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["expires_at"] <= now:
+                return None
+            job.update(
+                status="failed" if error else "done",
+                pdf=None if error else pdf,
+                error=error,
+                finished_at=now,
+                expires_at=now + self.ttl,
+            )
+            return dict(job)
+
+    def delete(self, job_id):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def purge(self):
+        with self._lock:
+            self._purge(time.time())
+
+    def _purge(self, now):
+        expired = [job_id for job_id, job in self._jobs.items() if job["expires_at"] <= now]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+class SQLiteJobStore:
+    """
+    Job store in a SQLite database file.
+
+    Each thread gets its own connection, and connections are never reused
+    across a fork, so the store can be built before gunicorn forks workers.
+    Expired rows are purged at most once every ``purge_interval`` seconds,
+    piggybacking on job creation.
+    """
+
+    def __init__(self, path, ttl=3600, purge_interval=60):
+        self.path = path
+        self.ttl = ttl
+        self.purge_interval = purge_interval
+        self._local = threading.local()
+        self._last_purge = 0.0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    template TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    cache_key TEXT NOT NULL,
+                    callback_url TEXT,
+                    error TEXT,
+                    pdf BLOB,
+                    created_at REAL NOT NULL,
+                    finished_at REAL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_expires_at ON jobs (expires_at)")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _conn(self):
+        pid, conn = getattr(self._local, "conn", (None, None))
+        if pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = (os.getpid(), conn)
+        return conn
+
+    def create(self, template, filename, cache_key, callback_url=None):
+        job = new_job(template, filename, cache_key, callback_url, self.ttl)
+        if job["created_at"] - self._last_purge >= self.purge_interval:
+            self.purge()
+
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                f"INSERT INTO jobs ({', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in _COLUMNS)})",
+                [job[column] for column in _COLUMNS],
+            )
+        return job
+
+    def get(self, job_id):
+        row = (
+            self._conn()
+            .execute(
+                "SELECT * FROM jobs WHERE id = ? AND expires_at > ?", (job_id, time.time())
+            )
+            .fetchone()
+        )
+        return dict(row) if row is not None else None
+
+    def finish(self, job_id, pdf=None, error=None):
+        """Record a job's outcome and return the updated job (None if it expired)."""
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, pdf = ?, error = ?, finished_at = ?, expires_at = ? "
+                "WHERE id = ? AND expires_at > ?",
+                (
+                    "failed" if error else "done",
+                    None if error else pdf,
+                    error,
+                    now,
+                    now + self.ttl,
+                    job_id,
+                    now,
+                ),
+            )
+        return self.get(job_id)
+
+    def delete(self, job_id):
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def purge(self):
+        self._last_purge = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM jobs WHERE expires_at <= ?", (self._last_purge,))
+
+
+def callback_allowed(url, hosts):
+    """Only allow http(s) callbacks to the configured (local) hosts."""
+    try:
+        parts = urlsplit(url)
+        hostname = parts.hostname
+    except ValueError:
+        return False
+    if parts.scheme not in ("http", "https") or not hostname:
+        return False
+
+    hostname = hostname.lower()
+    if hostname in hosts:
+        return True
+    try:
+        return str(ipaddress.ip_address(hostname)) in hosts
+    except ValueError:
+        return False
+
+
+class _NoRedirects(urllib.request.HTTPRedirectHandler):
+    # A redirect could point the callback at a host we didn't allow
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+# No proxies either: callbacks go straight to the (local) host that was allowed
+_callback_opener = urllib.request.build_opener(urllib.request.ProxyHandler({}), _NoRedirects)
+
+
+def notify_callback(url, payload, timeout=5):
+    """POST a JSON payload to a job's callback URL. Raises OSError on failure."""
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with _callback_opener.open(request, timeout=timeout) as response:
+            response.read()
+    except http.client.HTTPException as e:
+        # e.g. RemoteDisconnected from a misbehaving callback host
+        raise OSError(f"Bad response from callback: {e!r}") from e
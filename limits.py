@@ -0,0 +1,83 @@
+"""
+Size limits that keep one pathological resume from tying up a renderer.
+
+Limits are checked on normalized resume data (the dict build_resume_data
+returns, or a schema.Resume) before any HTML is generated, and on the laid
+out document before it is serialized:
+
+* max_field_chars: longest allowed text field, entry fields included
+* max_items:       most entries in any one section (experience, ...)
+* max_pages:       most pages a rendered resume may have
+
+A limit of 0 disables that check. Wall-clock and memory caps for the
+render processes live in render_pool.py.
+"""
+
+import dataclasses
+
+TEXT_FIELDS = (
+    "name",
+    "email",
+    "phone",
+    "location",
+    "linkedin",
+    "website",
+    "summary",
+    "skills",
+    "languages",
+)
+
+SECTIONS = {
+    "exp": "experience",
+    "edu": "education",
+    "proj": "projects",
+    "cert": "certifications",
+}
+
+
+class ResumeTooLarge(ValueError):
+    """The submitted resume exceeds a size limit (answered with 413)."""
+
+
+class PageLimitExceeded(Exception):
+    """The laid out resume has more pages than allowed (answered with 422)."""
+
+
+def _entry_values(entry):
+    if isinstance(entry, dict):
+        return entry.items()
+    return ((f.name, getattr(entry, f.name)) for f in dataclasses.fields(entry))
+
+
+class ResumeLimits:
+    def __init__(self, max_field_chars=0, max_items=0, max_pages=0):
+        self.max_field_chars = max_field_chars
+        self.max_items = max_items
+        self.max_pages = max_pages
+
+    def _check_text(self, label, value):
+        if self.max_field_chars and len(value) > self.max_field_chars:
+            raise ResumeTooLarge(
+                f"'{label}' is longer than {self.max_field_chars} characters"
+            )
+
+    def check(self, data):
+        """Raise ResumeTooLarge if ``data`` exceeds a field or item limit."""
+        for key in TEXT_FIELDS:
+            self._check_text(key, data[key])
+
+        for key, label in SECTIONS.items():
+            entries = data[key]
+            if self.max_items and len(entries) > self.max_items:
+                raise ResumeTooLarge(f"At most {self.max_items} {label} entries are allowed")
+            for i, entry in enumerate(entries):
+                for field, value in _entry_values(entry):
+                    self._check_text(f"{label}[{i}].{field}", value)
+
+    def check_pages(self, document):
+        """Raise PageLimitExceeded if a laid out WeasyPrint document is too long."""
+        if self.max_pages and len(document.pages) > self.max_pages:
+            raise PageLimitExceeded(
+                f"The resume is {len(document.pages)} pages long; "
+                f"at most {self.max_pages} are allowed"
+            )
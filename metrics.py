@@ -0,0 +1,389 @@
+"""
+Minimal Prometheus metrics that work across gunicorn and render-pool processes.
+
+Every process keeps its own counters/histograms in memory and dumps them to
+``<directory>/<pid>-<start>.json`` on flush(). A scrape merges all files in
+the directory: counters and histograms are summed, gauges are summed over
+processes that are still alive. This is the same idea as prometheus_client's
+multiprocess mode, without pulling in the dependency.
+
+Snapshots of processes that have exited (recycled workers, respawned render
+processes) are folded into one file on scrape, so their counts are kept but
+the directory doesn't grow. Like prometheus_client, the directory must be
+emptied with clear_directory() once per server start (see gunicorn.conf.py),
+before any process writes to it.
+"""
+
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_DIRECTORY = os.path.join(tempfile.gettempdir(), "resume-metrics")
+
+# Totals of processes that have exited, and the lock scrapes hold while
+# folding snapshots into it
+_EXITED_FILE = "exited.json"
+_LOCK_FILE = ".lock"
+
+# Temp files older than this were left by a process killed mid-flush
+_STALE_TMP_SECONDS = 60
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, registry, name, help_text, labelnames):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def describe(self):
+        return {"type": self.kind, "help": self.help, "labelnames": list(self.labelnames)}
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+            self.registry.dirty = True
+
+
+class Gauge(_Metric):
+    """Gauge whose scraped value is the sum over live processes."""
+
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self.values[key] = value
+            self.registry.dirty = True
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+            self.registry.dirty = True
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, registry, name, help_text, labelnames, buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+
+    def describe(self):
+        return {**super().describe(), "buckets": list(self.buckets)}
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            # [count per bucket..., sum, count]
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+            self.registry.dirty = True
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+
+class Registry:
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.lock = threading.Lock()
+        self.dirty = False
+        self._metrics = {}
+        self._init_process()
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._init_process)
+
+    def _init_process(self):
+        # A forked child must not re-report what its parent already counted
+        self.lock = threading.Lock()
+        for metric in self._metrics.values():
+            metric.values = {}
+        self._pid = os.getpid()
+        self._filename = f"{self._pid}-{time.time_ns()}.json"
+        self.dirty = False
+
+    def reset(self):
+        """Forget everything this process has recorded so far (e.g. warmup renders)."""
+        with self.lock:
+            for metric in self._metrics.values():
+                metric.values = {}
+            self.dirty = False
+        if self.directory:
+            try:
+                os.unlink(os.path.join(self.directory, self._filename))
+            except OSError:
+                pass
+
+    def _register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(Counter(self, name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._register(Gauge(self, name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(self, name, help_text, labelnames, buckets))
+
+    def _snapshot(self):
+        with self.lock:
+            self.dirty = False
+            return {
+                "pid": self._pid,
+                "metrics": {
+                    name: {
+                        **metric.describe(),
+                        "values": [[list(k), v] for k, v in metric.values.items()],
+                    }
+                    for name, metric in self._metrics.items()
+                },
+            }
+
+    def flush(self):
+        """Write this process's values to the shared directory (if anything changed)."""
+        if not self.directory or not self.dirty:
+            return
+
+        _write(self.directory, os.path.join(self.directory, self._filename), self._snapshot())
+
+    def _snapshots(self):
+        if not self.directory:
+            yield self._snapshot()
+            return
+
+        self.flush()
+        fd = os.open(os.path.join(self.directory, _LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            # One scrape at a time, so none reads a snapshot that is being folded
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            exited = self._fold_exited()
+            yield exited
+            for entry in os.scandir(self.directory):
+                if _snapshot_pid(entry.name) is None or entry.name in exited["files"]:
+                    continue
+                snapshot = _read(entry.path)
+                if snapshot is not None:
+                    yield snapshot
+        finally:
+            os.close(fd)
+
+    def _fold_exited(self):
+        """
+        Merge the snapshots of exited processes into the exited-totals file
+        and delete them. Returns the (possibly updated) totals snapshot.
+        """
+        path = os.path.join(self.directory, _EXITED_FILE)
+        exited = _read(path) or {"pid": None, "files": [], "metrics": {}}
+        merged = _merge({}, exited)
+        folded = []
+        now = time.time()
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".tmp"):
+                try:
+                    if now - entry.stat().st_mtime > _STALE_TMP_SECONDS:
+                        os.unlink(entry.path)
+                except OSError:
+                    pass
+                continue
+
+            pid = _snapshot_pid(entry.name)
+            if pid is None or _pid_alive(pid):
+                continue
+            if entry.name not in exited["files"]:
+                # Otherwise it was folded by a scrape that died before deleting it
+                snapshot = _read(entry.path)
+                if snapshot is not None:
+                    _merge(merged, snapshot)
+            folded.append(entry)
+
+        if not folded:
+            return exited
+
+        exited = {
+            "pid": None,
+            "files": [entry.name for entry in folded],
+            "metrics": {
+                name: {
+                    **{key: value for key, value in metric.items() if key != "values"},
+                    "values": [[list(k), v] for k, v in metric["values"].items()],
+                }
+                for name, metric in merged.items()
+            },
+        }
+        if not _write(self.directory, path, exited):
+            return _read(path) or {"pid": None, "files": [], "metrics": {}}
+        for entry in folded:
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+        return exited
+
+    def collect(self):
+        """Merge every process's snapshot -> {name: {description..., values: {labels: value}}}."""
+        merged = {}
+        for snapshot in self._snapshots():
+            _merge(merged, snapshot)
+        return merged
+
+    def render(self, merged=None):
+        """Render merged values in the Prometheus text exposition format."""
+        merged = self.collect() if merged is None else merged
+        lines = []
+        for name in sorted(merged):
+            metric = merged[name]
+            labelnames = metric["labelnames"]
+            lines.append(f"# HELP {name} {metric['help']}")
+            lines.append(f"# TYPE {name} {metric['type']}")
+
+            for labels, value in sorted(metric["values"].items()):
+                pairs = list(zip(labelnames, labels))
+                if metric["type"] != "histogram":
+                    lines.append(f"{name}{_labels(pairs)} {_number(value)}")
+                    continue
+
+                cumulative = 0
+                for bound, count in zip(metric["buckets"], value):
+                    cumulative += count
+                    lines.append(
+                        f"{name}_bucket{_labels(pairs + [('le', _number(bound))])} {cumulative}"
+                    )
+                lines.append(f"{name}_bucket{_labels(pairs + [('le', '+Inf')])} {value[-1]}")
+                lines.append(f"{name}_sum{_labels(pairs)} {_number(value[-2])}")
+                lines.append(f"{name}_count{_labels(pairs)} {value[-1]}")
+
+        return "\n".join(lines) + "\n"
+
+
+def clear_directory(directory):
+    """Delete every snapshot in ``directory``, e.g. left by an earlier server run."""
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        if entry.name.endswith((".json", ".tmp")):
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+
+
+def _merge(merged, snapshot):
+    """Add a snapshot's values into ``merged`` (gauges only if its process is alive)."""
+    alive = _pid_alive(snapshot.get("pid"))
+    for name, metric in snapshot["metrics"].items():
+        if metric["type"] == "gauge" and not alive:
+            continue
+
+        target = merged.setdefault(name, {**metric, "values": {}})
+        for labels, value in metric["values"]:
+            labels = tuple(labels)
+            if metric["type"] == "histogram":
+                current = target["values"].get(labels)
+                if current is None:
+                    target["values"][labels] = list(value)
+                else:
+                    target["values"][labels] = [a + b for a, b in zip(current, value)]
+            else:
+                target["values"][labels] = target["values"].get(labels, 0) + value
+    return merged
+
+
+def _read(path):
+    try:
+        with open(path) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _write(directory, path, snapshot):
+    """Atomically replace ``path`` with ``snapshot``; returns False if that failed."""
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as fh:
+            json.dump(snapshot, fh)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def _snapshot_pid(filename):
+    """The pid a per-process snapshot was written by, or None for other files."""
+    if not filename.endswith(".json"):
+        return None
+    try:
+        return int(filename.partition("-")[0])
+    except ValueError:
+        return None
+
+
+def _pid_alive(pid):
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _number(value):
+    return repr(value) if isinstance(value, float) else str(value)
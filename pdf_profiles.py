@@ -0,0 +1,82 @@
+"""
+PDF output profiles: trade serialization CPU for bytes on the wire.
+
+WeasyPrint already subsets fonts (each font is embedded once per document)
+and deflates content streams with zlib at level 9. A profile adjusts that:
+
+* speed:    zlib level 1 for content, font and image streams. Slightly
+            bigger files, noticeably less CPU in write_pdf().
+* balanced: WeasyPrint's defaults.
+* size:     zopfli for every deflated stream (a few percent smaller than
+            zlib -9, at many times the CPU), plus WeasyPrint's image
+            optimization and downsampling for any embedded images.
+
+Streams are recompressed in a write_pdf() finisher, which runs on the
+pydyf document right before it is serialized. Whatever the profile, the
+output is a valid PDF of the same document, so the choice never affects
+correctness.
+
+See benchmarks/bench_pdf_size.py for bytes saved versus extra CPU.
+"""
+
+import zlib
+
+import pydyf
+import zopfli.zlib
+
+DEFAULT_PROFILE = "balanced"
+
+
+def _deflate_fast(raw):
+    return zlib.compress(raw, 1)
+
+
+def _deflate_zopfli(raw):
+    return zopfli.zlib.compress(raw, numiterations=15)
+
+
+PDF_PROFILES = {
+    "speed": {"options": {}, "deflate": _deflate_fast},
+    "balanced": {"options": {}, "deflate": None},
+    "size": {
+        "options": {"optimize_images": True, "jpeg_quality": 85, "dpi": 150},
+        "deflate": _deflate_zopfli,
+    },
+}
+
+
+def _recompress(pdf, deflate):
+    for obj in pdf.objects:
+        if not isinstance(obj, pydyf.Stream) or not obj.compress:
+            continue
+        # Same bytes pydyf would deflate itself (pinned pydyf 0.10)
+        raw = b"\n".join(pydyf._to_bytes(item) for item in obj.stream)
+        obj.stream = [deflate(raw)]
+        obj.compress = False
+        obj.extra["Filter"] = "/FlateDecode"
+
+
+def write_options(profile):
+    """Keyword arguments for Document.write_pdf() under ``profile``."""
+    settings = PDF_PROFILES[profile]
+    options = dict(settings["options"])
+
+    deflate = settings["deflate"]
+    if deflate is not None:
+        options["finisher"] = lambda document, pdf: _recompress(pdf, deflate)
+    return options
+
+
+def parse_template_profiles(spec):
+    """
+    Parse "template=profile,..." (e.g. PDF_PROFILES="creative=size") into a
+    {template: profile} dict. Templates not listed use DEFAULT_PROFILE.
+    """
+    profiles = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        template, _, profile = item.partition("=")
+        template, profile = template.strip(), profile.strip()
+        if not template or profile not in PDF_PROFILES:
+            raise ValueError(f"Invalid PDF profile setting: {item!r}")
+        profiles[template] = profile
+    return profiles
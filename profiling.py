@@ -0,0 +1,220 @@
+"""
+Opt-in profiling of individual renders.
+
+A profiled request writes a directory under PROFILE_DIR named after its
+profile id (also sent back in the X-Profile-Id response header):
+
+    request.pstats / request.collapsed   the web thread: parsing,
+                                         build_resume_data, the content
+                                         generators, waiting on the pool
+    render.pstats / render.collapsed     the render process: layout and
+                                         write_pdf() (absent when rendering
+                                         inline, where it is part of request.*)
+    input.json                           the normalized resume, anonymized
+    summary.json                         endpoint, template, status, timings
+
+*.pstats are cProfile dumps (pstats, snakeviz). *.collapsed are stack
+samples in the folded format flamegraph.pl, speedscope and inferno read:
+one "frame;frame;frame count" line per distinct stack.
+
+input.json masks every letter and digit but keeps lengths, whitespace,
+punctuation and bullets, so the anonymized resume lays out like the
+original. Letters keep their Unicode script, since font fallback for a
+script is a cost worth reproducing. It has the shape /generate/batch
+accepts, so it can be replayed as is.
+"""
+
+import cProfile
+import dataclasses
+import hmac
+import json
+import os
+import random
+import shutil
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+# Not anonymized: they pick the layout and carry no personal data
+ANONYMIZE_SKIP = frozenset({"template", "color"})
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_qualname}"
+
+
+class StackSampler:
+    """Samples one thread's Python stack every ``interval`` seconds."""
+
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path):
+        with open(path, "w") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+class Profile:
+    """
+    cProfile plus stack sampling of the calling thread, written to
+    ``prefix``.pstats and ``prefix``.collapsed when stopped.
+    """
+
+    def __init__(self, prefix, interval=0.005):
+        self.prefix = prefix
+        self._profile = cProfile.Profile()
+        self._sampler = StackSampler(threading.get_ident(), interval)
+        self._running = False
+
+    def start(self):
+        self._sampler.start()
+        self._profile.enable()
+        self._running = True
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        self._profile.disable()
+        self._sampler.stop()
+        self._profile.dump_stats(f"{self.prefix}.pstats")
+        self._sampler.write(f"{self.prefix}.collapsed")
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def profile_call(prefix, interval, fn, *args):
+    """Run ``fn(*args)`` under a Profile. Module-level so render pools can pickle it."""
+    with Profile(prefix, interval):
+        return fn(*args)
+
+
+def _mask_char(c):
+    if c.isdigit():
+        return "0"
+    if not c.isalpha():
+        return c
+    if c.isascii():
+        return "X" if c.isupper() else "x"
+    # First letter of the character's 16-codepoint group: same script
+    for code in range((ord(c) & ~0xF), ord(c)):
+        if chr(code).isalpha():
+            return chr(code)
+    return c
+
+
+def anonymize(value, key=None):
+    """Mask the text in normalized resume data (a dict or schema.Resume)."""
+    if dataclasses.is_dataclass(value):
+        value = dataclasses.asdict(value)
+    if isinstance(value, dict):
+        return {k: anonymize(v, k) for k, v in value.items()}
+    if isinstance(value, list):
+        return [anonymize(item) for item in value]
+    if isinstance(value, str) and key not in ANONYMIZE_SKIP:
+        return "".join(map(_mask_char, value))
+    return value
+
+
+class ProfileSession:
+    """Everything recorded for one profiled request."""
+
+    def __init__(self, directory, profile_id, interval):
+        self.id = profile_id
+        self.directory = directory
+        self.interval = interval
+        self.summary = {"id": profile_id}
+        self._started = time.perf_counter()
+        self._request = Profile(self.path("request"), interval)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._request.start()
+
+    def save_input(self, data):
+        with open(self.path("input.json"), "w") as f:
+            json.dump(anonymize(data), f, indent=2, ensure_ascii=False)
+
+    def finish(self, **summary):
+        """Stop profiling the request and write summary.json. Safe to call twice."""
+        if "seconds" in self.summary:
+            return
+        self._request.stop()
+        self.summary.update(summary, seconds=round(time.perf_counter() - self._started, 4))
+        with open(self.path("summary.json"), "w") as f:
+            json.dump(self.summary, f, indent=2)
+
+
+class Profiler:
+    """
+    Decides which requests get profiled: those sending a header that
+    matches ``token`` (header profiling is off without one), plus a random
+    ``sample_rate`` fraction of the rest. Keeps at most ``max_dumps``
+    profile directories, dropping the oldest.
+    """
+
+    def __init__(self, directory, sample_rate=0.0, token=None, interval=0.005, max_dumps=200):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.token = token
+        self.interval = interval
+        self.max_dumps = max_dumps
+
+    def wants(self, header_value):
+        # Compare bytes: compare_digest raises TypeError on non-ASCII strings
+        if self.token and header_value and hmac.compare_digest(
+            header_value.encode(), self.token.encode()
+        ):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start(self):
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self._prune()
+        session = ProfileSession(
+            os.path.join(self.directory, profile_id), profile_id, self.interval
+        )
+        session.start()
+        return session
+
+    def _prune(self):
+        try:
+            # Ids start with a timestamp, so name order is age order
+            names = sorted(os.listdir(self.directory))
+        except FileNotFoundError:
+            return
+        for name in names[: max(0, len(names) - self.max_dumps + 1)]:
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
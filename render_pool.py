@@ -0,0 +1,210 @@
+"""
+Process pool for CPU-bound PDF rendering.
+
+WeasyPrint layout is pure CPU and holds the GIL, so rendering inside a web
+worker blocks every other request that worker could be serving. Jobs are
+handed to a small process pool instead. The number of in-flight + queued
+jobs is capped; once the cap is hit we refuse new work immediately so the
+caller can answer 503 rather than letting requests pile up behind a slow
+render.
+
+Each job also runs under a wall-clock deadline inside its render process,
+and each process can have its address space capped, so a pathological
+resume fails on its own instead of hogging a process indefinitely:
+
+* After ``timeout`` seconds SIGALRM raises RenderTimeout in the job.
+* If the job is stuck in C code and doesn't notice, the process exits
+  ``kill_grace`` seconds later (after dumping its stack to stderr). The
+  executor then counts as broken and is replaced on the next job.
+* With ``memory_limit`` set, allocations beyond it fail with MemoryError.
+"""
+
+import faulthandler
+import multiprocessing
+import os
+import resource
+import signal
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+class RenderPoolSaturated(Exception):
+    """Raised when the render queue is full and the caller should back off."""
+
+
+class RenderTimeout(TimeoutError):
+    """Raised inside a render process when a job runs past its deadline."""
+
+
+def _init_process(memory_limit, initializer, initargs):
+    if memory_limit:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def _on_deadline(signum, frame):
+    raise RenderTimeout("Render took too long")
+
+
+def _run_with_deadline(timeout, kill_grace, fn, *args):
+    """Run ``fn(*args)`` in a render process under the pool's wall-clock limits."""
+    signal.signal(signal.SIGALRM, _on_deadline)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    faulthandler.dump_traceback_later(timeout + kill_grace, exit=True)
+    try:
+        return fn(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        faulthandler.cancel_dump_traceback_later()
+
+
+class RenderPool:
+    """
+    Bounded wrapper around ProcessPoolExecutor.
+
+    ``max_workers`` processes render concurrently and up to ``max_queue``
+    more jobs may wait for a free process. ``max_workers=0`` renders inline
+    in the calling thread, which is handy for local development.
+
+    The executor is created lazily and re-created after a fork, so it is
+    safe to build this at import time under gunicorn's ``preload_app``.
+
+    ``timeout`` bounds both how long run() waits and how long a job may run
+    in its process; ``kill_grace`` and ``memory_limit`` (bytes, 0 for none)
+    are described in the module docstring. Inline rendering has no limits.
+    """
+
+    def __init__(
+        self,
+        max_workers,
+        max_queue,
+        timeout,
+        start_method="forkserver",
+        initializer=None,
+        initargs=(),
+        kill_grace=5,
+        memory_limit=0,
+    ):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.start_method = start_method
+        self.initializer = initializer
+        self.initargs = initargs
+        self.kill_grace = kill_grace
+        self.memory_limit = memory_limit
+
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self._slots = threading.BoundedSemaphore(max(1, max_workers + max_queue))
+
+    def _get_executor(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                # Fresh process (or first use): never reuse a parent's pool
+                self._executor = None
+                self._slots = threading.BoundedSemaphore(
+                    max(1, self.max_workers + self.max_queue)
+                )
+                self._pid = os.getpid()
+
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_init_process,
+                    initargs=(self.memory_limit, self.initializer, self.initargs),
+                )
+            return self._executor
+
+    def start(self):
+        """
+        Launch every worker process now rather than on the first job, so the
+        pool ``initializer`` (e.g. a warmup render) runs before real traffic.
+        Doesn't wait for the workers to come up.
+        """
+        if self.max_workers <= 0:
+            return
+        executor = self._get_executor()
+        # The executor spawns a process per job while none is idle
+        for _ in range(self.max_workers):
+            executor.submit(_noop)
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        """Stop the worker processes; the next job starts a fresh pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def _reset(self):
+        """Drop a broken executor so the next job starts a fresh one."""
+        self.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, fn, *args, block=False, timeout=None):
+        """
+        Queue ``fn(*args)`` and return its Future.
+
+        Raises RenderPoolSaturated when the queue is full, unless ``block``
+        is set, in which case we wait up to ``timeout`` seconds for a slot.
+        """
+        if self.max_workers <= 0:
+            future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        executor = self._get_executor()
+        slots = self._slots
+
+        acquired = slots.acquire(timeout=timeout) if block else slots.acquire(blocking=False)
+        if not acquired:
+            raise RenderPoolSaturated()
+
+        if self.timeout:
+            fn, args = _run_with_deadline, (self.timeout, self.kill_grace, fn, *args)
+
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._reset()
+            try:
+                future = self._get_executor().submit(fn, *args)
+            except BaseException:
+                slots.release()
+                raise
+        except BaseException:
+            slots.release()
+            raise
+
+        future.add_done_callback(lambda _: slots.release())
+        return future
+
+    def run(self, fn, *args):
+        """
+        Run ``fn(*args)`` in the pool and wait for the result.
+
+        Raises RenderPoolSaturated when the queue is full and TimeoutError
+        when the job takes longer than the configured per-job timeout.
+        """
+        return self.result(self.submit(fn, *args))
+
+    def result(self, future):
+        """Wait for a Future from submit(), with run()'s timeout and errors."""
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+        except BrokenProcessPool:
+            self._reset()
+            raise
+
+
+def _noop():
+    pass
@@ -0,0 +1,225 @@
+"""
+Fair scheduling of renders across priority lanes and clients.
+
+Every render takes one of ``capacity`` slots (one per render process) and
+belongs to a lane, e.g. "interactive" for previews and "generate" for
+downloads. Requests that find every slot taken wait in one queue ordered
+by self-clocked weighted fair queuing. Each (lane, client) pair is a flow.
+A waiting render's tag is
+
+    max(virtual time, the flow's previous tag) + 1 / lane weight
+
+and the lowest tag is served next, with the virtual time advancing to the
+tag of each render dispatched. A heavier lane therefore gets more of the
+renderers without starving the others. Within a lane, every client gets
+an equal share, however many requests it has queued.
+
+Before a request queues at all, admit() charges the client's token bucket
+for that lane. A client over its rate gets RateLimited, with the seconds
+until its next token. A lane whose queue is at ``max_queue`` refuses new
+work with QueueFull, so a flood of one kind of request can't tie up every
+web thread waiting. Callers that don't hold a thread while they wait (e.g.
+async jobs) queue with ``limited=False`` and don't count against it.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+
+# Idle flows and full buckets are forgotten once there are this many
+_MAX_TRACKED = 10000
+
+
+class RateLimited(Exception):
+    """A client is over its request rate for a lane (answered with 429)."""
+
+    def __init__(self, lane, retry_after):
+        super().__init__(f"Too many {lane} requests")
+        self.lane = lane
+        self.retry_after = retry_after
+
+
+class QueueFull(Exception):
+    """A lane has too many renders waiting, or one waited too long for a slot."""
+
+
+class Lane:
+    def __init__(self, name, weight=1.0, rate=0.0, burst=1.0, max_queue=0):
+        self.name = name
+        self.weight = weight
+        self.rate = rate  # Tokens per second per client; 0 for no limit
+        self.burst = burst
+        self.max_queue = max_queue  # 0 for no limit
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, now):
+        """Take a token; returns 0, or the seconds until one is available."""
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def full(self, now):
+        self._refill(now)
+        return self.tokens >= self.burst
+
+
+def parse_lane_settings(spec, cast=float):
+    """Parse "lane=value,..." (e.g. SCHEDULER_WEIGHTS="interactive=8") into a dict."""
+    settings = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        lane, _, value = item.partition("=")
+        try:
+            settings[lane.strip()] = cast(value.strip())
+        except ValueError:
+            raise ValueError(f"Invalid scheduler setting: {item!r}") from None
+    return settings
+
+
+class Scheduler:
+    """
+    ``on_depth(lane, depth)`` is called whenever a lane's queue length
+    changes (e.g. to update a gauge).
+    """
+
+    def __init__(self, capacity, lanes, on_depth=None):
+        self.capacity = capacity
+        self.lanes = {lane.name: lane for lane in lanes}
+        self.on_depth = on_depth
+        self._lock = threading.Lock()
+        self._running = 0
+        self._queue = []  # Heap of (tag, seq, grant)
+        self._seq = itertools.count()
+        self._virtual = 0.0
+        self._finish = {}  # (lane, client) -> tag of its last queued render
+        self._depth = dict.fromkeys(self.lanes, 0)
+        self._limited = dict.fromkeys(self.lanes, 0)  # Waiters counted against max_queue
+        self._buckets = {}
+
+    def _set_depth(self, grant, delta):
+        lane = grant.lane
+        self._depth[lane] += delta
+        if grant.limited:
+            self._limited[lane] += delta
+        if self.on_depth is not None:
+            self.on_depth(lane, self._depth[lane])
+
+    # --------- Admission --------- #
+
+    def admit(self, lane, client):
+        """Charge ``client``'s token bucket for ``lane``; raises RateLimited when it's empty."""
+        config = self.lanes[lane]
+        if not config.rate:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._buckets) > _MAX_TRACKED:
+                self._buckets = {
+                    key: bucket for key, bucket in self._buckets.items() if not bucket.full(now)
+                }
+            bucket = self._buckets.get((lane, client))
+            if bucket is None:
+                bucket = self._buckets[(lane, client)] = TokenBucket(config.rate, config.burst)
+            retry_after = bucket.take(now)
+        if retry_after:
+            raise RateLimited(lane, retry_after)
+
+    # --------- Slots --------- #
+
+    def acquire(self, lane, client, limited=True):
+        """
+        Ask for a render slot. Returns a Future that resolves to the seconds
+        spent waiting once the slot is granted; whoever holds it must call
+        release(). Raises QueueFull if ``lane`` can't queue any more, unless
+        ``limited`` is False.
+        """
+        config = self.lanes[lane]
+        grant = Future()
+        grant.lane = lane
+        grant.limited = limited
+        grant.queued_at = time.monotonic()
+        grant.granted = False
+
+        with self._lock:
+            # The heap may still hold cancelled entries; depths count live ones
+            if self._running < self.capacity and not any(self._depth.values()):
+                self._running += 1
+                grant.granted = True
+            else:
+                if limited and config.max_queue and self._limited[lane] >= config.max_queue:
+                    raise QueueFull(f"Too many {lane} renders are waiting")
+                if len(self._finish) > _MAX_TRACKED:
+                    # Flows at or behind the virtual time would restart there anyway
+                    self._finish = {
+                        flow: tag for flow, tag in self._finish.items() if tag > self._virtual
+                    }
+                flow = (lane, client)
+                tag = max(self._virtual, self._finish.get(flow, 0.0)) + 1 / config.weight
+                self._finish[flow] = tag
+                heapq.heappush(self._queue, (tag, next(self._seq), grant))
+                self._set_depth(grant, 1)
+
+        if grant.granted:
+            grant.set_result(0.0)
+        return grant
+
+    def release(self):
+        """Free a slot, handing it straight to the next waiting render if there is one."""
+        with self._lock:
+            grant = None
+            while self._queue:
+                tag, _, waiting = heapq.heappop(self._queue)
+                if waiting.cancelled():
+                    continue  # Its depth was given back by cancel()
+                self._virtual = tag
+                self._set_depth(waiting, -1)
+                waiting.granted = True
+                grant = waiting
+                break
+            else:
+                self._running -= 1
+
+        if grant is not None:
+            grant.set_result(time.monotonic() - grant.queued_at)
+
+    def cancel(self, grant):
+        """
+        Stop waiting for a slot. Returns False if it was granted meanwhile,
+        in which case the caller holds the slot and must release() it.
+        """
+        with self._lock:
+            if grant.granted:
+                return False
+            grant.cancel()
+            self._set_depth(grant, -1)
+            return True
+
+    def wait(self, lane, client, timeout=None):
+        """
+        acquire() and wait for the slot; returns the seconds waited. Raises
+        QueueFull when ``lane`` is full or no slot comes within ``timeout``.
+        """
+        grant = self.acquire(lane, client)
+        try:
+            return grant.result(timeout=timeout)
+        except TimeoutError:
+            if self.cancel(grant):
+                raise QueueFull(f"No renderer became free within {timeout:g}s") from None
+            return grant.result()
+
+    def depth(self, lane):
+        return self._depth[lane]
@@ -0,0 +1,146 @@
+"""
+Typed resume documents for the JSON API (/api/v1/resume).
+
+A request body is validated in one pass straight into the slotted
+dataclasses below. They support ``resume["exp"]`` / ``entry["title"]``
+lookups, so the HTML generators in app.py consume them exactly like the
+dicts build_resume_data returns, and they hash to the same cache keys as
+the equivalent dict (see cache.content_hash).
+
+Document shape (every field is optional; unknown keys are ignored):
+
+    {
+      "name": "...", "email": "...", "phone": "...", "location": "...",
+      "linkedin": "...", "website": "...", "summary": "...",
+      "skills": "a, b" or ["a", "b"], "languages": "a, b" or ["a", "b"],
+      "template": "modern" | "classic" | "creative", "color": "#2563eb",
+      "experience": [{"title", "company", "duration", "description"}],
+      "education": [{"degree", "institution", "year"}],
+      "projects": [{"name", "description", "link"}],
+      "certifications": [{"name", "issuer", "year"}]
+    }
+
+As with the form, entries whose first field is empty are dropped.
+"""
+
+from dataclasses import dataclass, field, fields
+
+
+class _Record:
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+
+@dataclass(slots=True)
+class Experience(_Record):
+    title: str
+    company: str = ""
+    duration: str = ""
+    description: str = ""
+
+
+@dataclass(slots=True)
+class Education(_Record):
+    degree: str
+    institution: str = ""
+    year: str = ""
+
+
+@dataclass(slots=True)
+class Project(_Record):
+    name: str
+    description: str = ""
+    link: str = ""
+
+
+@dataclass(slots=True)
+class Certification(_Record):
+    name: str
+    issuer: str = ""
+    year: str = ""
+
+
+@dataclass(slots=True)
+class Resume(_Record):
+    name: str = ""
+    email: str = ""
+    phone: str = ""
+    location: str = ""
+    linkedin: str = ""
+    website: str = ""
+    summary: str = ""
+    skills: str = ""
+    languages: str = ""
+    template: str = "modern"
+    color: str = "#2563eb"
+    exp: list = field(default_factory=list)
+    edu: list = field(default_factory=list)
+    proj: list = field(default_factory=list)
+    cert: list = field(default_factory=list)
+
+
+TEXT_FIELDS = ("name", "email", "phone", "location", "linkedin", "website", "summary")
+
+# Fields that may also be sent as a list of strings
+LIST_TEXT_FIELDS = ("skills", "languages")
+
+# JSON key -> (Resume attribute, entry class, entry field names)
+SECTIONS = {
+    json_key: (attr, cls, tuple(f.name for f in fields(cls)))
+    for json_key, attr, cls in (
+        ("experience", "exp", Experience),
+        ("education", "edu", Education),
+        ("projects", "proj", Project),
+        ("certifications", "cert", Certification),
+    )
+}
+
+
+def _text(obj, key, path, default=""):
+    value = obj.get(key, default)
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        raise ValueError(f"'{path}{key}' must be a string")
+    return value
+
+
+def resume_from_json(payload):
+    """Validate a parsed JSON document into a Resume. Raises ValueError."""
+    if not isinstance(payload, dict):
+        raise ValueError("Expected a JSON object")
+
+    resume = Resume(
+        template=_text(payload, "template", "", "modern"),
+        color=_text(payload, "color", "", "#2563eb"),
+    )
+    for key in TEXT_FIELDS:
+        setattr(resume, key, _text(payload, key, "").strip())
+
+    for key in LIST_TEXT_FIELDS:
+        value = payload.get(key)
+        if isinstance(value, list):
+            if not all(isinstance(item, str) for item in value):
+                raise ValueError(f"'{key}' must be a string or a list of strings")
+            value = ", ".join(item.strip() for item in value if item.strip())
+        else:
+            value = _text(payload, key, "").strip()
+        setattr(resume, key, value)
+
+    for json_key, (attr, cls, names) in SECTIONS.items():
+        entries = payload.get(json_key) or []
+        if not isinstance(entries, list):
+            raise ValueError(f"'{json_key}' must be a list")
+
+        items = getattr(resume, attr)
+        for i, entry in enumerate(entries):
+            path = f"{json_key}[{i}]."
+            if not isinstance(entry, dict):
+                raise ValueError(f"'{json_key}[{i}]' must be an object")
+            values = [_text(entry, name, path).strip() for name in names]
+            if values[0]:
+                items.append(cls(*values))
+
+    return resume
@@ -0,0 +1,140 @@
+"""
+Coalescing of identical concurrent renders ("single flight").
+
+When several requests want the same render at once (a double-clicked
+download, a retried job), only the first one renders; the others wait for
+it and share its result.
+
+* Within a process, callers with the same key share one Future.
+* Across processes on the host, the leader holds an exclusive POSIX record
+  lock on one byte of a shared lock file, picked by the key's hash, while
+  it renders. A
+  duplicate in another worker blocks on that lock, then asks ``lookup``
+  for the result the leader left behind (e.g. in a shared disk cache),
+  and only renders itself if there is none.
+
+Record locks belong to the process and are dropped when it dies, so a
+crashed leader never strands its followers. Each process opens the lock
+file once and keeps it open: closing any descriptor of a file releases
+all of the process's locks on it.
+"""
+
+import fcntl
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+# Lock offsets are 60 bits of the key's hash: unrelated keys don't collide
+# and the offset stays well inside a 64-bit off_t
+_OFFSET_HEX_DIGITS = 15
+
+
+def _lock_offset(key):
+    return int(hashlib.sha256(key.encode()).hexdigest()[:_OFFSET_HEX_DIGITS], 16)
+
+
+class SingleFlight:
+    def __init__(self, lock_path=None, poll_interval=0.02):
+        self.lock_path = lock_path
+        self.poll_interval = poll_interval
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._fd = None
+        self._fd_pid = None
+        if lock_path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(lock_path)), exist_ok=True)
+
+    # --------- In-process --------- #
+
+    def _join(self, key):
+        """Return (future, leader) for ``key``, registering a new call if none is in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                return call, False
+            call = self._calls[key] = Future()
+            return call, True
+
+    def _forget(self, key, call):
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    def share(self, key, submit):
+        """
+        Return the Future of an in-flight call for ``key``, or call
+        ``submit()`` (which must return a Future) and register its Future
+        until it completes. Returns (future, shared), ``shared`` being True
+        when the Future was already in flight.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                return call, True
+            call = self._calls[key] = submit()
+        call.add_done_callback(lambda _: self._forget(key, call))
+        return call, False
+
+    def do(self, key, fn, lookup=None, timeout=None):
+        """
+        Return ``fn()``, unless the same ``key`` is already being computed
+        here or (given a lock file) in another process, in which case wait
+        up to ``timeout`` seconds and share that result. Returns
+        (value, shared_from): None if this call ran ``fn``, else "process"
+        or "host" for where the shared result came from. Raises
+        TimeoutError if the wait runs out.
+        """
+        call, leader = self._join(key)
+        if not leader:
+            return call.result(timeout=timeout), "process"
+
+        try:
+            value, shared = self._do_locked(key, fn, lookup, timeout)
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(value)
+            return value, shared
+        finally:
+            self._forget(key, call)
+
+    # --------- Across processes --------- #
+
+    def _lock_fd(self):
+        with self._lock:
+            if self._fd_pid != os.getpid():
+                # Never share a descriptor (or its locks) with a forked parent
+                self._fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+                self._fd_pid = os.getpid()
+            return self._fd
+
+    def _do_locked(self, key, fn, lookup, timeout):
+        if self.lock_path is None:
+            return fn(), None
+
+        fd = self._lock_fd()
+        offset = _lock_offset(key)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waited = False
+        while True:
+            try:
+                fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, offset)
+                break
+            except OSError:
+                waited = True
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(f"Timed out waiting for an identical render of {key}")
+                time.sleep(self.poll_interval)
+
+        try:
+            if waited and lookup is not None:
+                # Another process just finished this key; use what it left
+                value = lookup()
+                if value is not None:
+                    return value, "host"
+            return fn(), None
+        finally:
+            fcntl.lockf(fd, fcntl.LOCK_UN, 1, offset)
@@ -246,7 +246,10 @@ function initFormActions() {
 
     if (loadBtn) loadBtn.addEventListener('click', loadData);
     if (clearBtn) clearBtn.addEventListener('click', clearForm);
-    if (refreshBtn) refreshBtn.addEventListener('click', updatePreview);
+    if (refreshBtn) refreshBtn.addEventListener('click', () => {
+        resetPreviewState();
+        updatePreview();
+    });
 
     if (form) {
         form.addEventListener('submit', async (e) => {
@@ -469,386 +472,91 @@ function showNotification(message, type = 'info') {
     }, 2500);
 }
 
-/* ---------- Preview: client-side only (no /preview fetch) ---------- */
-
-/* ---------- Preview: client-side, template-aware ---------- */
+/* ---------- Preview: server-rendered fragments, patched in place ---------- */
+
+const EMPTY_PREVIEW_HTML = `
+    <div class="empty-state">
+        <svg fill="none" stroke="currentColor" viewBox="0 0 24 24" aria-hidden="true">
+            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2"
+                d="M9 12h6m-6 4h6m2 5H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z">
+            </path>
+        </svg>
+        <h3>Your resume preview will appear here</h3>
+        <p>Start filling out the form to see your resume take shape</p>
+    </div>
+`;
+
+// What the preview currently shows: the template and a hash per section.
+// Sent with each request so the server only returns sections that changed.
+let previewState = { template: null, sections: {} };
+let previewTimeout;
+let previewSeq = 0;
+
+function resetPreviewState() {
+    previewState = { template: null, sections: {} };
+}
 
 function updatePreview() {
+    clearTimeout(previewTimeout);
+    previewTimeout = setTimeout(fetchPreview, 120);
+}
+
+async function fetchPreview() {
     const form = document.getElementById('resumeForm');
-    if (!form) return;
+    const preview = document.getElementById('resumePreview');
+    if (!form || !preview) return;
 
     const formData = new FormData(form);
-    const data = {};
-
-    formData.forEach((value, key) => {
-        if (key.includes('[]')) {
-            if (!data[key]) data[key] = [];
-            if (value.trim()) data[key].push(value);
-        } else {
-            data[key] = value;
-        }
-    });
+    formData.append('template', selectedTemplate);
+    formData.append('color', selectedColor);
+    formData.append('known', JSON.stringify(previewState));
 
-    const preview = document.getElementById('resumePreview');
-    if (!preview) return;
-
-    const name = (data.name || '').trim();
-    const email = (data.email || '').trim();
-
-    if (!name && !email) {
-        preview.innerHTML = `
-            <div class="empty-state">
-                <svg fill="none" stroke="currentColor" viewBox="0 0 24 24" aria-hidden="true">
-                    <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2"
-                        d="M9 12h6m-6 4h6m2 5H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z">
-                    </path>
-                </svg>
-                <h3>Your resume preview will appear here</h3>
-                <p>Start filling out the form to see your resume take shape</p>
-            </div>
-        `;
-        return;
-    }
-
-    const color = window.selectedColor || '#2563eb';
-    const template = selectedTemplate || 'modern';
-
-    // Helper to build bullet lists from textarea
-    const buildBulletList = (text) => {
-        const lines = text.split('\n').map(l => l.trim()).filter(Boolean);
-        if (!lines.length) return '';
-        let html = '<ul>';
-        lines.forEach(line => {
-            if (line.startsWith('•')) line = line.slice(1).trim();
-            html += `<li>${line}</li>`;
-        });
-        html += '</ul>';
-        return html;
-    };
-
-    // Common pieces
-    const contactBits = [];
-    if (email) contactBits.push(email);
-    if (data.phone && data.phone.trim()) contactBits.push(data.phone.trim());
-    if (data.location && data.location.trim()) contactBits.push(data.location.trim());
-    if (data.linkedin && data.linkedin.trim()) contactBits.push(data.linkedin.trim());
-    if (data.website && data.website.trim()) contactBits.push(data.website.trim());
-
-    const skillsArray = (data.skills || '')
-        .split(',')
-        .map(s => s.trim())
-        .filter(Boolean);
-
-    // ---------- TEMPLATE: CREATIVE (2-column) ----------
-    if (template === 'creative') {
-        let html = `<div class="resume-page template-creative">`;
-        html += `<div class="wrapper">`;
-
-        // Sidebar
-        html += `<div class="sidebar" style="background:${color}">`;
-        html += `<h1>${name || 'Your Name'}</h1>`;
-        html += `<div class="contact">`;
-        contactBits.forEach(bit => {
-            html += `<div>${bit}</div>`;
+    const seq = ++previewSeq;
+    let result;
+    try {
+        const response = await fetch('/preview/fragments', {
+            method: 'POST',
+            body: formData
         });
-        html += `</div>`;
-
-        if (skillsArray.length) {
-            html += `<div class="section-title">Skills</div>`;
-            html += `<div class="skills">`;
-            html += skillsArray.join('<br>');
-            html += `</div>`;
-        }
-
-        if (data.languages && data.languages.trim()) {
-            html += `<div class="section-title">Languages</div>`;
-            html += `<div class="skills">${data.languages.trim()}</div>`;
-        }
-
-        html += `</div>`; // .sidebar
-
-        // Main
-        html += `<div class="main">`;
-
-        if (data.summary && data.summary.trim()) {
-            html += `<div class="section">`;
-            html += `<div class="section-title" style="color:${color}">About Me</div>`;
-            html += `<div class="summary">${data.summary.trim()}</div>`;
-            html += `</div>`;
-        }
-
-        // Experience
-        if (data['exp_title[]'] && data['exp_title[]'].length) {
-            html += `<div class="section">`;
-            html += `<div class="section-title" style="color:${color}">Experience</div>`;
-
-            data['exp_title[]'].forEach((title, i) => {
-                if (!title.trim()) return;
-                const company = (data['exp_company[]'] && data['exp_company[]'][i]) || '';
-                const duration = (data['exp_duration[]'] && data['exp_duration[]'][i]) || '';
-                const desc = (data['exp_description[]'] && data['exp_description[]'][i]) || '';
-
-                html += `<div class="item">`;
-                html += `<div class="item-header">`;
-                html += `<div>`;
-                html += `<div class="item-title">${title}</div>`;
-                if (company.trim()) {
-                    html += `<div class="item-subtitle">${company}</div>`;
-                }
-                html += `</div>`;
-                if (duration.trim()) {
-                    html += `<div class="item-duration">${duration}</div>`;
-                }
-                html += `</div>`; // .item-header
-
-                if (desc.trim()) {
-                    html += `<div class="item-description">${buildBulletList(desc)}</div>`;
-                }
-                html += `</div>`; // .item
-            });
-
-            html += `</div>`; // .section
-        }
-
-        // Projects
-        if (data['proj_name[]'] && data['proj_name[]'].length) {
-            html += `<div class="section">`;
-            html += `<div class="section-title" style="color:${color}">Projects</div>`;
-
-            data['proj_name[]'].forEach((nameVal, i) => {
-                if (!nameVal.trim()) return;
-                const link = (data['proj_link[]'] && data['proj_link[]'][i]) || '';
-                const desc = (data['proj_description[]'] && data['proj_description[]'][i]) || '';
-
-                html += `<div class="item">`;
-                html += `<div class="item-title">${nameVal}</div>`;
-                if (link.trim()) {
-                    html += `<div class="item-subtitle">${link}</div>`;
-                }
-                if (desc.trim()) {
-                    html += `<div class="item-description">${buildBulletList(desc)}</div>`;
-                }
-                html += `</div>`;
-            });
-
-            html += `</div>`;
-        }
-
-        // Education
-        if (data['edu_degree[]'] && data['edu_degree[]'].length) {
-            html += `<div class="section">`;
-            html += `<div class="section-title" style="color:${color}">Education</div>`;
-
-            data['edu_degree[]'].forEach((degree, i) => {
-                if (!degree.trim()) return;
-                const inst = (data['edu_institution[]'] && data['edu_institution[]'][i]) || '';
-                const year = (data['edu_year[]'] && data['edu_year[]'][i]) || '';
-
-                html += `<div class="item">`;
-                html += `<div class="item-header">`;
-                html += `<div>`;
-                html += `<div class="item-title">${degree}</div>`;
-                if (inst.trim()) {
-                    html += `<div class="item-subtitle">${inst}</div>`;
-                }
-                html += `</div>`;
-                if (year.trim()) {
-                    html += `<div class="item-duration">${year}</div>`;
-                }
-                html += `</div></div>`;
-            });
-
-            html += `</div>`;
-        }
-
-        // Certifications
-        if (data['cert_name[]'] && data['cert_name[]'].length) {
-            html += `<div class="section">`;
-            html += `<div class="section-title" style="color:${color}">Certifications</div>`;
-
-            data['cert_name[]'].forEach((cert, i) => {
-                if (!cert.trim()) return;
-                const issuer = (data['cert_issuer[]'] && data['cert_issuer[]'][i]) || '';
-                const year = (data['cert_year[]'] && data['cert_year[]'][i]) || '';
-
-                html += `<div class="item">`;
-                html += `<div class="item-title">${cert}</div>`;
-                if (issuer.trim() || year.trim()) {
-                    const details = [issuer.trim(), year.trim()].filter(Boolean).join(' • ');
-                    html += `<div class="item-subtitle">${details}</div>`;
-                }
-                html += `</div>`;
-            });
-
-            html += `</div>`;
-        }
-
-        html += `</div>`; // .main
-        html += `</div>`; // .wrapper
-        html += `</div>`; // .resume-page
-
-        preview.innerHTML = html;
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        result = await response.json();
+    } catch (err) {
+        console.error('Preview error:', err);
         return;
     }
 
-    // ---------- TEMPLATE: MODERN / CLASSIC (single-column) ----------
-
-    const templateClass = template === 'classic' ? 'template-classic' : 'template-modern';
-
-    let html = `<div class="resume-page ${templateClass}">`;
-    html += '<div class="resume-root">';
-
-    // Header
-    html += '<div class="header">';
-    html += `<h1 style="color:${color}">${name || 'Your Name'}</h1>`;
-
-    html += '<div class="contact">';
-    contactBits.forEach(bit => {
-        html += `<span>${bit}</span>`;
-    });
-    html += '</div></div>'; // .contact, .header
-
-    // Summary
-    if (data.summary && data.summary.trim()) {
-        html += '<div class="resume-section">';
-        html += `<div class="resume-section-title" style="--accent:${color}">Professional Summary</div>`;
-        html += `<div class="resume-summary">${data.summary.trim()}</div>`;
-        html += '</div>';
-    }
-
-    // Experience
-    if (data['exp_title[]'] && data['exp_title[]'].length) {
-        html += '<div class="resume-section">';
-        html += `<div class="resume-section-title" style="--accent:${color}">Work Experience</div>`;
-
-        data['exp_title[]'].forEach((title, i) => {
-            if (!title.trim()) return;
-
-            const company = (data['exp_company[]'] && data['exp_company[]'][i]) || '';
-            const duration = (data['exp_duration[]'] && data['exp_duration[]'][i]) || '';
-            const desc = (data['exp_description[]'] && data['exp_description[]'][i]) || '';
-
-            html += '<div class="item">';
-            html += '<div class="item-header">';
-            html += '<div>';
-            html += `<div class="item-title">${title}</div>`;
-            if (company.trim()) {
-                html += `<div class="item-subtitle">${company}</div>`;
-            }
-            html += '</div>';
-            if (duration.trim()) {
-                html += `<div class="item-duration">${duration}</div>`;
-            }
-            html += '</div>'; // .item-header
-
-            if (desc.trim()) {
-                html += `<div class="item-description">${buildBulletList(desc)}</div>`;
-            }
-
-            html += '</div>'; // .item
-        });
-
-        html += '</div>'; // .resume-section
-    }
-
-    // Projects
-    if (data['proj_name[]'] && data['proj_name[]'].length) {
-        html += '<div class="resume-section">';
-        html += `<div class="resume-section-title" style="--accent:${color}">Projects</div>`;
-
-        data['proj_name[]'].forEach((nameVal, i) => {
-            if (!nameVal.trim()) return;
-
-            const link = (data['proj_link[]'] && data['proj_link[]'][i]) || '';
-            const desc = (data['proj_description[]'] && data['proj_description[]'][i]) || '';
-
-            html += '<div class="item">';
-            html += `<div class="item-title">${nameVal}</div>`;
-            if (link.trim()) {
-                html += `<div class="item-subtitle">${link}</div>`;
-            }
-            if (desc.trim()) {
-                html += `<div class="item-description">${buildBulletList(desc)}</div>`;
-            }
-            html += '</div>';
-        });
-
-        html += '</div>';
-    }
-
-    // Education
-    if (data['edu_degree[]'] && data['edu_degree[]'].length) {
-        html += '<div class="resume-section">';
-        html += `<div class="resume-section-title" style="--accent:${color}">Education</div>`;
-
-        data['edu_degree[]'].forEach((degree, i) => {
-            if (!degree.trim()) return;
-            const inst = (data['edu_institution[]'] && data['edu_institution[]'][i]) || '';
-            const year = (data['edu_year[]'] && data['edu_year[]'][i]) || '';
-
-            html += '<div class="item">';
-            html += '<div class="item-header">';
-            html += '<div>';
-            html += `<div class="item-title">${degree}</div>`;
-            if (inst.trim()) {
-                html += `<div class="item-subtitle">${inst}</div>`;
-            }
-            html += '</div>';
-            if (year.trim()) {
-                html += `<div class="item-duration">${year}</div>`;
-            }
-            html += '</div></div>'; // .item-header, .item
-        });
-
-        html += '</div>';
-    }
-
-    // Certifications
-    if (data['cert_name[]'] && data['cert_name[]'].length) {
-        html += '<div class="resume-section">';
-        html += `<div class="resume-section-title" style="--accent:${color}">Certifications</div>`;
-
-        data['cert_name[]'].forEach((cert, i) => {
-            if (!cert.trim()) return;
-            const issuer = (data['cert_issuer[]'] && data['cert_issuer[]'][i]) || '';
-            const year = (data['cert_year[]'] && data['cert_year[]'][i]) || '';
-
-            html += '<div class="item">';
-            html += '<div class="item-header">';
-            html += '<div>';
-            html += `<div class="item-title">${cert}</div>`;
-            if (issuer.trim()) {
-                html += `<div class="item-subtitle">${issuer}</div>`;
-            }
-            html += '</div>';
-            if (year.trim()) {
-                html += `<div class="item-duration">${year}</div>`;
-            }
-            html += '</div></div>';
-        });
+    // A newer edit is already on its way; its diff is against what we show now
+    if (seq !== previewSeq) return;
+    applyPreview(preview, result);
+}
 
-        html += '</div>';
+function applyPreview(preview, result) {
+    if (result.empty) {
+        preview.innerHTML = EMPTY_PREVIEW_HTML;
+        resetPreviewState();
+        return;
     }
 
-    // Skills
-    if (data.skills && data.skills.trim()) {
-        html += '<div class="resume-section">';
-        html += `<div class="resume-section-title" style="--accent:${color}">Skills</div>`;
-        html += '<div class="skills-list">';
-        skillsArray.forEach(skill => {
-            html += `<span class="skill-tag" style="border-color:${color};color:${color}">${skill}</span>`;
+    const page = preview.querySelector('.resume-page');
+    if (result.html !== undefined) {
+        preview.innerHTML = result.html;
+    } else if (!page) {
+        // Our state and the DOM disagree; start over with a full render
+        resetPreviewState();
+        updatePreview();
+        return;
+    } else {
+        page.style.setProperty('--accent', result.color);
+        result.sections.forEach(section => {
+            if (section.html === undefined) return;
+            const slot = page.querySelector(`[data-section="${section.name}"]`);
+            if (slot) slot.innerHTML = section.html;
         });
-        html += '</div></div>';
     }
 
-    // Languages
-    if (data.languages && data.languages.trim()) {
-        html += '<div class="resume-section">';
-        html += `<div class="resume-section-title" style="--accent:${color}">Languages</div>`;
-        html += `<div class="resume-languages">${data.languages.trim()}</div>`;
-        html += '</div>';
-    }
-
-    html += '</div></div>'; // .resume-root, .resume-page
-    preview.innerHTML = html;
+    const sections = {};
+    result.sections.forEach(section => {
+        sections[section.name] = section.hash;
+    });
+    previewState = { template: result.template, sections };
 }
@@ -0,0 +1,67 @@
+import threading
+import time
+
+import pytest
+
+import app
+from render_pool import RenderPool
+from scheduler import Lane, Scheduler
+
+
+def stuck_render(seconds):
+    """Sleep through the pool's deadline signal, like a render stuck in C code."""
+    deadline = time.monotonic() + seconds
+    while deadline > time.monotonic():
+        try:
+            time.sleep(deadline - time.monotonic())
+        except Exception:
+            pass
+    return "late"
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = RenderPool(max_workers=1, max_queue=1, timeout=0.2, kill_grace=10)
+    monkeypatch.setattr(app, "RENDER_POOL", pool)
+    monkeypatch.setattr(
+        app, "SCHEDULER", Scheduler(1, [Lane(name) for name in app.SCHEDULER.lanes])
+    )
+    pool.start()
+    pool.submit(stuck_render, 0).result(timeout=30)  # Wait for the process to come up
+    yield pool
+    pool.shutdown()
+
+
+def test_timed_out_render_keeps_its_slot_until_the_job_ends(pool):
+    with app.app.test_request_context("/generate"):
+        with pytest.raises(TimeoutError):
+            app.run_render(stuck_render, 1.0)
+
+    # The render process is still busy with the abandoned job
+    waiting = app.SCHEDULER.acquire("generate", "another client")
+    time.sleep(0.3)
+    assert not waiting.done()
+
+    assert waiting.result(timeout=10) > 0.5
+    app.SCHEDULER.release()
+
+
+def test_render_releases_its_slot(pool):
+    with app.app.test_request_context("/generate"):
+        assert app.run_render(stuck_render, 0) == "late"
+
+    assert app.SCHEDULER.acquire("generate", "another client").result(timeout=1) == 0.0
+
+
+def test_jobs_queue_beyond_the_bulk_lane_limit(monkeypatch):
+    sched = Scheduler(1, [Lane(name, max_queue=2) for name in app.SCHEDULER.lanes])
+    sched.acquire("bulk", "holder")  # Every renderer is busy
+    monkeypatch.setattr(app, "SCHEDULER", sched)
+    monkeypatch.setattr(app, "JOB_QUEUE", threading.BoundedSemaphore(5))
+
+    client = app.app.test_client()
+    codes = [client.post("/jobs", json={"name": f"Job {i}"}).status_code for i in range(6)]
+
+    # Past the lane's limit of 2, up to JOB_QUEUE_SIZE
+    assert codes == [202] * 5 + [503]
+    assert sched.depth("bulk") == 5
@@ -0,0 +1,182 @@
+import pytest
+
+import scheduler
+from scheduler import Lane, QueueFull, RateLimited, Scheduler, parse_lane_settings
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(scheduler.time, "monotonic", clock)
+    return clock
+
+
+def busy_scheduler(*lanes, capacity=1):
+    """A Scheduler whose every slot is already taken."""
+    sched = Scheduler(capacity, lanes or [Lane("generate")])
+    for _ in range(capacity):
+        assert sched.acquire(next(iter(sched.lanes)), "holder").result(timeout=0) == 0.0
+    return sched
+
+
+def grant_order(sched, grants):
+    """Release slots one at a time; returns the names of grants in the order they got one."""
+    order = []
+    for _ in grants:
+        sched.release()
+        for name, grant in grants.items():
+            if grant.done() and name not in order:
+                order.append(name)
+    return order
+
+
+# --------- Admission --------- #
+
+
+def test_admit_without_rate_never_limits(clock):
+    sched = Scheduler(1, [Lane("generate")])
+    for _ in range(100):
+        sched.admit("generate", "client")
+
+
+def test_admit_allows_a_burst_then_limits(clock):
+    sched = Scheduler(1, [Lane("generate", rate=2.0, burst=3)])
+    for _ in range(3):
+        sched.admit("generate", "client")
+
+    with pytest.raises(RateLimited) as info:
+        sched.admit("generate", "client")
+    assert info.value.lane == "generate"
+    assert info.value.retry_after == pytest.approx(0.5)
+
+
+def test_admit_refills_over_time(clock):
+    sched = Scheduler(1, [Lane("generate", rate=2.0, burst=1)])
+    sched.admit("generate", "client")
+    with pytest.raises(RateLimited):
+        sched.admit("generate", "client")
+
+    clock.now += 0.5
+    sched.admit("generate", "client")
+
+
+def test_admit_buckets_are_per_client_and_lane(clock):
+    sched = Scheduler(1, [Lane("generate", rate=1.0, burst=1), Lane("bulk", rate=1.0, burst=1)])
+    sched.admit("generate", "a")
+    sched.admit("generate", "b")
+    sched.admit("bulk", "a")
+    with pytest.raises(RateLimited):
+        sched.admit("generate", "a")
+
+
+# --------- Slots --------- #
+
+
+def test_acquire_is_immediate_while_slots_are_free():
+    sched = Scheduler(2, [Lane("generate")])
+    assert sched.acquire("generate", "a").result(timeout=0) == 0.0
+    assert sched.acquire("generate", "b").result(timeout=0) == 0.0
+
+    waiting = sched.acquire("generate", "c")
+    assert not waiting.done()
+    assert sched.depth("generate") == 1
+
+    sched.release()
+    assert waiting.done()
+    assert sched.depth("generate") == 0
+
+
+def test_queue_full():
+    sched = busy_scheduler(Lane("generate", max_queue=2))
+    sched.acquire("generate", "a")
+    sched.acquire("generate", "b")
+    with pytest.raises(QueueFull):
+        sched.acquire("generate", "c")
+
+
+def test_unlimited_waiters_skip_and_dont_fill_the_queue_limit():
+    sched = busy_scheduler(Lane("bulk", max_queue=2))
+    for client in range(5):
+        sched.acquire("bulk", client, limited=False)
+    assert sched.depth("bulk") == 5
+
+    sched.acquire("bulk", "a")
+    sched.acquire("bulk", "b")
+    with pytest.raises(QueueFull):
+        sched.acquire("bulk", "c")
+
+
+def test_clients_in_a_lane_share_fairly():
+    sched = busy_scheduler(Lane("generate"))
+    grants = {
+        "a1": sched.acquire("generate", "a"),
+        "a2": sched.acquire("generate", "a"),
+        "a3": sched.acquire("generate", "a"),
+        "b1": sched.acquire("generate", "b"),
+    }
+    # b queued last but gets its turn right after a's first render
+    assert grant_order(sched, grants) == ["a1", "b1", "a2", "a3"]
+
+
+def test_heavier_lane_gets_more_slots_without_starving_others():
+    sched = busy_scheduler(Lane("interactive", weight=4.0), Lane("bulk", weight=1.0))
+    grants = {f"bulk{i}": sched.acquire("bulk", "a") for i in range(3)}
+    grants.update({f"interactive{i}": sched.acquire("interactive", "a") for i in range(8)})
+
+    order = grant_order(sched, grants)
+    assert order[:3] == ["interactive0", "interactive1", "interactive2"]
+    # One bulk render per four interactive ones
+    assert [name for name in order if name.startswith("bulk")] == ["bulk0", "bulk1", "bulk2"]
+    assert order.index("bulk0") < order.index("interactive4")
+    assert order.index("bulk1") < order.index("interactive7")
+
+
+def test_cancelled_waiters_are_skipped():
+    depths = []
+    sched = Scheduler(1, [Lane("generate")], on_depth=lambda lane, depth: depths.append(depth))
+    sched.acquire("generate", "holder")
+    first = sched.acquire("generate", "a")
+    second = sched.acquire("generate", "b")
+
+    assert sched.cancel(first)
+    assert sched.depth("generate") == 1
+    sched.release()
+    assert first.cancelled() and second.done()
+    assert sched.depth("generate") == 0
+    assert depths == [1, 2, 1, 0]
+
+    # A granted slot can't be cancelled; its holder must release it
+    assert not sched.cancel(second)
+
+
+def test_wait_times_out_with_queue_full():
+    sched = busy_scheduler(Lane("generate"))
+    with pytest.raises(QueueFull):
+        sched.wait("generate", "a", timeout=0.01)
+    assert sched.depth("generate") == 0
+
+    # The abandoned wait doesn't take the slot when it frees up
+    sched.release()
+    assert sched.acquire("generate", "b").result(timeout=0) == 0.0
+
+
+def test_release_frees_the_slot_when_nobody_waits():
+    sched = Scheduler(1, [Lane("generate")])
+    sched.acquire("generate", "a")
+    sched.release()
+    assert sched.acquire("generate", "b").result(timeout=0) == 0.0
+
+
+def test_parse_lane_settings():
+    assert parse_lane_settings("interactive=8, bulk=0.5,") == {"interactive": 8.0, "bulk": 0.5}
+    assert parse_lane_settings("generate=2/10", str) == {"generate": "2/10"}
+    with pytest.raises(ValueError):
+        parse_lane_settings("generate=fast")
@@ -0,0 +1,196 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+from singleflight import SingleFlight
+
+fork = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork"
+)
+
+
+def wait_for(path, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        assert time.monotonic() < deadline, f"{path} never appeared"
+        time.sleep(0.01)
+
+
+# --------- In-process --------- #
+
+
+def test_concurrent_calls_share_one_run():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def render():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "pdf"
+
+    with ThreadPoolExecutor(2) as executor:
+        leader = executor.submit(flight.do, "key", render)
+        assert started.wait(5)
+        follower = executor.submit(flight.do, "key", render)
+        time.sleep(0.05)  # Let the follower join the in-flight call
+        release.set()
+
+        assert leader.result(5) == ("pdf", None)
+        assert follower.result(5) == ("pdf", "process")
+    assert len(calls) == 1
+
+
+def test_followers_see_the_leaders_exception():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def render():
+        started.set()
+        release.wait(5)
+        raise ValueError("bad resume")
+
+    with ThreadPoolExecutor(2) as executor:
+        leader = executor.submit(flight.do, "key", render)
+        assert started.wait(5)
+        follower = executor.submit(flight.do, "key", render)
+        time.sleep(0.05)
+        release.set()
+
+        with pytest.raises(ValueError, match="bad resume"):
+            leader.result(5)
+        with pytest.raises(ValueError, match="bad resume"):
+            follower.result(5)
+
+
+def test_finished_calls_are_forgotten():
+    flight = SingleFlight()
+    assert flight.do("key", lambda: 1) == (1, None)
+    assert flight.do("key", lambda: 2) == (2, None)
+
+
+def test_other_keys_run_independently():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    with ThreadPoolExecutor(2) as executor:
+        blocked = executor.submit(flight.do, "a", lambda: release.wait(5) and "a")
+        assert flight.do("b", lambda: "b") == ("b", None)
+        release.set()
+        assert blocked.result(5) == ("a", None)
+
+
+def test_follower_timeout():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    with ThreadPoolExecutor(1) as executor:
+        leader = executor.submit(flight.do, "key", lambda: release.wait(5))
+        time.sleep(0.05)
+        with pytest.raises(TimeoutError):
+            flight.do("key", lambda: "unused", timeout=0.05)
+        release.set()
+        leader.result(5)
+
+
+def test_share_returns_the_in_flight_future():
+    flight = SingleFlight()
+    pending = Future()
+    submitted = []
+
+    def submit():
+        submitted.append(1)
+        return pending
+
+    assert flight.share("key", submit) == (pending, False)
+    assert flight.share("key", submit) == (pending, True)
+    assert len(submitted) == 1
+
+    pending.set_result("pdf")
+    again, shared = flight.share("key", lambda: Future())
+    assert again is not pending and not shared
+
+
+# --------- Across processes --------- #
+
+
+def _leader(lock_path, tmp_dir, crash):
+    def render():
+        open(os.path.join(tmp_dir, "started"), "w").close()
+        time.sleep(0.3)
+        if crash:
+            os._exit(1)  # Dies holding the lock
+        with open(os.path.join(tmp_dir, "result"), "w") as fh:
+            fh.write("pdf from leader")
+        return "pdf from leader"
+
+    SingleFlight(lock_path).do("key", render)
+
+
+def _lookup(tmp_dir):
+    def lookup():
+        try:
+            with open(os.path.join(tmp_dir, "result")) as fh:
+                return fh.read()
+        except FileNotFoundError:
+            return None
+
+    return lookup
+
+
+def _run_leader(tmp_path, crash=False):
+    process = multiprocessing.get_context("fork").Process(
+        target=_leader, args=(str(tmp_path / "flight.lock"), str(tmp_path), crash)
+    )
+    process.start()
+    wait_for(tmp_path / "started")
+    return process
+
+
+@fork
+def test_another_process_waits_and_uses_the_leaders_result(tmp_path):
+    leader = _run_leader(tmp_path)
+    calls = []
+
+    def render():
+        calls.append(1)
+        return "pdf from follower"
+
+    flight = SingleFlight(str(tmp_path / "flight.lock"))
+    value, shared_from = flight.do("key", render, lookup=_lookup(str(tmp_path)), timeout=10)
+    leader.join(10)
+
+    assert (value, shared_from) == ("pdf from leader", "host")
+    assert not calls
+
+
+@fork
+def test_a_crashed_leader_does_not_strand_followers(tmp_path):
+    leader = _run_leader(tmp_path, crash=True)
+
+    flight = SingleFlight(str(tmp_path / "flight.lock"))
+    value, shared_from = flight.do(
+        "key", lambda: "pdf from follower", lookup=_lookup(str(tmp_path)), timeout=10
+    )
+    leader.join(10)
+
+    assert (value, shared_from) == ("pdf from follower", None)
+    assert leader.exitcode == 1
+
+
+@fork
+def test_different_keys_do_not_block_across_processes(tmp_path):
+    leader = _run_leader(tmp_path)
+
+    flight = SingleFlight(str(tmp_path / "flight.lock"))
+    started = time.monotonic()
+    assert flight.do("other key", lambda: "other", timeout=10) == ("other", None)
+    assert time.monotonic() - started < 0.2
+    leader.join(10)
@@ -0,0 +1,132 @@
+"""
+Rasterize the first page of a rendered resume into a small preview image.
+
+WeasyPrint stopped producing PNGs in v53, so there are two ways to get
+pixels out of a document:
+
+* ``layout``: paint page 1 straight from WeasyPrint's box tree with Pillow
+  (backgrounds, borders and one bar per run of text). It never serializes
+  a PDF, which keeps it cheap enough to call on every debounced edit.
+* ``full``: write the real PDF and rasterize it with poppler's
+  ``pdftoppm``. Falls back to ``layout`` when poppler isn't installed.
+"""
+
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+
+from PIL import Image, ImageDraw, features
+from weasyprint.draw import get_color
+
+THUMBNAIL_MODES = ("layout", "full")
+
+THUMBNAIL_FORMATS = {
+    "png": ("PNG", "image/png"),
+    "webp": ("WEBP", "image/webp"),
+}
+
+
+def format_supported(fmt):
+    if fmt not in THUMBNAIL_FORMATS:
+        return False
+    return fmt != "webp" or features.check("webp")
+
+
+def _rgba(color):
+    """Convert a tinycss2 RGBA (0-1 floats) to a Pillow tuple, or None if transparent."""
+    if color is None or getattr(color, "alpha", 0) <= 0:
+        return None
+    return (
+        round(color.red * 255),
+        round(color.green * 255),
+        round(color.blue * 255),
+        round(color.alpha * 255),
+    )
+
+
+def paint_layout(page, width):
+    """Paint a wireframe of a laid-out WeasyPrint page at ``width`` pixels wide."""
+    scale = width / page.width
+    height = max(1, round(page.height * scale))
+
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image, "RGBA")
+
+    def rect(x, y, w, h, fill):
+        if w <= 0 or h <= 0:
+            return
+        x0, y0 = x * scale, y * scale
+        draw.rectangle((x0, y0, x0 + max(w * scale, 1), y0 + max(h * scale, 1)), fill=fill)
+
+    for box in page._page_box.descendants():
+        style = box.style
+        x, y = box.border_box_x(), box.border_box_y()
+        w, h = box.border_width(), box.border_height()
+
+        background = getattr(box, "background", None)
+        fill = _rgba(background.color) if background is not None else None
+        if fill:
+            rect(x, y, w, h, fill)
+
+        for side in ("top", "right", "bottom", "left"):
+            border = getattr(box, f"border_{side}_width", 0)
+            color = _rgba(get_color(style, f"border_{side}_color")) if border else None
+            if not color:
+                continue
+            if side == "top":
+                rect(x, y, w, border, color)
+            elif side == "bottom":
+                rect(x, y + h - border, w, border, color)
+            elif side == "left":
+                rect(x, y, border, h, color)
+            else:
+                rect(x + w - border, y, border, h, color)
+
+        # Text is unreadable at thumbnail size anyway: draw a bar per run
+        if hasattr(box, "text") and box.text.strip():
+            color = _rgba(style["color"]) or (17, 24, 39, 255)
+            bar = box.height * 0.55
+            rect(box.position_x, box.position_y + (box.height - bar) / 2, box.width, bar, color)
+
+    return image
+
+
+def rasterize_pdf(pdf_bytes, width):
+    """Rasterize page 1 of a PDF with pdftoppm, or return None if unavailable."""
+    pdftoppm = shutil.which("pdftoppm")
+    if pdftoppm is None:
+        return None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "resume.pdf")
+        with open(source, "wb") as fh:
+            fh.write(pdf_bytes)
+
+        subprocess.run(
+            [
+                pdftoppm,
+                "-png",
+                "-f", "1",
+                "-l", "1",
+                "-singlefile",
+                "-scale-to-x", str(width),
+                "-scale-to-y", "-1",
+                source,
+                os.path.join(tmp, "page"),
+            ],
+            check=True,
+            capture_output=True,
+            timeout=30,
+        )
+
+        with Image.open(os.path.join(tmp, "page.png")) as page:
+            return page.convert("RGB")
+
+
+def encode_image(image, fmt):
+    pil_format, _ = THUMBNAIL_FORMATS[fmt]
+    out = io.BytesIO()
+    image.save(out, format=pil_format, optimize=True)
+    return out.getvalue()
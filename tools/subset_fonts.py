@@ -0,0 +1,96 @@
+"""
+Build the pre-subsetted fonts bundled in fonts/.
+
+Usage:
+    python tools/subset_fonts.py SOURCE_DIR [--out fonts]
+
+SOURCE_DIR must contain the upstream Source Sans Pro / Source Serif Pro
+TTFs (e.g. from https://github.com/adobe-fonts or the font-source-sans-pro /
+font-source-serif-pro wheels on PyPI). Each face is cut down to Latin-1 plus
+the punctuation resumes actually use, with hinting dropped, so WeasyPrint
+has far fewer glyphs to load and subset again on every render.
+
+"Source" is a Reserved Font Name under the OFL, so the subsets are renamed
+to Resume Sans / Resume Serif (see fonts/LICENSE.txt).
+"""
+
+import argparse
+import os
+
+from fontTools import subset
+from fontTools.ttLib import TTFont
+
+FACES = (
+    "SourceSansPro-Regular",
+    "SourceSansPro-It",
+    "SourceSansPro-Semibold",
+    "SourceSansPro-Bold",
+    "SourceSerifPro-Regular",
+    "SourceSerifPro-It",
+    "SourceSerifPro-Bold",
+)
+
+RENAMES = (
+    ("Source Sans Pro", "Resume Sans"),
+    ("SourceSansPro", "ResumeSans"),
+    ("Source Serif Pro", "Resume Serif"),
+    ("SourceSerifPro", "ResumeSerif"),
+)
+
+# Copyright, trademark and license entries keep their upstream wording
+KEEP_NAME_IDS = {0, 7, 13, 14}
+
+# Basic Latin, Latin-1, the few Latin Extended-A letters in Windows-1252,
+# and typographic punctuation (dashes, quotes, bullet, ellipsis, euro, TM).
+UNICODES = (
+    list(range(0x20, 0x7F))
+    + list(range(0xA0, 0x100))
+    + [0x131, 0x152, 0x153, 0x160, 0x161, 0x178, 0x17D, 0x17E]
+    + [0x2013, 0x2014, 0x2018, 0x2019, 0x201A, 0x201C, 0x201D, 0x201E]
+    + [0x2022, 0x2026, 0x20AC, 0x2122]
+)
+
+
+def renamed(text):
+    for old, new in RENAMES:
+        text = text.replace(old, new)
+    return text
+
+
+def subset_face(source, target):
+    options = subset.Options()
+    options.layout_features = ["kern", "liga"]
+    options.hinting = False
+    options.desubroutinize = True
+    options.notdef_outline = True
+    options.name_IDs = ["*"]
+    options.name_languages = ["*"]
+
+    font = TTFont(source)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=UNICODES)
+    subsetter.subset(font)
+
+    for record in font["name"].names:
+        if record.nameID not in KEEP_NAME_IDS:
+            record.string = renamed(record.toUnicode())
+
+    font.save(target)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("source_dir")
+    parser.add_argument("--out", default=os.path.join(os.path.dirname(__file__), "..", "fonts"))
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    for face in FACES:
+        source = os.path.join(args.source_dir, f"{face}.ttf")
+        target = os.path.join(args.out, f"{renamed(face)}.ttf")
+        subset_face(source, target)
+        print(f"{face}: {os.path.getsize(source)} -> {os.path.getsize(target)} bytes")
+
+
+if __name__ == "__main__":
+    main()